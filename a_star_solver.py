@@ -1,6 +1,10 @@
 import heapq
+import weakref
+from collections import OrderedDict
 
+import numpy as np
 
+import metrics
 from utils import calculate_distance, is_point_in_polygon, segment_crosses_polygon, is_time_in_range, parse_time_str
 from datetime import datetime
 
@@ -19,65 +23,412 @@ def heuristic(coords1, coords2):
     return ((coords1[0] - coords2[0]) ** 2 + (coords1[1] - coords2[1]) ** 2) ** 0.5
 
 
-def a_star_search(adj_list, nodes_map, nfzs, start_node, goal_node):
-    if start_node not in adj_list or goal_node not in adj_list:
+class CSRGraph:
+    """
+    adj_list / nodes_map grafının tamsayı kimlikli CSR (compressed sparse row) hali.
+    Düğüm i'nin komşuları indices[indptr[i]:indptr[i+1]], kenar maliyetleri
+    weights[...] içindedir. Dizi kopyaları sıcak döngü için Python listesi
+    olarak da tutulur.
+    """
+
+    def __init__(self, adj_list, nodes_map, edge_masks=None):
+        self.node_ids = list(adj_list)
+        self.index_of = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.coords = np.array([nodes_map[n]['coords'] for n in self.node_ids], dtype=float).reshape(-1, 2)
+
+        counts = [len(adj_list[n]) for n in self.node_ids]
+        self.indptr = np.zeros(len(self.node_ids) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(counts)
+        self.indices = np.fromiter((self.index_of[nb] for n in self.node_ids for nb, _ in adj_list[n]),
+                                   dtype=np.int64, count=int(self.indptr[-1]))
+        self.weights = np.fromiter((cost for n in self.node_ids for _, cost in adj_list[n]),
+                                   dtype=float, count=int(self.indptr[-1]))
+
+        self._indptr = self.indptr.tolist()
+        self._indices = self.indices.tolist()
+        self._weights = self.weights.tolist()
+        # Kenar başına engelleyici bölge bit maskesi ((u, v) -> int), yoksa 0
+        self._masks = [edge_masks.get((n, nb), 0) for n in self.node_ids for nb, _ in adj_list[n]] \
+            if edge_masks else None
+        self._xs = self.coords[:, 0].tolist()
+        self._ys = self.coords[:, 1].tolist()
+        self._landmarks = None
+        self._trees = {}   # kök düğüm -> (dist, parent) en kısa yol ağacı
+
+    @classmethod
+    def from_arrays(cls, node_ids, coords, indptr, indices, weights):
+        """Hazır CSR dizilerinden (ör. snapshot.py) adj_list kurmadan graf oluşturur."""
+        graph = cls.__new__(cls)
+        graph.node_ids = list(node_ids)
+        graph.index_of = {node_id: i for i, node_id in enumerate(graph.node_ids)}
+        graph.coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        graph.indptr, graph.indices, graph.weights = indptr, indices, weights
+        graph._indptr = indptr.tolist()
+        graph._indices = indices.tolist()
+        graph._weights = weights.tolist()
+        graph._masks = None
+        graph._xs = graph.coords[:, 0].tolist()
+        graph._ys = graph.coords[:, 1].tolist()
+        graph._landmarks = None
+        graph._trees = {}
+        return graph
+
+    def __len__(self):
+        return len(self.node_ids)
+
+
+class AdjacencyList(dict):
+    """
+    build_graph / FlightGraph adj_list'i. version her yerinde değişiklikte
+    (invalidate_graph_cache) artar; csr_graph_for önbelleği bu damgayı
+    karşılaştırır. Zayıf referans verilebildiğinden önbellek grafı canlı tutmaz.
+    """
+
+    __slots__ = ('version', '__weakref__')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+
+# id(adj_list) -> (referans, damga, CSRGraph); en son kullanılan sonda (LRU).
+# AdjacencyList zayıf referansla tutulur ve silinince kaydı da düşer; düz dict
+# güçlü referansla tutulur (id yeniden kullanılamaz), boyut sınırı sızıntıyı önler.
+_CSR_CACHE = OrderedDict()
+_CSR_CACHE_SIZE = 8
+
+
+def _stamp(adj_list):
+    """Düz dict için yalnızca düğüm sayısı; yerinde kenar değişikliğinden sonra invalidate_graph_cache çağrılmalı."""
+    return adj_list.version if isinstance(adj_list, AdjacencyList) else len(adj_list)
+
+
+def _reference(adj_list):
+    key = id(adj_list)
+    if isinstance(adj_list, AdjacencyList):
+        def forget(ref):
+            entry = _CSR_CACHE.get(key)
+            if entry is not None and entry[0] is ref:
+                del _CSR_CACHE[key]
+        return weakref.ref(adj_list, forget)
+    return lambda: adj_list
+
+
+def csr_graph_for(adj_list, nodes_map):
+    """adj_list için önbellekteki CSR grafı döner, yoksa (veya damga değiştiyse) kurar."""
+    key = id(adj_list)
+    entry = _CSR_CACHE.get(key)
+    if entry is not None and entry[0]() is adj_list and entry[1] == _stamp(adj_list):
+        _CSR_CACHE.move_to_end(key)
+        return entry[2]
+
+    graph = CSRGraph(adj_list, nodes_map)
+    _CSR_CACHE[key] = (_reference(adj_list), _stamp(adj_list), graph)
+    _CSR_CACHE.move_to_end(key)
+    while len(_CSR_CACHE) > _CSR_CACHE_SIZE:
+        _CSR_CACHE.popitem(last=False)
+    return graph
+
+
+def invalidate_graph_cache(adj_list=None):
+    """adj_list yerinde değiştirildiğinde çağrılmalı; None ise tüm önbellek temizlenir."""
+    if adj_list is None:
+        _CSR_CACHE.clear()
+        return
+    if isinstance(adj_list, AdjacencyList):
+        adj_list.version += 1
+    _CSR_CACHE.pop(id(adj_list), None)
+
+
+def dijkstra_tree(graph, source):
+    """source köklü en kısa yol ağacı: (dist, parent) listeleri; ulaşılamayanlar inf / -1."""
+    indptr, indices, weights = graph._indptr, graph._indices, graph._weights
+    dist = [float('inf')] * len(graph)
+    parent = [-1] * len(graph)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(heap, (nd, v))
+    return dist, parent
+
+
+def dijkstra_distances(graph, source):
+    """source'tan tüm düğümlere en kısa mesafeler (N,); ulaşılamayanlar inf."""
+    return np.array(dijkstra_tree(graph, source)[0])
+
+
+def home_tree_for(graph, root):
+    """
+    root köklü ağaç, graf başına bir kez kurulur. CSRGraph graf her
+    değiştiğinde yeniden oluşturulduğundan (csr_graph_for / FlightGraph)
+    ağaçlar da graf sürümüyle birlikte yenilenir.
+    """
+    tree = graph._trees.get(root)
+    if tree is None:
+        tree = graph._trees[root] = dijkstra_tree(graph, root)
+    return tree
+
+
+def path_to_root(graph, node, root):
+    """
+    node → root en kısa yolu, ağaçta parent zinciri boyunca yürüyerek (yol
+    uzunluğunda). Graf yönsüz olduğundan root'tan çıkan ağaç, root'a dönen
+    yolları da verir. Dönüş: (tamsayı düğüm listesi, maliyet) veya (None, inf).
+    """
+    dist, parent = home_tree_for(graph, root)
+    if dist[node] == float('inf'):
         return None, float('inf')
-    
-    
-    def heuristic(node1, node2):
-        x1, y1 = nodes_map[node1]['coords']
-        x2, y2 = nodes_map[node2]['coords']
-        return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
-    
-    
-    open_set = [(0, start_node)]  # (f_score, node)
-    
-   
-    g_score = {node: float('inf') for node in adj_list}
-    g_score[start_node] = 0
-    
-    
-    f_score = {node: float('inf') for node in adj_list}
-    f_score[start_node] = heuristic(start_node, goal_node)
-    
-    
+    path = [node]
+    while node != root:
+        node = parent[node]
+        path.append(node)
+    return path, dist[path[0]]
+
+
+def return_home_path(adj_list, nodes_map, current_node, home_node):
+    """a_star_search biçiminde (string yol, maliyet); eve dönüş ağacından okunur."""
+    if current_node not in adj_list or home_node not in adj_list:
+        return None, float('inf')
+    graph = csr_graph_for(adj_list, nodes_map)
+    path, cost = path_to_root(graph, graph.index_of[current_node], graph.index_of[home_node])
+    if path is None:
+        return None, float('inf')
+    return [graph.node_ids[i] for i in path], cost
+
+
+def precompute_home_trees(adj_list, nodes_map, home_nodes):
+    """Birçok dron aynı anda kritik seviyeye düşmeden önce tüm ev ağaçlarını kurar."""
+    graph = csr_graph_for(adj_list, nodes_map)
+    for home_node in home_nodes:
+        if home_node in graph.index_of:
+            home_tree_for(graph, graph.index_of[home_node])
+    return graph
+
+
+class Landmarks:
+    """
+    ALT (A*, Landmarks, Triangle inequality) ön hesabı. Farthest-point
+    yöntemiyle seçilen her işaret noktası L için d(L, ·) tablosu tutulur;
+    graf yönsüz olduğundan d(v, t) >= |d(L, t) - d(L, v)| alt sınırdır.
+    Sınır Öklid mesafesiyle birleştirilir (ikisinin maksimumu), böylece
+    hiçbir zaman düz A*'dan zayıf olmaz. Tablo maskesiz grafta kurulur;
+    bölge maskeleri yalnızca mesafeleri uzatacağından sınır geçerli kalır.
+    """
+
+    def __init__(self, graph, count=8):
+        self.graph = graph
+        self.count = count
+        self.nodes = []
+        n = len(graph)
+        tables = []
+        degrees = np.diff(graph.indptr)
+        if n and degrees.max() > 0:
+            # İlk işaret: en yüksek dereceli düğümden en uzak düğüm (izole NFZ köşeleri seçilmez)
+            far = dijkstra_distances(graph, int(np.argmax(degrees)))
+            candidate = int(np.argmax(np.where(np.isfinite(far), far, -1.0)))
+            nearest = np.full(n, np.inf)
+            for _ in range(count):
+                table = dijkstra_distances(graph, candidate)
+                self.nodes.append(candidate)
+                tables.append(table)
+                # Sonraki işaret: seçilenlere en uzak, ulaşılabilir düğüm
+                nearest = np.minimum(nearest, table)
+                score = np.where(np.isfinite(nearest), nearest, -1.0)
+                score[self.nodes] = -1.0
+                candidate = int(np.argmax(score))
+                if score[candidate] <= 0:
+                    break
+        self.dist = np.array(tables).reshape(len(tables), n)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def lower_bounds(self, target):
+        """Her düğümden target'a alt sınır (N,); target'a bağlı olmayan düğümler inf."""
+        coords = self.graph.coords
+        bound = np.sqrt(((coords - coords[target]) ** 2).sum(axis=1))
+        if len(self.nodes):
+            with np.errstate(invalid='ignore'):
+                diff = np.abs(self.dist - self.dist[:, target:target + 1])
+            diff[np.isnan(diff)] = 0.0   # iki uç da işaretten kopuk: bilgi yok
+            bound = np.maximum(bound, diff.max(axis=0))
+        return bound
+
+
+def landmarks_for(graph, count=8):
+    """Grafa bağlı (önbellekli) işaret noktası tablosu."""
+    if graph._landmarks is None or graph._landmarks.count != count:
+        graph._landmarks = Landmarks(graph, count)
+    return graph._landmarks
+
+
+def a_star_csr(graph, start, goal, blocked=0, landmarks=None):
+    """
+    CSRGraph üzerinde A*. start/goal tamsayı düğüm kimlikleri.
+    Yalnızca ziyaret edilen düğümler için durum tutulur; yığındaki eski
+    kayıtlar çekildiklerinde atlanır (lazy deletion).
+    blocked: aktif bölgelerin bit maskesi; maskesi bununla kesişen kenarlar atlanır.
+    landmarks: Landmarks verilirse sezgisel ALT alt sınırıdır, yoksa Öklid.
+    Dönüş: (düğüm kimlikleri listesi, maliyet) veya (None, inf).
+    """
+    indptr, indices, weights, masks = graph._indptr, graph._indices, graph._weights, graph._masks
+    xs, ys = graph._xs, graph._ys
+    gx, gy = xs[goal], ys[goal]
+    bounds = landmarks.lower_bounds(goal).tolist() if landmarks is not None else None
+
+    push = heapq.heappush
+    if metrics.ENABLED:
+        push = metrics.counted(push, metrics.A_STAR_PUSHES.labels(algorithm="astar"))
+
+    g_score = {start: 0.0}
     came_from = {}
-    
-    
     closed_set = set()
-    
+    open_set = []
+    push(open_set, (((xs[start] - gx) ** 2 + (ys[start] - gy) ** 2) ** 0.5, start))
+
     while open_set:
-       
-        current_f, current = heapq.heappop(open_set)
-        
-        if current == goal_node:
-           
+        _, current = heapq.heappop(open_set)
+        if current in closed_set:
+            continue
+        if current == goal:
+            if metrics.ENABLED:
+                metrics.A_STAR_EXPANSIONS.labels(algorithm="astar").inc(len(closed_set))
             path = [current]
             while current in came_from:
                 current = came_from[current]
                 path.append(current)
             path.reverse()
-            return path, g_score[goal_node]
-        
+            return path, g_score[goal]
         closed_set.add(current)
-        
-        
-        for neighbor, cost in adj_list[current]:
+
+        g_current = g_score[current]
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
             if neighbor in closed_set:
                 continue
-                
-            
-            tentative_g = g_score[current] + cost
-            
-            if tentative_g < g_score[neighbor]:
-                
+            if blocked and masks[k] & blocked:
+                continue
+            tentative_g = g_current + weights[k]
+            if tentative_g < g_score.get(neighbor, float('inf')):
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + heuristic(neighbor, goal_node)
-                
-                
-                if all(node != neighbor for _, node in open_set):
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-    
-    
-    return None, float('inf')
\ No newline at end of file
+                if bounds is None:
+                    h = ((xs[neighbor] - gx) ** 2 + (ys[neighbor] - gy) ** 2) ** 0.5
+                else:
+                    h = bounds[neighbor]
+                push(open_set, (tentative_g + h, neighbor))
+
+    if metrics.ENABLED:
+        metrics.A_STAR_EXPANSIONS.labels(algorithm="astar").inc(len(closed_set))
+    return None, float('inf')
+
+
+def bidirectional_a_star_csr(graph, start, goal, blocked=0, landmarks=None):
+    """
+    Çift yönlü A*. İleri arama start'tan, geri arama goal'dan yürür; ikisi
+    de ortalama potansiyel p(v) = (h_goal(v) - h_start(v)) / 2 ile
+    indirgenmiş aynı grafta çalışır (Goldberg-Harrelson), bu yüzden
+    durma koşulu top_ileri + top_geri >= en iyi yol (mu) olur.
+    Graf yönsüz olmalıdır (build_graph / FlightGraph grafları öyledir).
+    """
+    if start == goal:
+        return [start], 0.0
+    indptr, indices, weights, masks = graph._indptr, graph._indices, graph._weights, graph._masks
+    inf = float('inf')
+    if landmarks is not None:
+        to_goal, to_start = landmarks.lower_bounds(goal), landmarks.lower_bounds(start)
+    else:
+        coords = graph.coords
+        to_goal = np.sqrt(((coords - coords[goal]) ** 2).sum(axis=1))
+        to_start = np.sqrt(((coords - coords[start]) ** 2).sum(axis=1))
+    if not np.isfinite(to_goal[start]):
+        return None, inf
+    with np.errstate(invalid='ignore'):
+        potential = ((to_goal - to_start) / 2).tolist()
+
+    push = heapq.heappush
+    if metrics.ENABLED:
+        push = metrics.counted(push, metrics.A_STAR_PUSHES.labels(algorithm="bidirectional"))
+
+    # 0: ileri, 1: geri; anahtar = g +/- p
+    g = ({start: 0.0}, {goal: 0.0})
+    parent = ({}, {})
+    closed = (set(), set())
+    sign = (1.0, -1.0)
+    heaps = ([], [])
+    push(heaps[0], (potential[start], start))
+    push(heaps[1], (-potential[goal], goal))
+    mu, meeting = inf, None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= mu:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, u = heapq.heappop(heaps[side])
+        if u in closed[side]:
+            continue
+        closed[side].add(u)
+
+        g_side, g_other, s = g[side], g[1 - side], sign[side]
+        g_u = g_side[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if v in closed[side]:
+                continue
+            if blocked and masks[k] & blocked:
+                continue
+            p_v = potential[v]
+            if not -inf < p_v < inf:   # uçlardan birine bağlı değil
+                continue
+            tentative_g = g_u + weights[k]
+            if tentative_g < g_side.get(v, inf):
+                g_side[v] = tentative_g
+                parent[side][v] = u
+                push(heaps[side], (tentative_g + s * p_v, v))
+                if v in g_other and tentative_g + g_other[v] < mu:
+                    mu, meeting = tentative_g + g_other[v], v
+
+    if metrics.ENABLED:
+        metrics.A_STAR_EXPANSIONS.labels(algorithm="bidirectional").inc(len(closed[0]) + len(closed[1]))
+    if meeting is None:
+        return None, inf
+
+    path = [meeting]
+    node = meeting
+    while node in parent[0]:
+        node = parent[0][node]
+        path.append(node)
+    path.reverse()
+    node = meeting
+    while node in parent[1]:
+        node = parent[1][node]
+        path.append(node)
+    return path, mu
+
+
+def a_star_search(adj_list, nodes_map, nfzs, start_node, goal_node, landmarks=0, bidirectional=False):
+    """
+    String kimlikli eski arayüz: CSR grafı önbellekten alır, A*'ı tamsayı
+    kimliklerle çalıştırır ve yolu yine string kimliklerle döner.
+    landmarks > 0 ise o kadar işaret noktasıyla ALT sezgiseli kullanılır
+    (tablo graf başına bir kez kurulur); bidirectional=True çift yönlü arar.
+    """
+    if start_node not in adj_list or goal_node not in adj_list:
+        return None, float('inf')
+
+    graph = csr_graph_for(adj_list, nodes_map)
+    table = landmarks_for(graph, landmarks) if landmarks else None
+    search = bidirectional_a_star_csr if bidirectional else a_star_csr
+    path, cost = search(graph, graph.index_of[start_node], graph.index_of[goal_node], landmarks=table)
+    if path is None:
+        return None, float('inf')
+    return [graph.node_ids[i] for i in path], cost
@@ -0,0 +1,198 @@
+# benchmark.py
+"""
+Ölçeklenme benchmark'ı: dron, teslimat ve NFZ sayılarını sabit tohumlarla
+tarar; build_graph, a_star_search (düz ve ALT), CSPSolver.solve (nesne listeleri ve
+sütun depolarıyla) ve GAOptimizer.run adımlarını ayrı ayrı ölçer (süre + tepe bellek) ve JSON rapor yazar.
+
+    python benchmark.py --drones 5 10 --deliveries 20 100 --nfzs 3 12 -o rapor.json
+    python benchmark.py ... -o yeni.json --compare rapor.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from fleet import Fleet, DeliveryTable
+from data_generator import LAYOUTS, generate_scenario
+from graph_utils import build_graph
+from a_star_solver import a_star_search
+from csp_solver import CSPSolver
+from ga_optimizer import GAOptimizer
+
+STAGES = ("build_graph", "a_star_search", "a_star_alt", "csp_solve", "csp_bound", "ga_run")
+MAX_MAP_X = 1000
+MAX_MAP_Y = 1000
+
+
+def make_scenario(num_drones, num_deliveries, num_nfzs, seed, layout="templates"):
+    """Aynı tohumla her çağrıda aynı senaryoyu üretir (data_generator.generate_scenario)."""
+    drones, deliveries, nfzs = generate_scenario(num_drones, num_deliveries, num_nfzs, seed=seed, layout=layout,
+                                                 max_x=MAX_MAP_X, max_y=MAX_MAP_Y, time_window_ratio=0.0)
+    return drones, list(deliveries), nfzs
+
+
+def _measure(fn, repeat, memory):
+    """En iyi süre (repeat tekrarın) ve isteğe bağlı tracemalloc tepe belleği (KiB)."""
+    best = float("inf")
+    for _ in range(repeat):
+        setup = fn()
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup()
+        best = min(best, time.perf_counter() - t0)
+
+    peak_kb = None
+    if memory:
+        setup = fn()
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kb = round(peak / 1024, 1)
+    return best, peak_kb
+
+
+def bench_case(num_drones, num_deliveries, num_nfzs, seed, repeat=3, memory=True,
+               stages=STAGES, astar_queries=200, ga_generations=20, layout="templates"):
+    """
+    Tek bir (dron, teslimat, NFZ) noktası için her adımı ölçer.
+    Her ölçüm, süre dışında kurulan taze bir senaryo üzerinde çalışır.
+    """
+    def scenario_with_graph():
+        drones, deliveries, nfzs = make_scenario(num_drones, num_deliveries, num_nfzs, seed, layout)
+        nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+        return drones, deliveries, nfzs, nodes_map, adj_list
+
+    def build_graph_case():
+        drones, deliveries, nfzs = make_scenario(num_drones, num_deliveries, num_nfzs, seed, layout)
+        return lambda: build_graph(deliveries, drones, nfzs)
+
+    def a_star_case(**options):
+        drones, deliveries, nfzs, nodes_map, adj_list = scenario_with_graph()
+        rng = random.Random(seed)
+        starts = [f"D{d.drone_id}_START" for d in drones]
+        goals = [str(dp.point_id) for dp in deliveries]
+        pairs = [(rng.choice(starts), rng.choice(goals)) for _ in range(astar_queries)]
+
+        def run():
+            for start, goal in pairs:
+                a_star_search(adj_list, nodes_map, nfzs, start, goal, **options)
+        return run
+
+    def csp_case(bound=False):
+        drones, deliveries, nfzs, nodes_map, adj_list = scenario_with_graph()
+        if bound:
+            # Çözücü sütun depolarını alır; kapasite / ağırlık dizileri sütunlardan okunur
+            fleet, table = Fleet.from_drones(drones), DeliveryTable.from_points(deliveries)
+            return lambda: CSPSolver(table, fleet, adj_list, nodes_map, nfzs).solve()
+        return lambda: CSPSolver(deliveries, drones, adj_list, nodes_map, nfzs).solve()
+
+    def ga_case():
+        drones, deliveries, nfzs, nodes_map, adj_list = scenario_with_graph()
+
+        def run():
+            random.seed(seed)
+            GAOptimizer(drones, deliveries, nfzs, nodes_map, adj_list, generations=ga_generations).run()
+        return run
+
+    cases = {"build_graph": build_graph_case, "a_star_search": a_star_case,
+             # ALT ön hesabı (8 işaret noktası) ölçüme dahildir
+             "a_star_alt": lambda: a_star_case(landmarks=8),
+             "csp_solve": csp_case,
+             # Girdi olarak sütun depoları (fleet.Fleet / DeliveryTable) verildiğinde
+             "csp_bound": lambda: csp_case(bound=True),
+             "ga_run": ga_case}
+
+    results = []
+    for stage in stages:
+        seconds, peak_kb = _measure(cases[stage], repeat, memory)
+        results.append({
+            "drones": num_drones, "deliveries": num_deliveries, "nfzs": num_nfzs,
+            "stage": stage, "seconds": round(seconds, 6), "peak_kb": peak_kb,
+        })
+    return results
+
+
+def run_suite(drones, deliveries, nfzs, seed=42, repeat=3, memory=True, stages=STAGES, layout="templates"):
+    results = []
+    for num_drones in drones:
+        for num_deliveries in deliveries:
+            for num_nfzs in nfzs:
+                for row in bench_case(num_drones, num_deliveries, num_nfzs, seed,
+                                      repeat=repeat, memory=memory, stages=stages, layout=layout):
+                    peak = "-" if row['peak_kb'] is None else f"{row['peak_kb']} KiB"
+                    print(f"{row['drones']:>5} dron {row['deliveries']:>6} teslimat {row['nfzs']:>4} NFZ "
+                          f"| {row['stage']:<14} {row['seconds']:>10.4f} s | tepe: {peak}")
+                    results.append(row)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "layout": layout,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(baseline, current, threshold=1.2):
+    """Eşleşen her (senaryo, adım) için süre oranı; threshold üstü gerilemedir."""
+    def key(row):
+        return row["drones"], row["deliveries"], row["nfzs"], row["stage"]
+
+    base_rows = {key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        base = base_rows.get(key(row))
+        if base is None or not base["seconds"]:
+            continue
+        ratio = row["seconds"] / base["seconds"]
+        flag = "GERİLEME" if ratio > threshold else ""
+        print(f"{key(row)}: {base['seconds']:.4f} s → {row['seconds']:.4f} s (x{ratio:.2f}) {flag}")
+        if ratio > threshold:
+            regressions.append((key(row), ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drone filo optimizasyonu ölçeklenme benchmark'ı")
+    parser.add_argument("--drones", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--deliveries", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--nfzs", type=int, nargs="+", default=[3, 12])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--layout", choices=LAYOUTS, default="templates", help="NFZ yerleşimi")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc ölçümünü atla")
+    parser.add_argument("-o", "--output", help="JSON rapor dosyası")
+    parser.add_argument("--compare", help="karşılaştırılacak önceki JSON rapor")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.drones, args.deliveries, args.nfzs, seed=args.seed,
+                       repeat=args.repeat, memory=not args.no_memory, stages=args.stages, layout=args.layout)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare_reports(baseline, report, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,59 @@
 # csp_solver.py
 
+import heapq
+from multiprocessing import Pool
+
+import numpy as np
+
 from utils import calculate_distance, is_point_in_polygon
-from a_star_solver import a_star_search
+from path_table import DijkstraSearch, ShortestPathTable
 from datetime import datetime
 from entities import Drone
+from fleet import DeliveryTable, columns_of
+
+
+# Aday değerlendirme işçisinin CSR dizileri ve yarıda kalmış aramaları;
+# _init_worker ile bir kez yüklenir
+_WORKER = {}
+
+
+def _init_worker(indptr, indices, weights):
+    _WORKER['graph'] = (indptr, indices, weights)
+    _WORKER['searches'] = {}
+
+
+def _worker_costs(pairs):
+    """
+    (start, target) indeks çiftlerinin en kısa yol maliyetleri. Aynı kaynaktan
+    aramalar sürdürülür (ShortestPathTable.cost ile aynı hedef sınırlı arama).
+    """
+    indptr, indices, weights = _WORKER['graph']
+    searches = _WORKER['searches']
+    costs = []
+    for start, target in pairs:
+        search = searches.get(start)
+        if search is None:
+            search = searches[start] = DijkstraSearch(len(indptr) - 1, start)
+        search.run(indptr, indices, weights, target=target)
+        costs.append(float(search.dist[target]))
+    return costs
 
 
 class CSPSolver:
-    def __init__(self, deliveries, drones, adj_list, nodes_map, nfzs):
-        self.deliveries = deliveries      # Liste[DeliveryPoint]
+    def __init__(self, deliveries, drones, adj_list, nodes_map, nfzs, path_table=None, verbose=True, workers=None):
+        self.deliveries = deliveries      # Liste[DeliveryPoint] veya fleet.DeliveryTable
         self.drones = drones              # Liste[Drone]
         self.adj_list = adj_list          # nodes_map ve NFZ kontrolleriyle oluşturuldu
         self.nodes_map = nodes_map
         self.nfzs = nfzs
+        # Ortak en kısa yol tablosu (main, GA ile paylaşılabilir)
+        self.path_table = path_table or ShortestPathTable(adj_list, nodes_map)
+        self.verbose = verbose
+        # workers > 1: başa gelen alt sınır kayıtlarının gerçek maliyetleri
+        # topluca işçi süreçlerde hesaplanır (dron başına sabit işçi)
+        self.workers = workers
+        self._pools = []
+        self.legs = []   # atama sırasıyla (delivery_id, drone_id, start_node, cost)
 
         # Her dronun başlangıç konumu ve bataryası
         for dr in self.drones:
@@ -22,13 +63,13 @@ class CSPSolver:
     def check_path_validity(self, start_node, end_node):
         """
         start_node ve end_node string ID (ör. "D1_START" veya "105").
-        Eğer NFZ engel yoksa ve A* bir yol bulduysa (path, cost) döner.
+        Eğer NFZ engel yoksa ve bir yol bulunduysa (True, cost) döner.
         """
         if start_node not in self.adj_list or end_node not in self.adj_list:
             return False, float("inf")
 
-        path, cost = a_star_search(self.adj_list, self.nodes_map, self.nfzs, start_node, end_node)
-        if not path or cost == float("inf"):
+        cost = self.path_table.cost(start_node, end_node)
+        if cost == float("inf"):
             return False, float("inf")
 
         return True, cost
@@ -46,56 +87,194 @@ class CSPSolver:
         weight_factor = 1.0 + (delivery_weight / drone.max_weight) * 0.5
         return base_usage * weight_factor
 
-    def solve(self):
-      
-        print("CSP çözümü başlatılıyor...")
-        assignments = {}  # {delivery_id: drone_id}
-        unassigned = [d for d in self.deliveries if not is_point_in_polygon(d.location, self.nfzs[0].coordinates) 
-                      if self.nfzs] if self.nfzs else list(self.deliveries)
-        
-        unassigned.sort(key=lambda t: t.priority, reverse=True)
+    def _start_node(self, drone):
+        if hasattr(drone, "last_node_id"):
+            return drone.last_node_id
+        return f"D{drone.drone_id}_START"
 
-      
-        while True:
-            atama_yapildi = False
+    def _candidate_cost(self, drone, delivery):
+        """
+        Dronun mevcut konumundan teslimata maliyeti; kapasite, yol veya pil
+        kısıtı sağlanmıyorsa None.
+        """
+        #  Ağırlık kapasitesi kontrolü
+        if not self.check_drone_capacity(drone, delivery):
+            return None
 
-           
+        #  A* ile yol ve cost kontrolü
+        path_valid, cost = self.check_path_validity(self._start_node(drone), str(delivery.point_id))
+        if not path_valid:
+            return None
 
-            for delivery in unassigned[:]:  
-                best_drone = None
-                best_cost = float("inf")
+        #  Pil kullanımı kontrolü
+        battery_usage = self.estimate_battery_usage(cost, drone, delivery.weight)
+        if battery_usage > drone.current_battery:
+            return None
+        return cost
+
+    def _lower_bounds(self, drone):
+        """
+        Tüm bekleyen teslimat satırlarına düz çizgi mesafeleri: kenar maliyetleri
+        Öklid uzunluğu olduğundan her yol maliyetinin alt sınırı. Yuvarlama
+        farkları için çok az küçültülür.
+        """
+        node = self.nodes_map.get(self._start_node(drone))
+        if node is None:
+            return np.zeros(len(self._xy))
+        x, y = node['coords']
+        return np.hypot(self._xy[:, 0] - x, self._xy[:, 1] - y) * (1.0 - 1e-9)
+
+    def _push_candidates(self, drone_idx):
+        """
+        Dronun güncel durumuyla her bekleyen teslimatın aday yığınına kayıt
+        ekler. Kayıt önce düz çizgi alt sınırıyla girer; gerçek yol maliyeti
+        ancak kayıt yığının başına geldiğinde hesaplanır (_best_candidate).
+        Kapasite ve alt sınırla pil kontrolü teslimat sütunları (_xy, _weight)
+        üzerinde vektörel yapılır; pili yetmeyen teslimatlar için yol hiç aranmaz.
 
-                for drone in self.drones:
-                    #  Ağırlık kapasitesi kontrolü
-                    if not self.check_drone_capacity(drone, delivery):
-                        continue
+        Her (teslimat, dron) çiftinin en çok bir güncel kaydı vardır; dron
+        hareket edince eskileri bayatlar. Yığın dron sayısının iki katını
+        aşınca (kayıtların yarıdan fazlası bayat) bayat kayıtlar atılır, böylece
+        yığınlar atama sayısıyla değil dron sayısıyla sınırlı kalır.
+        """
+        drone = self.drones[drone_idx]
+        version = self._versions[drone_idx]
+        limit = 2 * len(self.drones)
+        bounds = self._lower_bounds(drone)
+        # estimate_battery_usage ile aynı işlem sırası
+        usage = bounds * 0.5 * (1.0 + (self._weight / drone.max_weight) * 0.5)
+        ok = self._open & (self._weight <= drone.max_weight) & ~(usage > drone.current_battery)
+        for i, bound in zip(np.flatnonzero(ok).tolist(), bounds[ok].tolist()):
+            heap = self._candidates[self._point_ids[i]]
+            heapq.heappush(heap, (bound, drone_idx, version, False))
+            if len(heap) > limit:
+                self._compact(heap)
+
+    def _compact(self, heap):
+        """Bayat kayıtları yerinde atar; güncel kayıtların sırası değişmez."""
+        versions = self._versions
+        heap[:] = [entry for entry in heap if entry[2] == versions[entry[1]]]
+        heapq.heapify(heap)
+
+    def _evaluate_batch(self, heap, delivery):
+        """
+        Yığının başındaki en çok 2 * workers alt sınır kaydını havuzda
+        değerlendirip gerçek maliyetleriyle geri koyar. Fazladan hesaplanan
+        kayıtlar seçimi değiştirmez: başa gerçek maliyetli kayıt çıkana kadar
+        değerlendirme sürer ve eşitlikte yine (cost, drone_idx) sırası geçerlidir.
+        """
+        entries = []
+        while heap and len(entries) < 2 * len(self._pools):
+            key, drone_idx, version, exact = heap[0]
+            if exact:
+                break
+            heapq.heappop(heap)
+            if version == self._versions[drone_idx]:
+                entries.append((drone_idx, version))
 
-                    if hasattr(drone, "last_node_id"):
-                        start_node = drone.last_node_id
-                    else:
-                        start_node = f"D{drone.drone_id}_START"
+        target = str(delivery.point_id)
+        index_of = self.path_table.index_of
+        groups = {}
+        for drone_idx, version in entries:
+            start = self._start_node(self.drones[drone_idx])
+            if start in self.adj_list and target in self.adj_list and start in index_of and target in index_of:
+                groups.setdefault(drone_idx % len(self._pools), []).append(
+                    (drone_idx, version, (index_of[start], index_of[target])))
 
-                    delivery_node = str(delivery.point_id)
+        jobs = [(group, self._pools[w].apply_async(_worker_costs, ([pair for _, _, pair in group],)))
+                for w, group in groups.items()]
+        for group, job in jobs:
+            for (drone_idx, version, _), cost in zip(group, job.get()):
+                drone = self.drones[drone_idx]
+                if cost == float("inf"):
+                    continue
+                if self.estimate_battery_usage(cost, drone, delivery.weight) > drone.current_battery:
+                    continue
+                heapq.heappush(heap, (cost, drone_idx, version, True))
 
-                    #  A* ile yol ve cost kontrolü
-                    path_valid, cost = self.check_path_validity(start_node, delivery_node)
-                    if not path_valid:
-                        continue
+    def _best_candidate(self, delivery):
+        """
+        En düşük maliyetli geçerli (cost, drone_idx). Eşit maliyette listede önce
+        gelen dron kazanır (seri döngüdeki `cost < best_cost` kuralı).
+        Dronu o kayıttan sonra hareket etmiş eski kayıtlar atılır. Başa gelen
+        alt sınır kaydının gerçek maliyeti hesaplanıp yığına geri konur; başa
+        gerçek maliyetli bir kayıt çıktığında kalan alt sınırlar ondan küçük
+        olamaz, yani seçim tüm maliyetler hesaplanmış gibi aynıdır.
+        """
+        heap = self._candidates[delivery.point_id]
+        while heap:
+            key, drone_idx, version, exact = heap[0]
+            if version != self._versions[drone_idx]:
+                heapq.heappop(heap)
+            elif exact:
+                return key, drone_idx
+            elif self._pools:
+                self._evaluate_batch(heap, delivery)
+            else:
+                heapq.heappop(heap)
+                cost = self._candidate_cost(self.drones[drone_idx], delivery)
+                if cost is not None:
+                    heapq.heappush(heap, (cost, drone_idx, version, True))
+        return None
+
+    def solve(self):
+      
+        if self.verbose:
+            print("CSP çözümü başlatılıyor...")
+        assignments = {}  # {delivery_id: drone_id}
+        points = list(self.deliveries)
+        rows = [i for i, d in enumerate(points) if not is_point_in_polygon(d.location, self.nfzs[0].coordinates)] \
+            if self.nfzs else list(range(len(points)))
+        rows.sort(key=lambda i: points[i].priority, reverse=True)
+        unassigned = [points[i] for i in rows]
 
-                    #  Pil kullanımı kontrolü
-                    battery_usage = self.estimate_battery_usage(cost, drone, delivery.weight)
-                    if battery_usage > drone.current_battery:
-                        continue
+        # Bekleyen teslimat sütunları (öncelik sırasıyla); DeliveryTable verildiyse
+        # doğrudan tablodan okunur. _open: satır hâlâ atanmayı bekliyor mu
+        rows = np.array(rows, dtype=np.int64)
+        self._xy = columns_of(self.deliveries, 'location')[rows].reshape(-1, 2)
+        self._weight = columns_of(self.deliveries, 'weight')[rows]
+        self._point_ids = [d.point_id for d in unassigned]
+        self._slot = {point_id: i for i, point_id in enumerate(self._point_ids)}
+        self._rows = rows.tolist()
+        self._open = np.ones(len(unassigned), dtype=bool)
 
-                    #  En düşük maliyetli dron araması
-                    if cost < best_cost:
-                        best_cost = cost
-                        best_drone = drone
+        # Artımlı aday kuyruğu: her teslimat için (cost, drone_idx, version, exact)
+        # yığını. Bir atamadan sonra yalnızca hareket eden dronun kayıtları yenilenir.
+        self._candidates = {d.point_id: [] for d in unassigned}
+        self._versions = [0] * len(self.drones)
+        for drone_idx in range(len(self.drones)):
+            self._push_candidates(drone_idx)
+
+        workers = min(self.workers or 1, len(self.drones))
+        if workers > 1:
+            graph = self.path_table.graph
+            self._pools = [Pool(1, initializer=_init_worker,
+                                initargs=(graph._indptr, graph._indices, graph._weights))
+                           for _ in range(workers)]
+        try:
+            self._assign(unassigned, assignments)
+        finally:
+            for pool in self._pools:
+                pool.terminate()
+            self._pools = []
+
+        if self.verbose:
+            print(f"Sonuç: Toplam {len(assignments)} teslimat atandı. {len(unassigned)} teslimat atanamadı.")
+        return assignments
+
+    def _assign(self, unassigned, assignments):
+        """Öncelik sırasıyla turlar halinde atama; unassigned ve assignments yerinde güncellenir."""
+        while True:
+            atama_yapildi = False
+
+            for delivery in unassigned[:]:  
+                best = self._best_candidate(delivery)
 
                 # Eğer bu teslimata atanabilecek bir dron bulunduysa kaydedelim
-                if best_drone:
+                if best:
                     #  Atama işlemi
-                    drone = best_drone
+                    best_cost, drone_idx = best
+                    drone = self.drones[drone_idx]
                     usage = self.estimate_battery_usage(best_cost, drone, delivery.weight)
                     drone.current_battery -= usage
                     
@@ -104,20 +283,28 @@ class CSPSolver:
                     drone.time_ticks.append(len(drone.battery_history))  
 
                     
+                    self.legs.append((delivery.point_id, drone.drone_id, drone.last_node_id, best_cost))
                     drone.last_node_id = str(delivery.point_id)
 
                     assignments[delivery.point_id] = drone.drone_id
                     delivery.delivered = True
+                    slot = self._slot[delivery.point_id]
+                    self._open[slot] = False
+                    if isinstance(self.deliveries, DeliveryTable):
+                        self.deliveries.columns['delivered'][self._rows[slot]] = True
 
-                    print(f"Teslimat {delivery.point_id} → Dron {drone.drone_id} | Maliyet: {best_cost:.2f} | Pil Kalan: {drone.current_battery:.2f}")
+                    if self.verbose:
+                        print(f"Teslimat {delivery.point_id} → Dron {drone.drone_id} | Maliyet: {best_cost:.2f} | Pil Kalan: {drone.current_battery:.2f}")
 
                    
                     unassigned.remove(delivery)
+                    del self._candidates[delivery.point_id]
                     atama_yapildi = True
 
+                    # Dron hareket etti: eski kayıtları geçersiz kıl, yenilerini ekle
+                    self._versions[drone_idx] += 1
+                    self._push_candidates(drone_idx)
+
            
             if not atama_yapildi or not unassigned:
                 break
-
-        print(f"Sonuç: Toplam {len(assignments)} teslimat atandı. {len(unassigned)} teslimat atanamadı.")
-        return assignments
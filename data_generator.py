@@ -1,6 +1,11 @@
 import random
+
+import numpy as np
+
 from entities import Drone, DeliveryPoint, NoFlyZone
-from utils import is_point_in_polygon
+from fleet import DeliveryTable
+from graph_utils import points_in_nfzs
+from nfz_index import NFZIndex
 
 NFZS = [
     [(250, 650),(250, 750),(350, 750),(350, 650)],
@@ -24,9 +29,12 @@ def generate_random_drones(num_drones, max_x, max_y):
         drones.append(Drone(i+1, max_weight, battery, speed, start_pos))
     return drones
 
-def generate_random_delivery_points(num_points, max_x, max_y):
+def generate_random_delivery_points(num_points, max_x, max_y, nfzs=None):
+    """nfzs verilmezse noktalar ayrıca üretilen sabit bölgelerin dışında seçilir."""
     delivery_points = []
-    nfzs = generate_fixed_no_fly_zones()  
+    if nfzs is None:
+        nfzs = generate_fixed_no_fly_zones()
+    nfz_index = NFZIndex(nfzs)
     
     point_id = 101
     while len(delivery_points) < num_points:
@@ -35,13 +43,7 @@ def generate_random_delivery_points(num_points, max_x, max_y):
         location = (x, y)
         
         # No-fly zone kontrolü
-        is_in_nfz = False
-        for nfz in nfzs:
-            if is_point_in_polygon(location, nfz.coordinates):
-                is_in_nfz = True
-                break
-                
-        if is_in_nfz:
+        if nfz_index.point_blocked(location):
             continue  
             
         weight = random.uniform(0.5, 3.0)
@@ -60,6 +62,12 @@ def generate_random_delivery_points(num_points, max_x, max_y):
         
     return delivery_points
 
+POSSIBLE_ACTIVE_TIMES = [
+    ("08:00", "08:30"), ("09:00", "09:45"), ("10:15", "11:00"),
+    ("11:30", "12:00"), ("13:00", "13:45"), ("14:00", "15:00"),
+    ("15:30", "16:15"), ("17:00", "17:30"),("18:00", "19:00"),("19:30", "20:30"),("19:00", "19:45")
+]
+
 def generate_fixed_no_fly_zones():
     no_fly_zones = []
     is_exists =[]
@@ -68,12 +76,6 @@ def generate_fixed_no_fly_zones():
             if new_num not in is_exists:
                 is_exists.append(new_num)
 
-    POSSIBLE_ACTIVE_TIMES = [
-    ("08:00", "08:30"), ("09:00", "09:45"), ("10:15", "11:00"),
-    ("11:30", "12:00"), ("13:00", "13:45"), ("14:00", "15:00"),
-    ("15:30", "16:15"), ("17:00", "17:30"),("18:00", "19:00"),("19:30", "20:30"),("19:00", "19:45")
-    ]
-
     for i in range(0,3):
         zone_id = 1000 + i
         active_time = POSSIBLE_ACTIVE_TIMES[random.randint(0,9)] 
@@ -82,14 +84,177 @@ def generate_fixed_no_fly_zones():
 
     return no_fly_zones
 
+
+# ---------------------------------------------------------------------- #
+# Toplu (vektörel) senaryo üretimi
+# ---------------------------------------------------------------------- #
+LAYOUTS = ("templates", "random", "grid", "clusters")
+
+
+def _clockwise(points):
+    """Köşeleri saat yönüne çevirir (ara noktalar kenar normalinin dışa baktığını varsayar)."""
+    x, y = points[:, 0], points[:, 1]
+    area = np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)
+    return points[::-1] if area > 0 else points
+
+
+def _polygon(points):
+    return [tuple(p) for p in np.round(_clockwise(np.asarray(points, dtype=float)), 2).tolist()]
+
+
+def random_convex_polygon(rng, cx, cy, radius, sides):
+    """Merkez etrafında sıralı açılarla üretilmiş dışbükeye yakın çokgen."""
+    angles = np.sort(rng.uniform(0, 2 * np.pi, sides))
+    radii = radius * rng.uniform(0.7, 1.0, sides)
+    return _polygon(np.column_stack([cx + radii * np.cos(angles), cy + radii * np.sin(angles)]))
+
+
+def _template_layout(rng, n, max_x, max_y):
+    """NFZS şablonları ölçeklenip haritaya dağıtılır."""
+    polygons = []
+    for i in range(n):
+        template = np.asarray(NFZS[i % len(NFZS)], dtype=float)
+        origin = template.min(axis=0)
+        size = (template.max(axis=0) - origin) * rng.uniform(0.3, 1.0)
+        offset = rng.uniform(0, 1, 2) * (np.array([max_x, max_y]) - size)
+        polygons.append(_polygon(offset + (template - origin) * size / (template.max(axis=0) - origin)))
+    return polygons
+
+
+def _random_layout(rng, n, max_x, max_y):
+    """Rastgele merkez, yarıçap ve köşe sayısıyla (3-8) dışbükey bölgeler."""
+    span = min(max_x, max_y)
+    centers = rng.uniform(0, 1, (n, 2)) * [max_x, max_y]
+    radii = rng.uniform(0.02, 0.08, n) * span
+    sides = rng.integers(3, 9, n)
+    return [random_convex_polygon(rng, cx, cy, r, k) for (cx, cy), r, k in zip(centers, radii, sides)]
+
+
+def _grid_layout(rng, n, max_x, max_y):
+    """Şehir blokları: ızgara hücrelerinden n tanesine sokak payı bırakılmış dikdörtgenler."""
+    cols = int(np.ceil(np.sqrt(n)))
+    rows = int(np.ceil(n / cols))
+    cell = np.array([max_x / cols, max_y / rows])
+    polygons = []
+    for c in rng.permutation(rows * cols)[:n]:
+        origin = np.array([c % cols, c // cols]) * cell
+        size = cell * rng.uniform(0.4, 0.7, 2)
+        corner = origin + (cell - size) * rng.uniform(0.2, 0.8, 2)
+        x0, y0 = corner
+        x1, y1 = corner + size
+        polygons.append(_polygon([(x0, y0), (x0, y1), (x1, y1), (x1, y0)]))
+    return polygons
+
+
+def _cluster_layout(rng, n, max_x, max_y):
+    """Birkaç yoğun bölgede (ör. havalimanı, askeri alan) kümelenmiş küçük bölgeler."""
+    span = min(max_x, max_y)
+    centers = rng.uniform(0.15, 0.85, (max(1, n // 8), 2)) * [max_x, max_y]
+    polygons = []
+    for i in range(n):
+        cx, cy = np.clip(centers[i % len(centers)] + rng.normal(0, 0.08 * span, 2), 0, [max_x, max_y])
+        polygons.append(random_convex_polygon(rng, cx, cy, rng.uniform(0.015, 0.04) * span, int(rng.integers(3, 7))))
+    return polygons
+
+
+_LAYOUT_BUILDERS = {"templates": _template_layout, "random": _random_layout,
+                    "grid": _grid_layout, "clusters": _cluster_layout}
+
+
+def generate_nfz_layout(rng, num_nfzs, layout="templates", max_x=1000, max_y=1000, dynamic_ratio=0.0):
+    """
+    layout: LAYOUTS'tan biri. dynamic_ratio oranındaki bölgelere
+    POSSIBLE_ACTIVE_TIMES'tan bir aktiflik aralığı verilir.
+    """
+    if layout not in _LAYOUT_BUILDERS:
+        raise ValueError(f"bilinmeyen NFZ yerleşimi: {layout} (seçenekler: {', '.join(LAYOUTS)})")
+    polygons = _LAYOUT_BUILDERS[layout](rng, num_nfzs, max_x, max_y)
+    dynamic = rng.random(num_nfzs) < dynamic_ratio
+    times = rng.integers(0, len(POSSIBLE_ACTIVE_TIMES), num_nfzs)
+    nfzs = []
+    for i, polygon in enumerate(polygons):
+        start, end = POSSIBLE_ACTIVE_TIMES[times[i]] if dynamic[i] else (None, None)
+        nfzs.append(NoFlyZone(1000 + i, polygon, start, end))
+    return nfzs
+
+
+def sample_free_points(rng, num_points, nfzs, max_x, max_y, max_rounds=100):
+    """
+    Hiçbir NFZ'nin içinde olmayan num_points tamsayı nokta: (N, 2) int64.
+    Noktalar toplu çekilir ve vektörel poligon testiyle elenir; eksik kalırsa
+    gözlenen kabul oranına göre yeni bir grup çekilir. max_rounds grupta
+    tamamlanamazsa (harita NFZ'lerle neredeyse kapalı) ValueError.
+    """
+    index = nfzs if isinstance(nfzs, NFZIndex) else NFZIndex(nfzs)
+    chunks, found, accept = [], 0, 1.0
+    for _ in range(max_rounds):
+        if found >= num_points:
+            break
+        need = num_points - found
+        size = int(need / max(accept, 0.01) * 1.1) + 16
+        points = rng.integers(0, [max_x + 1, max_y + 1], size=(size, 2))
+        free = points[~points_in_nfzs(points.astype(float), index).any(axis=1)]
+        accept = len(free) / size
+        chunks.append(free[:need])
+        found += len(chunks[-1])
+    if found < num_points:
+        raise ValueError(f"{max_rounds} denemede yalnızca {found}/{num_points} serbest nokta bulundu; "
+                         f"NFZ'ler haritayı kaplıyor olabilir")
+    return np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.int64)
+
+
+def generate_drone_fleet(rng, num_drones):
+    """generate_random_drones ile aynı dağılımlar, NumPy üreteciyle."""
+    xs = rng.integers(400, 601, num_drones).tolist()
+    ys = rng.integers(0, 201, num_drones).tolist()
+    weights = rng.uniform(2.0, 6.0, num_drones).tolist()
+    batteries = rng.integers(8000, 20001, num_drones).tolist()
+    speeds = rng.uniform(8.0, 15.0, num_drones).tolist()
+    return [Drone(i + 1, weights[i], batteries[i], speeds[i], (xs[i], ys[i])) for i in range(num_drones)]
+
+
+def generate_delivery_table(rng, num_points, nfzs, max_x=1000, max_y=1000, time_window_ratio=0.5, first_id=101):
+    """
+    generate_random_delivery_points dağılımlarıyla num_points teslimat; nesne
+    yerine sütun tabanlı fleet.DeliveryTable döner (milyonlarca satır için).
+    """
+    xy = sample_free_points(rng, num_points, nfzs, max_x, max_y)
+    weight = rng.uniform(0.5, 3.0, num_points)
+    priority = rng.integers(1, 6, num_points)
+    windowed = rng.random(num_points) < time_window_ratio
+    start_hour = rng.integers(8, 19, num_points)
+    end_hour = np.minimum(start_hour + rng.integers(1, 5, num_points), 22)
+    tw_start = np.where(windowed, start_hour * 60, DeliveryTable.NO_TIME)
+    tw_end = np.where(windowed, end_hour * 60, DeliveryTable.NO_TIME)
+    return DeliveryTable.from_arrays(np.arange(first_id, first_id + num_points), xy[:, 0], xy[:, 1],
+                                     weight, priority, tw_start, tw_end)
+
+
+def generate_scenario(num_drones, num_deliveries, num_nfzs=3, seed=None, layout="templates",
+                      max_x=1000, max_y=1000, dynamic_ratio=0.0, time_window_ratio=0.5):
+    """
+    Tek tohumdan tekrarlanabilir senaryo: (drones, DeliveryTable, nfzs).
+    Bölgeler, dronlar ve teslimatlar tohumdan türetilen ayrı akışlarla
+    üretilir; teslimat sayısını değiştirmek bölge yerleşimini ve filoyu
+    değiştirmez. Teslimat nesneleri gerekiyorsa list(table) ile alınır.
+    """
+    nfz_seed, drone_seed, delivery_seed = np.random.SeedSequence(seed).spawn(3)
+    nfzs = generate_nfz_layout(np.random.default_rng(nfz_seed), num_nfzs, layout, max_x, max_y, dynamic_ratio)
+    drones = generate_drone_fleet(np.random.default_rng(drone_seed), num_drones)
+    deliveries = generate_delivery_table(np.random.default_rng(delivery_seed), num_deliveries, nfzs,
+                                         max_x, max_y, time_window_ratio)
+    return drones, deliveries, nfzs
+
+
 if __name__ == '__main__':
     # Sabit değerlerle test
     num_drones = 5
     num_deliveries = 20
-    
-    drones_list = generate_random_drones(num_drones)
-    deliveries_list = generate_random_delivery_points(num_deliveries)
+    max_x, max_y = 1000, 1000
+
+    drones_list = generate_random_drones(num_drones, max_x, max_y)
     nfzs_list = generate_fixed_no_fly_zones()
+    deliveries_list = generate_random_delivery_points(num_deliveries, max_x, max_y, nfzs_list)
     
     print(f"-- {num_drones} Drone Oluşturuldu --")
     for drone in drones_list:
@@ -0,0 +1,186 @@
+# dispatch_service.py
+"""
+Yerel asyncio dağıtım servisi. Graf, filo durumu ve önbellekler bellekte
+sıcak tutulur; siparişler TCP veya Unix soketi üzerinden satır başına bir
+JSON nesnesi olarak gelir (order_stream.order_from_record biçimi). Kısa bir
+pencere (--window) içinde gelen siparişler tek bir CSP atama geçişinde
+toplanır ve her siparişe atama + yol satırı olarak cevap verilir.
+
+    python dispatch_service.py --port 8765 --window 0.05
+    python dispatch_service.py --unix /tmp/dispatch.sock
+    echo '{"id": 501, "x": 120, "y": 880, "weight": 1.2}' | nc 127.0.0.1 8765
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from order_stream import StreamDispatcher, order_from_record
+from data_generator import generate_random_drones, generate_fixed_no_fly_zones
+
+
+class DispatchService:
+    """
+    submit() ile gelen siparişleri kuyrukta toplar; ilk siparişten sonra
+    `window` saniye içinde (en fazla max_batch) gelenler aynı grupta çözülür.
+    Çözüm tek iş parçacıklı bir executor'da çalışır: graf ve filo durumu
+    tek yazıcı tarafından değiştirilir, olay döngüsü bu sırada yeni
+    bağlantıları kabul etmeye devam eder.
+    """
+
+    def __init__(self, dispatcher, window=0.05, max_batch=100):
+        self.dispatcher = dispatcher
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._batcher = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batches())
+
+    async def stop(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, order):
+        """Siparişi bir sonraki gruba ekler; atama kararını (dict) döner."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((order, future))
+        return await future
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            orders = [order for order, _ in batch]
+            try:
+                decisions = await loop.run_in_executor(self._executor, self._solve, orders)
+            except Exception as exc:
+                decisions = [{"delivery_id": order.point_id, "error": str(exc)} for order in orders]
+            for (_, future), decision in zip(batch, decisions):
+                if not future.done():
+                    future.set_result(decision)
+
+    def _solve(self, orders):
+        """
+        Executor içinde: grubu çözer, siparişlerle aynı sırada kararları döner.
+        Tekrarlanan kimliklerde ilk sipariş atamayı, sonrakiler hata kararını alır.
+        """
+        decisions = [None] * len(orders)
+        slots = {}   # point_id -> sipariş sıraları
+        for i, order in enumerate(orders):
+            slots.setdefault(order.point_id, []).append(i)
+
+        with metrics.stage("dispatch_batch"):
+            for decision in self.dispatcher.process(orders):
+                decision["batch_size"] = len(orders)
+                indices = slots[decision["delivery_id"]]
+                decisions[indices.pop(-1 if "error" in decision else 0)] = decision
+        return decisions
+
+    # ------------------------------------------------------------------ #
+    async def handle_client(self, reader, writer):
+        """Her satır bağımsız bir sipariştir; cevaplar hazır oldukça yazılır."""
+        pending = set()
+        lock = asyncio.Lock()
+
+        async def answer(line):
+            try:
+                decision = await self.submit(order_from_record(json.loads(line)))
+            except (ValueError, KeyError, TypeError) as exc:
+                decision = {"error": f"geçersiz sipariş: {exc}"}
+            async with lock:
+                writer.write((json.dumps(decision, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line:
+                    task = asyncio.ensure_future(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        self.start()
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        return server
+
+
+async def _main(args):
+    if args.seed is not None:
+        random.seed(args.seed)
+    dispatcher = StreamDispatcher(generate_random_drones(args.drones, 1000, 1000),
+                                  generate_fixed_no_fly_zones(), time_aware=args.time_aware,
+                                  recharge_pct=args.recharge_below)
+    service = DispatchService(dispatcher, window=args.window, max_batch=args.max_batch)
+    server = await service.serve(args.host, args.port, args.unix)
+
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Dağıtım servisi dinleniyor: {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sıcak bellekli asyncio dağıtım servisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="TCP yerine bu yoldaki Unix soketini dinle")
+    parser.add_argument("--window", type=float, default=0.05, help="grup penceresi (saniye)")
+    parser.add_argument("--max-batch", type=int, default=100)
+    parser.add_argument("--drones", type=int, default=5)
+    parser.add_argument("--time-aware", action="store_true", help="dinamik NFZ'leri duvar saatine göre aç/kapa")
+    parser.add_argument("--recharge-below", type=float, default=30, help="bu pil yüzdesinin altında eve dön ve şarj ol")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--metrics-port", type=int, help="ölçümleri 127.0.0.1:PORT/metrics üzerinden sun")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port:
+        metrics.enable()
+        metrics.start_http_server(args.metrics_port)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,17 @@
 
 # entities.py
-from a_star_solver import a_star_search
+from a_star_solver import return_home_path
+
 
 class Drone:
    
     BATTERY_PCT = None
     FAILSAFE_COUNT = None
 
+    FIELDS = ('drone_id', 'max_weight', 'battery_capacity', 'current_battery', 'speed',
+              'start_pos', 'current_pos', 'current_weight', 'is_busy', 'home_pos', 'critical_pct')
+    __slots__ = FIELDS + ('last_node_id', 'battery_history', 'time_ticks', 'current_location')
+
     def __init__(self, drone_id, max_weight, battery_capacity,
                  speed, start_pos):
         self.drone_id = drone_id
@@ -32,22 +37,29 @@ class Drone:
                 f"Pil: {pct:.1f}% | Konum: {self.current_pos}")
 
     # ------------------------------------------------------------------ #
-    def return_home(self, adj_list, nodes_map, nfzs):
+    def return_home(self, adj_list, nodes_map, nfzs, approach=None):
         """
         Batarya kritik olduğunda en kısa güvenli rotayla kalkış noktasına döner.
+        Rota, grafın her sürümü için bir kez kurulan ev köklü en kısa yol
+        ağacından okunur (a_star_solver.return_home_path).
+        approach=(düğüm, mesafe): dron bir graf düğümünde değilse (ör. simulator)
+        önce bu mesafeyle düğüme gider, dönüş oradan başlar.
         Dönüş başarılıysa True döner.
         """
         if (self.current_battery / self.battery_capacity) * 100 >= self.critical_pct:
             return False  # hâlâ yeterli pil var
 
-        current_node = self.last_node_id
+        current_node, approach_cost = approach if approach is not None else (self.last_node_id, 0.0)
         goal_node = f"D{self.drone_id}_START"
 
-        path, cost = a_star_search(adj_list, nodes_map, nfzs,
-                                   current_node, goal_node)
+        path, cost = return_home_path(adj_list, nodes_map, current_node, goal_node)
         if not path:
             return False  # Yol bulunamadı → acil iniş senaryosu vb.
+        self.land_home(approach_cost + cost)
+        return True
 
+    def land_home(self, cost):
+        """Eve dönüşün pil, metrik ve durum etkileri (yol başka yerde bulunduysa, ör. simulator)."""
         # Pil düşür ve metriği güncelle
         self.current_battery -= cost * 0.5
         pct = 100 * self.current_battery / self.battery_capacity
@@ -58,12 +70,14 @@ class Drone:
 
         # Durum güncelle
         self.current_pos = self.home_pos
-        self.last_node_id = goal_node
+        self.last_node_id = f"D{self.drone_id}_START"
         self.is_busy = False
         print(f"⚠️  Drone {self.drone_id} kritik seviye → Evine döndü (kost = {cost:.1f})")
-        return True
 
 class DeliveryPoint:
+    FIELDS = ('point_id', 'location', 'weight', 'priority', 'time_window', 'delivered')
+    __slots__ = FIELDS
+
     def __init__(self, point_id, location, weight, priority, time_window=None, delivered=False):
         self.point_id = point_id
         self.location = location
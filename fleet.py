@@ -0,0 +1,221 @@
+# fleet.py
+
+import numpy as np
+
+from entities import Drone, DeliveryPoint
+from utils import time_to_minutes
+
+
+class _ColumnStore:
+    """
+    Sütun tabanlı (structure-of-arrays) depo. Her alan bir NumPy sütunudur;
+    konum alanları iki sütunda (x, y) tutulur. Nesneler (Drone / DeliveryPoint)
+    düz __slots__ sınıflarıdır ve depoya bağlı değildir: sütunlar, depo
+    kurulurken (from_drones / from_points) alınan değerlerdir. Çözücülerin
+    vektörel yolları (columns_of) bu sütunları okur; değişen durum (pil,
+    konum, teslim) nesnelerde tutulur.
+    """
+
+    POINT_FIELDS = {}
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def get(self, row, name):
+        if name in self.POINT_FIELDS:
+            x_col, y_col = self.POINT_FIELDS[name]
+            return (self.columns[x_col][row].item(), self.columns[y_col][row].item())
+        return self.columns[name][row].item()
+
+    def column(self, name):
+        """Alanın sütunu; konum alanları (N, 2)."""
+        if name in self.POINT_FIELDS:
+            x_col, y_col = self.POINT_FIELDS[name]
+            return np.column_stack([self.columns[x_col], self.columns[y_col]])
+        return self.columns[name]
+
+    @staticmethod
+    def _column(values, dtype=None):
+        array = np.asarray(values, dtype=dtype)
+        if dtype is None and array.dtype.kind not in 'iufb':
+            array = array.astype(float)
+        return array
+
+
+class Fleet(_ColumnStore):
+    """
+    Dron filosu sütunları (pozisyon, kapasite, batarya, hız ...) ve
+    O(1) drone_id -> satır eşlemesi. drones listesi aynı sıradaki düz Drone
+    nesneleridir (sütunlardan kurulduysa satırlardan üretilir).
+    """
+
+    POINT_FIELDS = {
+        'start_pos': ('start_x', 'start_y'),
+        'current_pos': ('current_x', 'current_y'),
+        'home_pos': ('home_x', 'home_y'),
+    }
+
+    def __init__(self, columns, drones=None):
+        super().__init__(columns)
+        self.row_of = {drone_id: row for row, drone_id in enumerate(columns['drone_id'].tolist())}
+        if drones is None:
+            drones = [self._new_drone(row) for row in range(len(self.row_of))]
+        self.drones = drones
+
+    @classmethod
+    def from_drones(cls, drones):
+        """Drone nesnelerinin alanlarını sütunlara kopyalar; nesneler drones listesinde kalır."""
+        drones = list(drones)
+        columns = {}
+        for name in Drone.FIELDS:
+            values = [getattr(d, name) for d in drones]
+            if name in cls.POINT_FIELDS:
+                x_col, y_col = cls.POINT_FIELDS[name]
+                columns[x_col] = cls._column([v[0] for v in values])
+                columns[y_col] = cls._column([v[1] for v in values])
+            else:
+                columns[name] = cls._column(values, bool if name == 'is_busy' else None)
+        return cls(columns, drones=drones)
+
+    def _new_drone(self, row):
+        drone = Drone.__new__(Drone)
+        for name in Drone.FIELDS:
+            setattr(drone, name, self.get(row, name))
+        drone.last_node_id = f"D{drone.drone_id}_START"
+        drone.battery_history = []
+        drone.time_ticks = []
+        return drone
+
+    def __iter__(self):
+        return iter(self.drones)
+
+    def __getitem__(self, row):
+        return self.drones[row]
+
+    def get_drone(self, drone_id):
+        """drone_id ile O(1) erişim; yoksa None."""
+        row = self.row_of.get(drone_id)
+        return None if row is None else self.drones[row]
+
+    @property
+    def positions(self):
+        """(N, 2) anlık konumlar."""
+        return np.column_stack([self.columns['current_x'], self.columns['current_y']])
+
+
+class DeliveryTable(_ColumnStore):
+    """
+    Teslimat sütunları (konum, ağırlık, öncelik, dakikaya çevrilmiş zaman
+    aralığı, teslim durumu) ve O(1) point_id -> satır eşlemesi. DeliveryPoint
+    nesneleri ilk erişimde satırlardan bir kez üretilir (mmap ile yüklenen
+    büyük tablolar yalnızca sütunlarla da kullanılabilir).
+    """
+
+    POINT_FIELDS = {'location': ('x', 'y')}
+    NO_TIME = -1
+
+    def __init__(self, columns, points=None):
+        super().__init__(columns)
+        self._row_of = None
+        self._points = points
+
+    @property
+    def row_of(self):
+        """point_id -> satır; ilk erişimde kurulur (mmap ile yüklenen büyük tablolar için)."""
+        if self._row_of is None:
+            self._row_of = {point_id: row for row, point_id in enumerate(self.columns['point_id'].tolist())}
+        return self._row_of
+
+    @classmethod
+    def from_arrays(cls, point_id, x, y, weight, priority, tw_start=None, tw_end=None, delivered=None):
+        n = len(point_id)
+        no_time = np.full(n, cls.NO_TIME, dtype=np.int32)
+        return cls({
+            'point_id': np.asarray(point_id, dtype=np.int64),
+            'x': cls._column(x),
+            'y': cls._column(y),
+            'weight': np.asarray(weight, dtype=float),
+            'priority': np.asarray(priority, dtype=np.int64),
+            'tw_start': no_time.copy() if tw_start is None else np.asarray(tw_start, dtype=np.int32),
+            'tw_end': no_time.copy() if tw_end is None else np.asarray(tw_end, dtype=np.int32),
+            'delivered': np.zeros(n, dtype=bool) if delivered is None else np.asarray(delivered, dtype=bool),
+        })
+
+    @classmethod
+    def from_points(cls, points):
+        """DeliveryPoint nesnelerinin alanlarını sütunlara kopyalar; nesneler tabloda kalır."""
+        points = list(points)
+        windows = [cls._parse_window(p.time_window) for p in points]
+        table = cls.from_arrays(
+            [p.point_id for p in points],
+            [p.location[0] for p in points],
+            [p.location[1] for p in points],
+            [p.weight for p in points],
+            [p.priority for p in points],
+            [w[0] for w in windows],
+            [w[1] for w in windows],
+            [p.delivered for p in points],
+        )
+        table._points = points
+        return table
+
+    @classmethod
+    def _parse_window(cls, time_window):
+        if not time_window:
+            return cls.NO_TIME, cls.NO_TIME
+        return time_to_minutes(time_window[0]), time_to_minutes(time_window[1])
+
+    @staticmethod
+    def _format_minutes(minutes):
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    def get(self, row, name):
+        if name == 'time_window':
+            start = int(self.columns['tw_start'][row])
+            if start == self.NO_TIME:
+                return None
+            return (self._format_minutes(start), self._format_minutes(int(self.columns['tw_end'][row])))
+        return super().get(row, name)
+
+    @property
+    def points(self):
+        """Satır sırasıyla DeliveryPoint nesneleri; ilk erişimde kurulur."""
+        if self._points is None:
+            self._points = [DeliveryPoint(*(self.get(row, name) for name in DeliveryPoint.FIELDS))
+                            for row in range(len(self))]
+        return self._points
+
+    def view(self, row):
+        return self.points[row]
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def __getitem__(self, row):
+        return self.points[row]
+
+    def get_point(self, point_id):
+        """point_id ile O(1) erişim; yoksa None."""
+        row = self.row_of.get(point_id)
+        return None if row is None else self.view(row)
+
+    @property
+    def locations(self):
+        """(N, 2) teslimat konumları."""
+        return np.column_stack([self.columns['x'], self.columns['y']])
+
+
+def columns_of(items, name, dtype=float):
+    """
+    items bir Fleet / DeliveryTable ise sütunu, nesne listesiyse alanlardan
+    kurulan diziyi döner (konum alanları (N, 2)). Çözücülerin ortak okuma yolu.
+    """
+    if isinstance(items, _ColumnStore):
+        return np.asarray(items.column(name), dtype=dtype)
+    values = [getattr(item, name) for item in items]
+    if name in Fleet.POINT_FIELDS or name in DeliveryTable.POINT_FIELDS:
+        return np.array(values, dtype=dtype).reshape(-1, 2)
+    return np.array(values, dtype=dtype)
@@ -1,10 +1,55 @@
 # ga_optimizer.py
 
+import os
 import random
-from a_star_solver import a_star_search
+from collections import OrderedDict
+from multiprocessing import Pool
+
+import numpy as np
+
+import metrics
+from fleet import columns_of
+from path_table import ShortestPathTable
+
+
+# Ada (island) işçi süreçlerinin paylaştığı durum; _init_island ile bir kez yüklenir
+_ISLAND = {}
+
+
+def _init_island(score_table, pop_size, mutation_rate):
+    _ISLAND['score_table'] = score_table
+    _ISLAND['cols'] = np.arange(score_table.shape[1])
+    _ISLAND['pop_size'] = pop_size
+    _ISLAND['mutation_rate'] = mutation_rate
+
+
+def _evolve_island(args):
+    """
+    Bir adanın popülasyonunu `generations` nesil boyunca evrimleştirir.
+    Bireyler dron satır indekslerinden oluşan (pop_size, D) dizisidir; adım
+    adım GAOptimizer.run ile aynı politikadır (en iyi 2 ebeveyn, uniform
+    crossover, gen başına mutasyon).
+    """
+    population, rng, generations = args
+    table, cols = _ISLAND['score_table'], _ISLAND['cols']
+    pop_size, mutation_rate = _ISLAND['pop_size'], _ISLAND['mutation_rate']
+    n_drones, n_genes = table.shape
+
+    for _ in range(generations):
+        scores = table[population, cols].sum(axis=1)
+        parents = population[np.argsort(-scores, kind='stable')[:2]]
+        n_children = pop_size - len(parents)
+        children = np.where(rng.random((n_children, n_genes)) > 0.5, parents[0], parents[1])
+        mutate = rng.random((n_children, n_genes)) < mutation_rate
+        children[mutate] = rng.integers(0, n_drones, int(mutate.sum()))
+        population = np.vstack([parents, children])
+
+    return population, rng
+
 
 class GAOptimizer:
-    def __init__(self, drones, deliveries, nfzs, nodes_map, adj_list, pop_size=10, generations=20, mutation_rate=0.1):
+    def __init__(self, drones, deliveries, nfzs, nodes_map, adj_list, pop_size=10, generations=20, mutation_rate=0.1,
+                 path_table=None, islands=1, migration_interval=5, migration_size=2, workers=None):
         self.drones = drones
         self.deliveries = deliveries
         self.nfzs = nfzs
@@ -13,6 +58,42 @@ class GAOptimizer:
         self.pop_size = pop_size
         self.generations = generations
         self.mutation_rate = mutation_rate
+        # Ada modeli: islands > 1 ise popülasyonlar ayrı süreçlerde evrimleşir
+        # ve her migration_interval nesilde en iyi bireyler halka şeklinde göç eder.
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.workers = workers
+        self.path_table = path_table or ShortestPathTable(adj_list, nodes_map)
+
+        # id -> satır/sütun eşlemeleri (next(...) taramaları yerine)
+        self.drone_row = {d.drone_id: i for i, d in enumerate(drones)}
+        self.delivery_col = {dp.point_id: j for j, dp in enumerate(deliveries)}
+        self.score_table = None
+        # LRU fitness önbelleği; son iki neslin bireylerini tutacak kadar büyük
+        self._fitness_cache = OrderedDict()
+        self.fitness_cache_size = 2 * pop_size
+
+    def build_score_table(self):
+        """
+        (dron, teslimat) başına fitness katkısı; her çalıştırmada bir kez kurulur.
+        Kapasite aşımı veya yol yoksa -100, aksi halde öncelik*10 - maliyet*0.2.
+        """
+        sources = [f"D{drone_id}_START" for drone_id in columns_of(self.drones, 'drone_id', None).tolist()]
+        targets = [str(point_id) for point_id in columns_of(self.deliveries, 'point_id', None).tolist()]
+        costs = self.path_table.distance_matrix(sources, targets)
+
+        # Fleet / DeliveryTable verildiyse sütunlardan, değilse nesnelerden
+        max_weight = columns_of(self.drones, 'max_weight')
+        weight = columns_of(self.deliveries, 'weight')
+        priority = columns_of(self.deliveries, 'priority')
+
+        feasible = (max_weight[:, None] >= weight[None, :]) & np.isfinite(costs)
+        with np.errstate(invalid='ignore'):
+            table = priority[None, :] * 10 - costs * 0.2
+        self.score_table = np.where(feasible, table, -100.0)
+        self._fitness_cache.clear()
+        return self.score_table
 
     def create_individual(self):
         return {delivery.point_id: random.choice(self.drones).drone_id for delivery in self.deliveries}
@@ -20,30 +101,59 @@ class GAOptimizer:
     def create_population(self):
         return [self.create_individual() for _ in range(self.pop_size)]
 
-    def fitness(self, individual):
-        score = 0
-        for delivery_id, drone_id in individual.items():
-            drone = next(d for d in self.drones if d.drone_id == drone_id)
-            delivery = next(dp for dp in self.deliveries if dp.point_id == delivery_id)
-
-            if drone.max_weight < delivery.weight:
-                score -= 100
-                continue
+    def _gather_indices(self, individual):
+        rows = [self.drone_row[drone_id] for drone_id in individual.values()]
+        cols = [self.delivery_col[delivery_id] for delivery_id in individual.keys()]
+        return rows, cols
 
-            start_node = f"D{drone_id}_START"
-            goal_node = str(delivery_id)
-            path, cost = a_star_search(self.adj_list, self.nodes_map, self.nfzs, start_node, goal_node)
-            if not path:
-                score -= 100
-                continue
+    def _cached(self, key):
+        score = self._fitness_cache.get(key)
+        if score is not None:
+            self._fitness_cache.move_to_end(key)
+        return score
 
-            score += delivery.priority * 10
-            score -= cost * 0.2
+    def _remember(self, key, score):
+        self._fitness_cache[key] = score
+        if len(self._fitness_cache) > self.fitness_cache_size:
+            self._fitness_cache.popitem(last=False)
 
+    def fitness(self, individual):
+        key = tuple(individual.items())
+        score = self._cached(key)
+        if score is None:
+            if self.score_table is None:
+                self.build_score_table()
+            rows, cols = self._gather_indices(individual)
+            score = float(self.score_table[rows, cols].sum())
+            self._remember(key, score)
+            if metrics.ENABLED:
+                metrics.FITNESS_EVALS.inc()
+        elif metrics.ENABLED:
+            metrics.FITNESS_CACHE_HITS.inc()
         return score
 
+    def fitness_batch(self, population):
+        """Popülasyonun fitness değerleri; önbellekte olmayanlar tek gather ile hesaplanır."""
+        if self.score_table is None:
+            self.build_score_table()
+        keys = [tuple(ind.items()) for ind in population]
+        result = [self._cached(key) for key in keys]
+        missing = [i for i, score in enumerate(result) if score is None]
+        if metrics.ENABLED:
+            metrics.FITNESS_EVALS.inc(len(missing))
+            metrics.FITNESS_CACHE_HITS.inc(len(keys) - len(missing))
+        if missing:
+            rows, cols = zip(*(self._gather_indices(population[i]) for i in missing))
+            scores = self.score_table[np.array(rows), np.array(cols)].sum(axis=1)
+            for i, score in zip(missing, scores.tolist()):
+                result[i] = score
+                self._remember(keys[i], score)
+        return result
+
     def selection(self, population):
-        return sorted(population, key=lambda x: self.fitness(x), reverse=True)[:2]
+        scores = self.fitness_batch(population)
+        order = sorted(range(len(population)), key=scores.__getitem__, reverse=True)
+        return [population[i] for i in order[:2]]
 
     def crossover(self, parent1, parent2):
         child = {}
@@ -58,6 +168,10 @@ class GAOptimizer:
         return individual
 
     def run(self):
+        if self.islands > 1:
+            return self.run_islands()
+
+        self.build_score_table()
         population = self.create_population()
         for generation in range(self.generations):
             selected = self.selection(population)
@@ -68,5 +182,60 @@ class GAOptimizer:
                 new_population.append(child)
             population = new_population
 
-        best = max(population, key=lambda x: self.fitness(x))
+        scores = self.fitness_batch(population)
+        best = population[scores.index(max(scores))]
         return best
+
+    def run_islands(self):
+        """
+        Paralel ada modeli. Her ada kendi süreçinde migration_interval nesil
+        evrimleşir; ardından her adanın en iyi migration_size bireyi bir
+        sonraki adanın en kötü bireylerinin yerine geçer.
+        """
+        table = self.build_score_table()
+        n_drones, n_genes = table.shape
+        cols = np.arange(n_genes)
+        migration_size = min(self.migration_size, self.pop_size - 2)
+
+        # random.seed ile tekrarlanabilir ada tohumları
+        seeds = np.random.SeedSequence(random.randrange(2 ** 32)).spawn(self.islands)
+        rngs = [np.random.default_rng(seed) for seed in seeds]
+        populations = [rng.integers(0, n_drones, (self.pop_size, n_genes)) for rng in rngs]
+
+        workers = self.workers or min(self.islands, os.cpu_count() or 1)
+        with Pool(workers, initializer=_init_island,
+                  initargs=(table, self.pop_size, self.mutation_rate)) as pool:
+            remaining = self.generations
+            while remaining > 0:
+                step = min(self.migration_interval, remaining)
+                results = pool.map(_evolve_island, [(pop, rng, step) for pop, rng in zip(populations, rngs)])
+                populations = [pop for pop, _ in results]
+                rngs = [rng for _, rng in results]
+                remaining -= step
+
+                if remaining > 0 and migration_size > 0:
+                    populations = self._migrate(populations, migration_size)
+
+        if metrics.ENABLED:
+            # Adalarda her nesil tüm popülasyon tek gather ile değerlendirilir
+            metrics.FITNESS_EVALS.inc(self.islands * self.pop_size * self.generations)
+
+        population = np.vstack(populations)
+        scores = table[population, cols].sum(axis=1)
+        best = population[int(np.argmax(scores))]
+        return {dp.point_id: self.drones[row].drone_id for dp, row in zip(self.deliveries, best.tolist())}
+
+    def _migrate(self, populations, migration_size):
+        """Halka göçü: ada i'nin en iyileri ada i+1'in en kötülerinin yerine geçer."""
+        cols = np.arange(self.score_table.shape[1])
+        ranked = []
+        for pop in populations:
+            scores = self.score_table[pop, cols].sum(axis=1)
+            ranked.append(np.argsort(-scores, kind='stable'))
+
+        migrated = [pop.copy() for pop in populations]
+        for i, pop in enumerate(populations):
+            target = (i + 1) % len(populations)
+            migrants = pop[ranked[i][:migration_size]]
+            migrated[target][ranked[target][-migration_size:]] = migrants
+        return migrated
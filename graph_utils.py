@@ -1,105 +1,663 @@
-from utils import calculate_distance, is_point_in_polygon, segment_crosses_polygon
+import numpy as np
+
+import metrics
+from utils import calculate_distance, is_point_in_polygon, is_time_in_range, time_to_minutes
+from nfz_index import NFZIndex
+from a_star_solver import (AdjacencyList, CSRGraph, a_star_csr, a_star_search, bidirectional_a_star_csr,
+                           invalidate_graph_cache, landmarks_for)
 
 
 NODE_TYPE_DRONE_START = 'drone_start'
 NODE_TYPE_DELIVERY = 'delivery_point'
 NODE_TYPE_NFZ_CORNER = 'nfz_corner'
 NODE_TYPE_WAYPOINT = 'waypoint'
-def build_graph(delivery_points, drones, nfzs=None):
-    if nfzs is None:
-        nfzs = []
+
+SAFETY_MARGIN = 20  # meters
+
+
+def drone_node(drone):
+    """Dron başlangıç düğümü: (node_id, node)."""
+    return f"D{drone.drone_id}_START", {
+        'coords': drone.start_pos,
+        'type': NODE_TYPE_DRONE_START,
+        'original_id': drone.drone_id
+    }
+
+
+def delivery_node(point):
+    """Teslimat düğümü: (node_id, node)."""
+    return str(point.point_id), {
+        'type': NODE_TYPE_DELIVERY,
+        'coords': point.location,
+        'weight': point.weight,
+        'priority': point.priority,
+        'time_window': point.time_window,
+        'original_id': point.point_id
+    }
+
+
+def nfz_corner_nodes(nfz):
+    """NFZ köşeleri navigasyon noktası olarak: [(node_id, node), ...]."""
+    return [(f"NFZ{nfz.zone_id}_C{i}", {
+        'coords': corner,
+        'type': NODE_TYPE_NFZ_CORNER,
+        'nfz_id': nfz.zone_id
+    }) for i, corner in enumerate(nfz.coordinates)]
+
+
+def nfz_waypoint_nodes(nfz, safety_margin=SAFETY_MARGIN):
+    """NFZ kenar ortalarından dışarı kaydırılmış güvenli ara noktalar."""
+    nodes = []
+    coords = nfz.coordinates
+    for i in range(len(coords)):
+        start = coords[i]
+        end = coords[(i + 1) % len(coords)]
+        
+        # Create waypoint at middle of edge, offset outward
+        mid_x = (start[0] + end[0]) / 2
+        mid_y = (start[1] + end[1]) / 2
+        
+        # Calculate normal vector (perpendicular to edge)
+        edge_vec_x = end[0] - start[0]
+        edge_vec_y = end[1] - start[1]
         
-    nodes_map = {}
-    
-    # Add drone start positions
-    for drone in drones:
-        node_id = f"D{drone.drone_id}_START"
-        nodes_map[node_id] = {
-            'coords': drone.start_pos,
-            'type': NODE_TYPE_DRONE_START,
-            'original_id': drone.drone_id
-        }
-    
-    # Add delivery points
-    for point in delivery_points:
-        node_id = str(point.point_id)
-        nodes_map[node_id] = {
-            'type': NODE_TYPE_DELIVERY,
-            'coords': point.location,
-            'weight': point.weight,
-            'priority': point.priority,
-            'time_window': point.time_window,
-            'original_id': point.point_id
-        }
-    
-    # Add NFZ corners as navigation points
-    for nfz in nfzs:
-        for i, corner in enumerate(nfz.coordinates):
-            node_id = f"NFZ{nfz.zone_id}_C{i}"
-            nodes_map[node_id] = {
-                'coords': corner,
-                'type': NODE_TYPE_NFZ_CORNER,
+        # Perpendicular vector (outward from NFZ)
+        normal_x = -edge_vec_y
+        normal_y = edge_vec_x
+        
+        # Normalize the normal vector
+        length = (normal_x**2 + normal_y**2)**0.5
+        if length > 0:
+            normal_x /= length
+            normal_y /= length
+        
+        # Create waypoint with safety margin
+        safe_x = mid_x + safety_margin * normal_x
+        safe_y = mid_y + safety_margin * normal_y
+        
+        # Check if point is outside NFZ
+        if not is_point_in_polygon((safe_x, safe_y), coords):
+            nodes.append((f"WP_NFZ{nfz.zone_id}_E{i}", {
+                'coords': (safe_x, safe_y),
+                'type': NODE_TYPE_WAYPOINT,
+                'nfz_id': nfz.zone_id
+            }))
+    return nodes
+
+
+def nfz_reduced_nodes(nfz, safety_margin=SAFETY_MARGIN):
+    """
+    Küçültülmüş graf için NFZ düğümleri: yalnızca dışbükey köşeler ve her
+    birinin açıortayı boyunca dışarı kaydırılmış ara noktası (WP_NFZ{id}_C{i}).
+    Ara nokta köşenin iki kenarına da safety_margin uzaklıktadır (keskin
+    köşelerde en çok iki katı).
+
+    Dönüş: (köşeler, [(node_id, node, önceki köşe, sonraki köşe)], halka).
+    halka, tüm köşelerin kaydırılmış hali olan poligondur.
+    """
+    coords = nfz.coordinates
+    n = len(coords)
+    area = sum(coords[i][0] * coords[(i + 1) % n][1] - coords[(i + 1) % n][0] * coords[i][1]
+               for i in range(n))
+    sign = 1.0 if area > 0 else -1.0   # saat yönünün tersi: kenarın dış normali (dy, -dx)
+
+    def outward(start, end):
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length = (dx**2 + dy**2)**0.5 or 1.0
+        return sign * dy / length, -sign * dx / length
+
+    corners = dict(nfz_corner_nodes(nfz))
+    corner_nodes, waypoints, ring = [], [], []
+    for i in range(n):
+        prev, corner, nxt = coords[i - 1], coords[i], coords[(i + 1) % n]
+        n1, n2 = outward(prev, corner), outward(corner, nxt)
+        bx, by = n1[0] + n2[0], n1[1] + n2[1]
+        length = (bx**2 + by**2)**0.5
+        if length < 1e-9:
+            bx, by, length = n1[0], n1[1], 1.0
+        scale = safety_margin / max(length / 2, 0.5)
+        point = (corner[0] + bx / length * scale, corner[1] + by / length * scale)
+        ring.append(point)
+
+        turn = (corner[0] - prev[0]) * (nxt[1] - corner[1]) - (corner[1] - prev[1]) * (nxt[0] - corner[0])
+        if turn * sign > 0 and not is_point_in_polygon(point, coords):
+            corner_id = f"NFZ{nfz.zone_id}_C{i}"
+            corner_nodes.append((corner_id, corners[corner_id]))
+            waypoints.append((f"WP_NFZ{nfz.zone_id}_C{i}", {
+                'coords': point,
+                'type': NODE_TYPE_WAYPOINT,
                 'nfz_id': nfz.zone_id
-            }
-    
-    # Add additional waypoints around NFZs with safety margin
-    safety_margin = 20  # meters
-    for nfz in nfzs:
-        coords = nfz.coordinates
-        for i in range(len(coords)):
-            start = coords[i]
-            end = coords[(i + 1) % len(coords)]
-            
-            # Create waypoint at middle of edge, offset outward
-            mid_x = (start[0] + end[0]) / 2
-            mid_y = (start[1] + end[1]) / 2
-            
-            # Calculate normal vector (perpendicular to edge)
-            edge_vec_x = end[0] - start[0]
-            edge_vec_y = end[1] - start[1]
-            
-            # Perpendicular vector (outward from NFZ)
-            normal_x = -edge_vec_y
-            normal_y = edge_vec_x
-            
-            # Normalize the normal vector
-            length = (normal_x**2 + normal_y**2)**0.5
-            if length > 0:
-                normal_x /= length
-                normal_y /= length
-            
-            # Create waypoint with safety margin
-            safe_x = mid_x + safety_margin * normal_x
-            safe_y = mid_y + safety_margin * normal_y
-            
-            # Check if point is outside NFZ
-            if not is_point_in_polygon((safe_x, safe_y), coords):
-                node_id = f"WP_NFZ{nfz.zone_id}_E{i}"
-                nodes_map[node_id] = {
-                    'coords': (safe_x, safe_y),
-                    'type': NODE_TYPE_WAYPOINT,
-                    'nfz_id': nfz.zone_id
-                }
-    
-    # Create adjacency list with all possible safe connections
-    adj_list = {node_id: [] for node_id in nodes_map}
-    
-    # Connect nodes if path doesn't intersect any NFZ
-    for node_id_1, node_1 in nodes_map.items():
-        for node_id_2, node_2 in nodes_map.items():
-            if node_id_1 != node_id_2:
-                coords_1 = node_1['coords']
-                coords_2 = node_2['coords']
-                
-                # Check if connection intersects with any NFZ
-                is_safe = True
-                for nfz in nfzs:
-                    if segment_crosses_polygon((coords_1, coords_2), nfz.coordinates):
-                        is_safe = False
-                        break
-                
-                if is_safe:
-                    distance = calculate_distance(coords_1, coords_2)
-                    adj_list[node_id_1].append((node_id_2, distance))
-    
-    return nodes_map, adj_list
\ No newline at end of file
+            }, prev, nxt))
+    return corner_nodes, waypoints, ring
+
+
+def tangent_mask(points, waypoints, prev, nxt):
+    """
+    points[m] -> waypoints[m] doğrusu ara noktanın köşesine teğetse True:
+    köşenin iki komşusu (prev[m], nxt[m]) doğrunun aynı tarafındadır.
+    """
+    dx, dy = waypoints[..., 0] - points[..., 0], waypoints[..., 1] - points[..., 1]
+    side_prev = dx * (prev[..., 1] - points[..., 1]) - dy * (prev[..., 0] - points[..., 0])
+    side_next = dx * (nxt[..., 1] - points[..., 1]) - dy * (nxt[..., 0] - points[..., 0])
+    return side_prev * side_next >= 0
+
+
+def build_graph(delivery_points, drones, nfzs=None, reduced=False):
+    """
+    Tüm NFZ'leri kalıcı olarak aktif sayan görünürlük grafı: (nodes_map, adj_list).
+    reduced=True: yalnızca dışbükey köşeler ve teğet kenarlarla kurulan graf.
+    """
+    graph = FlightGraph(delivery_points, drones, nfzs, reduced=reduced)
+    return graph.nodes_map, graph.adj_list
+
+
+class FlightGraph:
+    """
+    Görünürlük grafı ve NFZ durumları.
+
+    time_aware=False iken tüm NFZ'ler kalıcıdır ve adj_list build_graph ile
+    aynıdır. time_aware=True iken başlangıç/bitiş saati olan NFZ'ler dinamiktir:
+    yalnızca dinamik bölgelerce engellenen kenarlar hangi bölgelerin onları
+    engellediğiyle birlikte saklanır. Bir bölge açılıp kapandığında graf
+    yeniden kurulmaz; yalnızca o bölgenin kenarları adj_list'te maskelenir
+    veya geri eklenir.
+
+    add_delivery / remove_delivery / add_drone / add_nfz grafı artımlı
+    günceller: görünürlük yalnızca etkilenen düğüm veya bölge için mevcut
+    düğümlere karşı hesaplanır.
+
+    reduced=True ise küçültülmüş görünürlük grafı kurulur: NFZ'lerden yalnızca
+    dışbükey köşeler ve köşeden kaydırılmış ara noktaları alınır; bir ara
+    noktaya giden kenar yalnızca o köşeye teğetse test edilip eklenir (uç
+    bölgenin kaydırılmış halkası içindeyse teğet sayılır). Yoğun graf hiç
+    kurulmaz ve artımlı güncellemeler aynı süzgeçle çalışır.
+    """
+
+    def __init__(self, delivery_points, drones, nfzs=None, time_aware=False,
+                 current_time=None, safety_margin=SAFETY_MARGIN, reduced=False):
+        self.nfzs = list(nfzs or [])
+        self.time_aware = time_aware
+        self.safety_margin = safety_margin
+        self.index = NFZIndex(self.nfzs)
+        self.version = 0             # adj_list her değiştiğinde artar
+        self._structure_version = 0  # düğüm/kenar kümesi değiştiğinde artar
+        self._timed_csr = None
+        self.current_time = None
+        self.reduced = reduced
+        self._tangent = {}   # reduced: ara nokta -> (önceki köşe, sonraki köşe, halka index)
+        self._rings = []     # reduced: NFZ başına kaydırılmış köşe poligonu
+        self._ring_index = NFZIndex([])
+        self._tangent_for = self._tangent_cache = None
+
+        self.nodes_map = {}
+        for drone in drones:
+            self._add_node(*drone_node(drone))
+        for point in delivery_points:
+            self._add_node(*delivery_node(point))
+        zone_nodes = [self._zone_nodes(nfz) for nfz in self.nfzs]
+        for corners, _ in zone_nodes:
+            for node_id, node in corners:
+                self._add_node(node_id, node)
+        for _, waypoints in zone_nodes:
+            for node_id, node in waypoints:
+                self._add_node(node_id, node)
+
+        self._zone_bit = {nfz.zone_id: 1 << k for k, nfz in enumerate(self.nfzs)}
+        self._dynamic = np.array([self.is_dynamic(nfz) for nfz in self.nfzs], dtype=bool)
+        self.active_zones = {nfz.zone_id for nfz in self.nfzs if self.is_dynamic(nfz)}
+
+        self.adj_list = AdjacencyList((node_id, []) for node_id in self.nodes_map)
+        self.edge_zones = {}       # (a, b) -> (distance, frozenset(zone_id)); yalnız dinamik engelli kenarlar
+        self.zone_edges = {nfz.zone_id: {} for nfz in self.nfzs}   # sıralı küme: {(a, b): None}
+        self._blocked_count = {}   # (a, b) -> aktif engelleyici bölge sayısı
+        self._node_edges = {}      # node_id -> {(a, b): None}, edge_zones kayıtları
+
+        node_ids = list(self.nodes_map)
+        coords = self._coords(node_ids)
+        inside = points_in_nfzs(coords, self.index)
+
+        self._arrays = (node_ids, coords, inside)
+
+        # Each undirected pair is tested once; rows are written in nodes_map
+        # order so every neighbour list stays in nodes_map order.
+        for i in range(len(node_ids) - 1):
+            others = slice(i + 1, len(node_ids))
+            if reduced:
+                in_ring = self._tangent_arrays()[3][i]
+                others = i + 1 + np.flatnonzero(self._tangent_row(node_ids[i], coords[i], in_ring, others))
+                blockers = row_blockers(coords[i], inside[i], coords[others], inside[others], self.index)
+                self._connect_row(node_ids[i], [node_ids[j] for j in others], blockers)
+                continue
+            blockers = row_blockers(coords[i], inside[i], coords[others], inside[others], self.index)
+            self._connect_row(node_ids[i], node_ids[others], blockers)
+
+        if current_time is not None:
+            self.set_time(current_time)
+
+    def is_dynamic(self, nfz):
+        return self.time_aware and nfz.start_time is not None and nfz.end_time is not None
+
+    def _add_node(self, node_id, node):
+        self.nodes_map[node_id] = node
+
+    def _zone_nodes(self, nfz):
+        """NFZ'nin (köşe, ara nokta) düğümleri; reduced ise teğet verisi de kaydedilir."""
+        if not self.reduced:
+            return nfz_corner_nodes(nfz), nfz_waypoint_nodes(nfz, self.safety_margin)
+        corners, waypoints, ring = nfz_reduced_nodes(nfz, self.safety_margin)
+        k = len(self._rings)
+        self._rings.append(ring)
+        self._ring_index = NFZIndex(self._rings)
+        for node_id, _, prev, nxt in waypoints:
+            self._tangent[node_id] = (prev, nxt, k)
+        return corners, [(node_id, node) for node_id, node, _, _ in waypoints]
+
+    def _tangent_arrays(self):
+        """
+        reduced: düğüm sırasıyla (prev (N, 2), next (N, 2), halka (N,), in_ring (N, R)).
+        Ara nokta olmayan düğümlerde halka -1'dir. Yapı değişince yeniden kurulur.
+        """
+        if self._tangent_for is not self._arrays:
+            node_ids, coords, _ = self._arrays
+            prev = np.zeros((len(node_ids), 2))
+            nxt = np.zeros((len(node_ids), 2))
+            ring = np.full(len(node_ids), -1, dtype=np.int64)
+            for i, node_id in enumerate(node_ids):
+                if node_id in self._tangent:
+                    prev[i], nxt[i], ring[i] = self._tangent[node_id]
+            self._tangent_cache = (prev, nxt, ring, points_in_nfzs(coords, self._ring_index))
+            self._tangent_for = self._arrays
+        return self._tangent_cache
+
+    def _tangent_row(self, node_id, point, point_in_ring, rows):
+        """
+        reduced: point ile düğüm dizilerindeki rows satırları arasındaki kenarların
+        her iki uçtaki ara noktada teğet olup olmadığı (bool maske).
+        """
+        prev, nxt, ring, in_ring = (a[rows] for a in self._tangent_arrays())
+        coords = self._arrays[1][rows]
+        if not self._rings:
+            return np.ones(len(coords), dtype=bool)
+        keep = (ring < 0) | point_in_ring[np.maximum(ring, 0)] | tangent_mask(point[None, :], coords, prev, nxt)
+        own = self._tangent.get(node_id)
+        if own is not None:
+            p, q, k = own
+            keep &= in_ring[:, k] | tangent_mask(coords, point[None, :], np.asarray(p)[None, :],
+                                                  np.asarray(q)[None, :])
+        return keep
+
+    def _coords(self, node_ids):
+        return np.array([self.nodes_map[n]['coords'] for n in node_ids], dtype=float).reshape(-1, 2)
+
+    def _connect_row(self, node_id, others, blockers):
+        """
+        node_id ile others arasındaki kenarları ekler. blockers: (M, Z) bool,
+        others[m] ile kenarı bölge k engelliyorsa True.
+        """
+        static = blockers[:, ~self._dynamic].any(axis=1)
+        dynamic = blockers[:, self._dynamic]
+        dynamic_ids = [nfz.zone_id for nfz, dyn in zip(self.nfzs, self._dynamic) if dyn]
+        coords_1 = self.nodes_map[node_id]['coords']
+
+        for m in np.flatnonzero(~static):
+            other = others[m]
+            distance = calculate_distance(coords_1, self.nodes_map[other]['coords'])
+            zones = frozenset(dynamic_ids[k] for k in np.flatnonzero(dynamic[m])) if dynamic.shape[1] else frozenset()
+            if not zones:
+                self.adj_list[node_id].append((other, distance))
+                self.adj_list[other].append((node_id, distance))
+                continue
+
+            key = (node_id, other)
+            self._track_edge(key, distance, zones)
+            if self._blocked_count[key] == 0:
+                self._link(key)
+
+    def _track_edge(self, key, distance, zones):
+        """Dinamik bölgelerce engellenen kenarı kaydeder (adj_list'e dokunmaz)."""
+        self.edge_zones[key] = (distance, zones)
+        for zone_id in zones:
+            self.zone_edges[zone_id][key] = None
+        for node_id in key:
+            self._node_edges.setdefault(node_id, {})[key] = None
+        self._blocked_count[key] = len(zones & self.active_zones)
+
+    def _untrack_edge(self, key):
+        _, zones = self.edge_zones.pop(key)
+        for zone_id in zones:
+            self.zone_edges[zone_id].pop(key, None)
+        for node_id in key:
+            self._node_edges.get(node_id, {}).pop(key, None)
+        del self._blocked_count[key]
+
+    def _link(self, key):
+        a, b = key
+        distance = self.edge_zones[key][0]
+        self.adj_list[a].append((b, distance))
+        self.adj_list[b].append((a, distance))
+
+    def _unlink(self, key):
+        a, b = key
+        self.adj_list[a] = [edge for edge in self.adj_list[a] if edge[0] != b]
+        self.adj_list[b] = [edge for edge in self.adj_list[b] if edge[0] != a]
+
+    def _changed(self, structure=False):
+        invalidate_graph_cache(self.adj_list)
+        self.version += 1
+        if structure:
+            self._structure_version += 1
+            self._timed_csr = None
+
+    # ------------------------------------------------------------------ #
+    def set_zone_active(self, zone_id, active):
+        """Bölgeyi aç/kapat; yalnızca o bölgenin engellediği kenarlar güncellenir."""
+        if active == (zone_id in self.active_zones) or zone_id not in self.zone_edges:
+            return
+        if active:
+            self.active_zones.add(zone_id)
+        else:
+            self.active_zones.discard(zone_id)
+
+        delta = 1 if active else -1
+        for key in self.zone_edges[zone_id]:
+            before = self._blocked_count[key]
+            self._blocked_count[key] = before + delta
+            if before == 0:
+                self._unlink(key)
+            elif before + delta == 0:
+                self._link(key)
+        self._changed()
+
+    def _node_arrays(self):
+        """(node_ids, coords (N, 2), inside (N, Z)); yapı değişince yeniden kurulur."""
+        if self._arrays is None:
+            node_ids = list(self.nodes_map)
+            coords = self._coords(node_ids)
+            self._arrays = (node_ids, coords, points_in_nfzs(coords, self.index))
+        return self._arrays
+
+    def _insert_node(self, node_id, node):
+        """Yeni düğümü yalnızca mevcut düğümlere karşı görünürlük testiyle bağlar."""
+        if node_id in self.nodes_map:
+            raise ValueError(f"{node_id} zaten grafta")
+        node_ids, coords, inside = self._node_arrays()
+        point = np.asarray(node['coords'], dtype=float)
+        point_inside = points_in_nfzs(point[None, :], self.index)[0]
+
+        self.nodes_map[node_id] = node
+        self.adj_list[node_id] = []
+        if self.reduced and len(node_ids):
+            point_in_ring = points_in_nfzs(point[None, :], self._ring_index)[0]
+            rows = np.flatnonzero(self._tangent_row(node_id, point, point_in_ring, slice(None)))
+            blockers = row_blockers(point, point_inside, coords[rows], inside[rows], self.index)
+            self._connect_row(node_id, [node_ids[j] for j in rows], blockers)
+        else:
+            blockers = row_blockers(point, point_inside, coords, inside, self.index)
+            self._connect_row(node_id, node_ids, blockers)
+
+        self._arrays = (node_ids + [node_id], np.vstack([coords, point]),
+                        np.vstack([inside, point_inside]))
+
+    def add_delivery(self, point):
+        self._insert_node(*delivery_node(point))
+        self._changed(structure=True)
+        return str(point.point_id)
+
+    def add_drone(self, drone):
+        node_id, node = drone_node(drone)
+        self._insert_node(node_id, node)
+        self._changed(structure=True)
+        return node_id
+
+    def remove_delivery(self, point_id):
+        """Teslimat düğümünü ve tüm kenarlarını kaldırır; düğüm yoksa False."""
+        node_id = str(point_id)
+        if self.nodes_map.get(node_id, {}).get('type') != NODE_TYPE_DELIVERY:
+            return False
+
+        for neighbor, _ in self.adj_list.pop(node_id):
+            self.adj_list[neighbor] = [edge for edge in self.adj_list[neighbor] if edge[0] != node_id]
+        for key in list(self._node_edges.pop(node_id, {})):
+            self._untrack_edge(key)
+        del self.nodes_map[node_id]
+
+        self._arrays = None
+        self._changed(structure=True)
+        return True
+
+    def add_nfz(self, nfz):
+        """
+        Yeni yasak bölge ekler. Mevcut kenarlardan yalnızca bölgenin bbox'ına
+        değebilecek olanlar test edilir; bölge köşe ve ara noktaları mevcut
+        düğümlere bağlanır.
+        """
+        if nfz.zone_id in self.zone_edges:
+            raise ValueError(f"NFZ {nfz.zone_id} zaten grafta")
+
+        # Tüm kenarlar (maskeliler dahil), yeni bölge eklenmeden önceki yapı
+        full = self.timed_csr()
+        node_ids, coords, inside = self._node_arrays()
+
+        self.nfzs.append(nfz)
+        self.index = NFZIndex(self.nfzs)
+        self._zone_bit[nfz.zone_id] = 1 << (len(self.nfzs) - 1)
+        self._dynamic = np.append(self._dynamic, self.is_dynamic(nfz))
+        self.zone_edges[nfz.zone_id] = {}
+        dynamic = bool(self._dynamic[-1])
+        active = dynamic and (self.current_time is None or
+                              nfz.zone_id in self.zones_active_at(self.current_time))
+        if active:
+            self.active_zones.add(nfz.zone_id)
+
+        zone_index = NFZIndex([nfz])
+        new_inside = points_in_nfzs(coords, zone_index)
+        inside = np.hstack([inside, new_inside])
+        self._arrays = (node_ids, coords, inside)
+
+        # Mevcut kenarları yeni bölgeye karşı test et (her yönsüz kenar bir kez)
+        rows = np.repeat(np.arange(len(full)), np.diff(full.indptr))
+        cols = full.indices
+        once = rows < cols
+        rows, cols = rows[once], cols[once]
+        hit = new_inside[rows, 0] | new_inside[cols, 0]
+        m, _ = segment_edge_hits(full.coords[rows], full.coords[cols], zone_index)
+        hit[m] = True
+
+        for u, v in zip(rows[hit].tolist(), cols[hit].tolist()):
+            a, b = full.node_ids[u], full.node_ids[v]
+            key = (a, b) if (a, b) in self.edge_zones else (b, a)
+            if key in self.edge_zones:
+                distance, zones = self.edge_zones[key]
+                was_open = self._blocked_count[key] == 0
+                if dynamic:
+                    self._untrack_edge(key)
+                    self._track_edge(key, distance, zones | {nfz.zone_id})
+                    if was_open and self._blocked_count[key] > 0:
+                        self._unlink(key)
+                else:
+                    self._untrack_edge(key)
+                    if was_open:
+                        self._unlink(key)
+            elif dynamic:
+                key = (a, b)
+                distance = calculate_distance(self.nodes_map[a]['coords'], self.nodes_map[b]['coords'])
+                self._track_edge(key, distance, frozenset([nfz.zone_id]))
+                if self._blocked_count[key] > 0:
+                    self._unlink(key)
+            else:
+                self._unlink((a, b))
+
+        corners, waypoints = self._zone_nodes(nfz)
+        for node_id, node in corners + waypoints:
+            self._insert_node(node_id, node)
+        self._changed(structure=True)
+
+    def zones_active_at(self, query_time):
+        """query_time anında aktif olan dinamik bölgeler."""
+        t = time_to_minutes(query_time)
+        return {nfz.zone_id for nfz in self.nfzs if self.is_dynamic(nfz) and
+                is_time_in_range(time_to_minutes(nfz.start_time), time_to_minutes(nfz.end_time), t)}
+
+    def set_time(self, current_time):
+        """Dinamik bölgeleri current_time anındaki durumlarına getirir."""
+        self.current_time = current_time
+        active = self.zones_active_at(current_time)
+        for nfz in self.nfzs:
+            if self.is_dynamic(nfz):
+                self.set_zone_active(nfz.zone_id, nfz.zone_id in active)
+
+    def timed_csr(self):
+        """
+        Dinamik engelli kenarlar dahil tam grafın CSR hali; her kenar onu
+        engelleyen bölgelerin bit maskesini taşır. Aç/kapa işlemleri bu grafı
+        değiştirmez, yalnızca yapı değişince yeniden kurulur.
+        """
+        if self._timed_csr is None:
+            full_adj = {node_id: list(edges) for node_id, edges in self.adj_list.items()}
+            masks = {}
+            for (a, b), (distance, zones) in self.edge_zones.items():
+                mask = 0
+                for zone_id in zones:
+                    mask |= self._zone_bit[zone_id]
+                masks[(a, b)] = masks[(b, a)] = mask
+                if self._blocked_count[(a, b)] > 0:
+                    full_adj[a].append((b, distance))
+                    full_adj[b].append((a, distance))
+            self._timed_csr = CSRGraph(full_adj, self.nodes_map, edge_masks=masks)
+        return self._timed_csr
+
+    def a_star(self, start_node, goal_node, query_time=None, landmarks=0, bidirectional=False):
+        """
+        query_time verilmezse mevcut adj_list üzerinde A*; verilirse yalnızca
+        o anda aktif olan bölgeleri görerek (graf değiştirilmeden) arar.
+        landmarks / bidirectional: a_star_search ile aynı (ALT, çift yönlü).
+        """
+        if query_time is None:
+            return a_star_search(self.adj_list, self.nodes_map, self.nfzs, start_node, goal_node,
+                                 landmarks=landmarks, bidirectional=bidirectional)
+        if start_node not in self.nodes_map or goal_node not in self.nodes_map:
+            return None, float('inf')
+
+        blocked = 0
+        for zone_id in self.zones_active_at(query_time):
+            blocked |= self._zone_bit[zone_id]
+        graph = self.timed_csr()
+        table = landmarks_for(graph, landmarks) if landmarks else None
+        search = bidirectional_a_star_csr if bidirectional else a_star_csr
+        path, cost = search(graph, graph.index_of[start_node], graph.index_of[goal_node],
+                            blocked=blocked, landmarks=table)
+        if path is None:
+            return None, float('inf')
+        return [graph.node_ids[i] for i in path], cost
+
+
+def points_in_polygon(points, polygon):
+    """
+    Vectorized form of utils.is_point_in_polygon.
+    points: (N, 2) array, polygon: list of (x, y). Returns a bool array (N,).
+    """
+    poly = np.asarray(polygon, dtype=float)
+    p1 = poly
+    p2 = np.roll(poly, -1, axis=0)
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    p1x, p1y, p2x, p2y = p1[:, 0], p1[:, 1], p2[:, 0], p2[:, 1]
+
+    dy = p2y - p1y
+    safe_dy = np.where(dy != 0, dy, 1.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        xinters = (y - p1y) * (p2x - p1x) / safe_dy + p1x
+    crossing = ((y > np.minimum(p1y, p2y)) & (y <= np.maximum(p1y, p2y)) &
+                (x <= np.maximum(p1x, p2x)) & ((p1x == p2x) | (x <= xinters)))
+    return (np.count_nonzero(crossing, axis=1) % 2) == 1
+
+
+def _orientation(px, py, qx, qy, rx, ry):
+    """utils.segments_intersect içindeki orientation testinin dizi hali (-1, 0, 1)."""
+    return np.sign((qy - py) * (rx - qx) - (qx - px) * (ry - qy))
+
+
+def _on_segment(px, py, qx, qy, rx, ry):
+    return ((qx <= np.maximum(px, rx)) & (qx >= np.minimum(px, rx)) &
+            (qy <= np.maximum(py, ry)) & (qy >= np.minimum(py, ry)))
+
+
+def segments_cross_edges(a, b, edges_start, edges_end):
+    """
+    Vectorized utils.segments_intersect for M segments.
+    a, b: (M, 2) arrays. edges_start/edges_end are either (E, 2) (same edges
+    for every segment) or (M, E, 2) (own edges per segment).
+    Returns a bool array (M, E).
+    """
+    p1x, p1y = a[:, 0:1], a[:, 1:2]
+    p2x, p2y = b[:, 0:1], b[:, 1:2]
+    p3x, p3y = edges_start[..., 0], edges_start[..., 1]
+    p4x, p4y = edges_end[..., 0], edges_end[..., 1]
+
+    o1 = _orientation(p1x, p1y, p2x, p2y, p3x, p3y)
+    o2 = _orientation(p1x, p1y, p2x, p2y, p4x, p4y)
+    o3 = _orientation(p3x, p3y, p4x, p4y, p1x, p1y)
+    o4 = _orientation(p3x, p3y, p4x, p4y, p2x, p2y)
+
+    # General case
+    hit = (o1 != o2) & (o3 != o4)
+
+    # Special Cases
+    hit |= (o1 == 0) & _on_segment(p1x, p1y, p3x, p3y, p2x, p2y)
+    hit |= (o2 == 0) & _on_segment(p1x, p1y, p4x, p4y, p2x, p2y)
+    hit |= (o3 == 0) & _on_segment(p3x, p3y, p1x, p1y, p4x, p4y)
+    hit |= (o4 == 0) & _on_segment(p3x, p3y, p2x, p2y, p4x, p4y)
+    return hit
+
+
+def points_in_nfzs(points, index):
+    """(N, Z) bool matrix: point n is inside zone k. Only points inside a zone's bbox are tested."""
+    inside = np.zeros((len(points), len(index)), dtype=bool)
+    for k, polygon in enumerate(index.polygons):
+        minx, miny, maxx, maxy = index.bboxes[k]
+        cand = np.flatnonzero((points[:, 0] >= minx) & (points[:, 0] <= maxx) &
+                              (points[:, 1] >= miny) & (points[:, 1] <= maxy))
+        if len(cand):
+            inside[cand, k] = points_in_polygon(points[cand], polygon)
+            if metrics.ENABLED:
+                metrics.POLYGON_TESTS.inc(len(cand))
+    return inside
+
+
+def segment_edge_hits(a, b, index):
+    """
+    For M segments (a[m], b[m]) returns index arrays (m, k) of every segment
+    that crosses an edge of zone k. Candidate pairs come from the index grid
+    (cells the segment passes through) and must also overlap the zone bbox
+    before any edge test.
+    """
+    m, k = index.segment_cell_pairs(a, b)
+    if not len(m):
+        return m, k
+    seg_min = np.minimum(a[m], b[m])
+    seg_max = np.maximum(a[m], b[m])
+    bb = index.bboxes[k]
+    overlap = ((seg_min[:, 0] <= bb[:, 2]) & (seg_max[:, 0] >= bb[:, 0]) &
+               (seg_min[:, 1] <= bb[:, 3]) & (seg_max[:, 1] >= bb[:, 1]))
+    m, k = m[overlap], k[overlap]
+    if not len(m):
+        return m, k
+    if metrics.ENABLED:
+        metrics.SEGMENT_TESTS.inc(len(m) * index.edges_start.shape[1])
+    hit = segments_cross_edges(a[m], b[m], index.edges_start[k], index.edges_end[k]).any(axis=1)
+    return m[hit], k[hit]
+
+
+def row_blockers(point, point_inside, others, others_inside, index):
+    """
+    point ile others[m] arasındaki segmentleri engelleyen bölgeler: (M, Z) bool.
+    Segment bölge k'nın bir kenarını kesiyorsa veya uçlarından biri k'nın
+    içindeyse True. point_inside (Z,) / others_inside (M, Z): points_in_nfzs satırları.
+    """
+    blockers = point_inside[None, :] | others_inside
+    if len(index) and len(others):
+        a = np.broadcast_to(point, (len(others), 2))
+        m, k = segment_edge_hits(a, others, index)
+        blockers[m, k] = True
+    return blockers
+
@@ -1,9 +1,10 @@
 # --- KPI PLOTTER ------------------------------------------------------------
-def plot_kpis(drones, distance_km, route_extension):
+def plot_kpis(drones, distance_km, route_extension, save_path=None):
     """
     drones          : List[Drone]   – batarya_history alanı dolmuş olacak
     distance_km     : Dict[delivery_id] = km
     route_extension : Dict[delivery_id] = oran
+    save_path       : verilirse pencere yerine dosyaya kaydedilir
     """
     import matplotlib.pyplot as plt
     import numpy as np
@@ -37,4 +38,8 @@ def plot_kpis(drones, distance_km, route_extension):
     axs[2].legend()
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    if save_path:
+        fig.savefig(save_path, dpi=120)
+        plt.close(fig)
+    else:
+        plt.show()
\ No newline at end of file
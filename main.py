@@ -1,22 +1,78 @@
+import argparse
 import os 
+import random
 import time
 from datetime import datetime
 
+import metrics
 from utils import calculate_distance
 from entities import Drone, DeliveryPoint, NoFlyZone
+from fleet import Fleet, DeliveryTable
 from graph_utils import build_graph
-from a_star_solver import a_star_search
+from a_star_solver import precompute_home_trees
+from path_table import ShortestPathTable
 from csp_solver import CSPSolver
 from ga_optimizer import GAOptimizer
-from plot_utils import plot_routes
+from route_optimizer import RouteOptimizer
 from data_generator import generate_random_drones, generate_random_delivery_points, generate_fixed_no_fly_zones
-from kpi_plot_utils import plot_kpis
 
 
-def main():
+def load_plotters(headless=False):
+    """
+    Çizim fonksiyonlarını ilk ihtiyaçta yükler; matplotlib yalnızca burada
+    içe aktarılır. headless=True iken ekran gerektirmeyen Agg arka ucu seçilir.
+    """
+    if headless:
+        import matplotlib
+        matplotlib.use("Agg")
+    from plot_utils import plot_routes
+    from kpi_plot_utils import plot_kpis
+    return plot_routes, plot_kpis
+
+
+def start_paths(path_table, assignments):
+    """Atamalar için dron başlangıcından teslimata en kısa yollar (plot_routes'a verilir)."""
+    return {d_id: path_table.path(f"D{dr_id}_START", str(d_id)) for d_id, dr_id in assignments.items()}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drone filo optimizasyonu")
+    parser.add_argument("--headless", action="store_true",
+                        help="pencere açma; --output-dir yoksa hiç çizim yapma (matplotlib yüklenmez)")
+    parser.add_argument("--output-dir", help="grafikleri bu klasöre PNG/GIF olarak kaydet")
+    parser.add_argument("--seed", type=int, help="tekrarlanabilir senaryo için rastgele tohum")
+    parser.add_argument("--metrics-file", help="ölçümleri Prometheus metin formatında bu dosyaya yaz")
+    parser.add_argument("--metrics-port", type=int, help="ölçümleri 127.0.0.1:PORT/metrics üzerinden sun")
+    parser.add_argument("--reduced-graph", action="store_true",
+                        help="yalnızca dışbükey NFZ köşeleri ve teğet kenarlarla küçük graf kur")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     MAX_MAP_X = 1000
     MAX_MAP_Y = 1000
 
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.metrics_file or args.metrics_port:
+        metrics.enable()
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+
+    # Çizim: headless ve çıktı klasörü yoksa matplotlib hiç yüklenmez
+    render = not args.headless or args.output_dir is not None
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    def output_file(name):
+        return os.path.join(args.output_dir, name) if args.output_dir else None
+
+    plot_routes = plot_kpis = None
+    if render:
+        plot_routes, plot_kpis = load_plotters(headless=args.headless or args.output_dir is not None)
+
     all_paths = {}           
     # Programın başından itibaren toplam süre hesaplamak için:
     t_total_start = time.time()
@@ -26,14 +82,16 @@ def main():
     for drone in drones_list:
         print(f"Drone {drone.drone_id} | Konum: {drone.start_pos} | Kapasite: {drone.max_weight:.2f} kg | Batarya: {drone.current_battery:.2f} | Hız: {drone.speed:.2f}")
 
+    # Teslimatlar bu bölgelerin dışından seçilsin diye NFZ'ler önce üretilir
+    nfzs_list = generate_fixed_no_fly_zones()
+
     print("\n--- Delivery Points Generated ---")
-    deliveries_list = generate_random_delivery_points(20, MAX_MAP_X, MAX_MAP_Y)
+    deliveries_list = generate_random_delivery_points(20, MAX_MAP_X, MAX_MAP_Y, nfzs=nfzs_list)
     for delivery in deliveries_list:
         tw = f"{delivery.time_window[0]}-{delivery.time_window[1]}" if delivery.time_window else "None"
         print(f"Teslimat {delivery.point_id} | Konum: {delivery.location} | Ağırlık: {delivery.weight:.2f} kg | Öncelik: {delivery.priority} | Time Window: {tw}")
 
     print("\n--- No-Fly Zones Initialized ---")
-    nfzs_list = generate_fixed_no_fly_zones()
     for nfz in nfzs_list:
         coords_str = ", ".join(f"({x},{y})" for x, y in nfz.coordinates)
         print(f"NFZ {nfz.zone_id} → Köşeler: [{coords_str}]")
@@ -63,26 +121,58 @@ def main():
             coords = ", ".join([f"({x},{y})" for x, y in nfz.coordinates])
             f.write(f"NFZ {nfz.zone_id} → Köşeler: [{coords}]\n")
 
+    # Sütun depoları: CSP ve GA kapasite / ağırlık / öncelik dizilerini buradan
+    # okur; nesneler aynı listelerde düz nesne olarak kalır, id ile O(1) erişim.
+    fleet = Fleet.from_drones(drones_list)
+    delivery_table = DeliveryTable.from_points(deliveries_list)
+
     # GRAF OLUŞTUR
     print("\n--- Graph Structure Building ---")
-    nodes_map, adj_list = build_graph(deliveries_list, drones_list, nfzs_list)
+    with metrics.stage("build_graph"):
+        nodes_map, adj_list = build_graph(deliveries_list, drones_list, nfzs_list, reduced=args.reduced_graph)
+
+    # Eve dönüş ağaçları: Drone.return_home kritik anda yalnızca ağaçta yürür
+    with metrics.stage("home_trees"):
+        precompute_home_trees(adj_list, nodes_map, [f"D{dr.drone_id}_START" for dr in drones_list])
+
+    # Dron başlangıçları ve teslimatlar için ortak en kısa yol tablosu
+    t0_table = time.time()
+    with metrics.stage("path_table"):
+        path_table = ShortestPathTable(adj_list, nodes_map).precompute()
+    table_duration = time.time() - t0_table
 
     # CSP
     print("\n--- Constraint Satisfaction Problem (CSP) ---")
     t0_csp = time.time()
-    csp_solver = CSPSolver(deliveries_list, drones_list, adj_list, nodes_map, nfzs_list)
-    delivery_assignments_csp = csp_solver.solve()
+    csp_solver = CSPSolver(delivery_table, fleet, adj_list, nodes_map, nfzs_list, path_table=path_table)
+    with metrics.stage("csp_solve"):
+        delivery_assignments_csp = csp_solver.solve()
     t1_csp = time.time()
     csp_duration = t1_csp - t0_csp
 
-    print("\n--- CSP Map Plotting ---")
-    plot_routes(drones_list, deliveries_list, delivery_assignments_csp, nodes_map, nfzs_list, adj_list, animate=False)
+    # Çok duraklı rota: CSP'nin dron başına teslimat sırası 2-opt / Or-opt ile iyileştirilir
+    print("\n--- Multi-Stop Routes (2-opt / Or-opt) ---")
+    with metrics.stage("route_optimize"):
+        route_optimizer = RouteOptimizer(drones_list, deliveries_list, path_table=path_table)
+        routes = route_optimizer.optimize(delivery_assignments_csp, order=[leg[0] for leg in csp_solver.legs])
+    csp_distance = sum(leg[3] for leg in csp_solver.legs)
+    route_distance = sum(route['distance'] for route in routes.values())
+    for drone_id, route in routes.items():
+        print(f"  Dron {drone_id}: {route['stops']} | Mesafe: {route['distance']:.2f} | Pil: {route['battery']:.2f}")
+    print(f"  Toplam mesafe: CSP sırası {csp_distance:.2f} → optimize {route_distance:.2f}")
+
+    if render:
+        print("\n--- CSP Map Plotting ---")
+        plot_routes(drones_list, deliveries_list, delivery_assignments_csp, nodes_map, nfzs_list, adj_list,
+                    animate=False, save_path=output_file("csp_routes.png"),
+                    paths=start_paths(path_table, delivery_assignments_csp))
 
     # GA
     print("\n--- Genetic Algorithm (GA) ---")
     t0_ga = time.time()
-    ga_solver = GAOptimizer(drones_list, deliveries_list, nfzs_list, nodes_map, adj_list)
-    ga_assignments = ga_solver.run()
+    ga_solver = GAOptimizer(fleet, delivery_table, nfzs_list, nodes_map, adj_list, path_table=path_table)
+    with metrics.stage("ga_run"):
+        ga_assignments = ga_solver.run()
     t1_ga = time.time()
     ga_duration = t1_ga - t0_ga
 
@@ -90,8 +180,11 @@ def main():
     for d_id, dr_id in ga_assignments.items():
         print(f"  Teslimat {d_id} → Dron {dr_id}")
 
-    print("\n--- GA Map Plotting ---")
-    plot_routes(drones_list, deliveries_list, ga_assignments, nodes_map, nfzs_list, adj_list, animate=True)
+    if render:
+        print("\n--- GA Map Plotting ---")
+        plot_routes(drones_list, deliveries_list, ga_assignments, nodes_map, nfzs_list, adj_list,
+                    animate=True, save_path=output_file("ga_routes.gif"),
+                    paths=start_paths(path_table, ga_assignments))
 
     # A*
     print("\n--- A* for All GA Assignments ---")
@@ -100,13 +193,10 @@ def main():
     for d_id, dr_id in ga_assignments.items():
         start_node = f"D{dr_id}_START"
         goal_node = str(d_id)
-        path, cost = a_star_search(adj_list, nodes_map, nfzs_list,
-                                   start_node, goal_node)
+        found_path, total_cost = path_table.lookup(start_node, goal_node)
 
-        all_paths[d_id] = (path, cost)
-        found_path, total_cost = a_star_search(adj_list, nodes_map, nfzs_list, start_node, goal_node)
+        all_paths[d_id] = (found_path, total_cost)
         if found_path:
-            all_paths[d_id] = (found_path, total_cost)
             print(f"  Teslimat {d_id} için Dron {dr_id}: Path = {found_path}, Cost = {total_cost:.2f}")
         else:
             print(f"  Teslimat {d_id} için Dron {dr_id}: Path bulunamadı veya NFZ nedeniyle geçersiz!")
@@ -122,8 +212,8 @@ def main():
 
     total_energy = 0.0
     for d_id, dr_id in ga_assignments.items():
-        delivery_point = next((dp for dp in deliveries_list if dp.point_id == d_id), None)
-        drone_obj = next((dr for dr in drones_list if dr.drone_id == dr_id), None)
+        delivery_point = delivery_table.get_point(d_id)
+        drone_obj = fleet.get_drone(dr_id)
         if delivery_point and drone_obj:
             dist = calculate_distance(drone_obj.start_pos, delivery_point.location)
             total_energy += dist
@@ -140,9 +230,8 @@ def main():
 
     for d_id, (path, cost) in all_paths.items():   # ③ güvenle okuyoruz
         dr_id       = ga_assignments[d_id]
-        drone_obj   = next(dr for dr in drones_list if dr.drone_id == dr_id)
-        delivery_pt = next(dp for dp in deliveries_list
-                           if dp.point_id == d_id)
+        drone_obj   = fleet.get_drone(dr_id)
+        delivery_pt = delivery_table.get_point(d_id)
 
         distance_km[d_id] = cost / 1000
 
@@ -150,7 +239,8 @@ def main():
                                       delivery_pt.location)
         route_extension[d_id] = cost / straight if straight else 1.0
 
-    plot_kpis(drones_list, distance_km, route_extension)
+    if render:
+        plot_kpis(drones_list, distance_km, route_extension, save_path=output_file("kpis.png"))
 
     print("\n--- Özet Metrikler ---")
     print(f"Tamamlanan Teslimat Sayısı: {completed_deliveries}/{total_deliveries} (%{completion_pct:.2f})")
@@ -158,7 +248,11 @@ def main():
     print(f"CSP Algoritma Çalışma Süresi: {csp_duration:.3f} saniye")
     print(f"GA Algoritma Çalışma Süresi: {ga_duration:.3f} saniye")
     print(f"A* (Tüm Atamalar) Algoritma Çalışma Süresi: {a_star_all_duration:.3f} saniye")
+    print(f"En Kısa Yol Tablosu Hazırlama Süresi: {table_duration:.3f} saniye")
     print(f"Toplam Program Çalışma Süresi: {total_duration:.3f} saniye")
 
+    if args.metrics_file:
+        metrics.write_textfile(args.metrics_file)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,237 @@
+# metrics.py
+"""
+Hafif ölçüm katmanı: sayaçlar, göstergeler (gauge) ve aşama zamanlayıcıları.
+Varsayılan olarak kapalıdır; sıcak döngüler yalnızca `metrics.ENABLED`
+bayrağını kontrol eder ve kapalıyken hiçbir sayaç güncellenmez. Değerler
+Prometheus metin formatında dosyaya veya yerel bir HTTP uç noktasına
+aktarılır.
+
+    import metrics
+    metrics.enable()
+    with metrics.stage("build_graph"):
+        ...
+    metrics.write_textfile("metrics.prom")
+    metrics.start_http_server(9100)   # http://127.0.0.1:9100/metrics
+"""
+
+import contextlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = False
+
+
+class _Metric:
+    TYPE = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        return _Child(self, tuple(str(labels[name]) for name in self.labelnames))
+
+    def _add(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        """(ek, etiketler, değer) üçlüleri."""
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", dict(zip(self.labelnames, key)), value
+
+
+class _Child:
+    """labels(...) ile seçilmiş tek bir zaman serisi."""
+
+    __slots__ = ('metric', 'key')
+
+    def __init__(self, metric, key):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount=1):
+        self.metric._add(self.key, amount)
+
+    def set(self, value):
+        self.metric._set(self.key, value)
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def inc(self, amount=1):
+        self._add((), amount)
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def set(self, value):
+        self._set((), value)
+
+
+class Timer(_Metric):
+    """Aşama başına toplam süre ve çağrı sayısı (Prometheus summary)."""
+
+    TYPE = "summary"
+
+    def observe(self, key, seconds):
+        with self._lock:
+            total, count = self._values.get(key, (0.0, 0))
+            self._values[key] = (total + seconds, count + 1)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, (total, count) in items:
+            labels = dict(zip(self.labelnames, key))
+            yield "_sum", labels, total
+            yield "_count", labels, count
+
+
+REGISTRY = []
+
+
+def _register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+A_STAR_EXPANSIONS = _register(Counter(
+    "drone_astar_expansions_total", "A* / Dijkstra ile genişletilen düğüm sayısı", ("algorithm",)))
+A_STAR_PUSHES = _register(Counter(
+    "drone_astar_heap_pushes_total", "A* / Dijkstra öncelik kuyruğuna ekleme sayısı", ("algorithm",)))
+SEGMENT_TESTS = _register(Counter(
+    "drone_segment_edge_tests_total", "Graf kurulumunda yapılan doğru parçası / NFZ kenarı kesişim testleri"))
+POLYGON_TESTS = _register(Counter(
+    "drone_point_polygon_tests_total", "Graf kurulumunda yapılan nokta / NFZ çokgeni içerme testleri"))
+FITNESS_EVALS = _register(Counter(
+    "drone_ga_fitness_evaluations_total", "GA fitness hesaplamaları (önbellek ıskalamaları)"))
+FITNESS_CACHE_HITS = _register(Counter(
+    "drone_ga_fitness_cache_hits_total", "GA fitness önbellek isabetleri"))
+STAGE_SECONDS = _register(Timer(
+    "drone_stage_seconds", "İşlem hattı aşamalarının süresi", ("stage",)))
+BATTERY_PCT = _register(Gauge(
+    "drone_battery_percent", "Dron batarya yüzdesi", ("drone_id",)))
+FAILSAFE_COUNT = _register(Counter(
+    "drone_failsafe_returns_total", "Kritik bataryada eve dönüş sayısı", ("drone_id",)))
+
+
+def enable():
+    """Ölçümü açar ve Drone sınıfının metrik kancalarını bağlar."""
+    global ENABLED
+    from entities import Drone
+
+    ENABLED = True
+    Drone.BATTERY_PCT = BATTERY_PCT
+    Drone.FAILSAFE_COUNT = FAILSAFE_COUNT
+
+
+def disable():
+    global ENABLED
+    from entities import Drone
+
+    ENABLED = False
+    Drone.BATTERY_PCT = None
+    Drone.FAILSAFE_COUNT = None
+
+
+def reset():
+    for metric in REGISTRY:
+        metric.reset()
+
+
+def counted(push, counter):
+    """heapq.heappush yerine geçen, her eklemede counter'ı artıran fonksiyon."""
+    def counting_push(heap, item):
+        counter.inc()
+        push(heap, item)
+    return counting_push
+
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def _timed(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe((name,), time.perf_counter() - t0)
+
+
+def stage(name):
+    """Aşama zamanlayıcısı; kapalıyken paylaşılan boş bağlam döner."""
+    return _timed(name) if ENABLED else _NULL_STAGE
+
+
+# ---------------------------------------------------------------------- #
+# Dışa aktarım
+# ---------------------------------------------------------------------- #
+def _format_labels(labels):
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    return "{" + body + "}"
+
+
+def render():
+    """Tüm metrikleri Prometheus metin formatında döner."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+        for suffix, labels, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path):
+    """node_exporter textfile biçiminde atomik yazım (geçici dosya + rename)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, addr="127.0.0.1"):
+    """/metrics uç noktasını arka plan iş parçacığında sunar; sunucuyu döner."""
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
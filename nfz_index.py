@@ -0,0 +1,195 @@
+# nfz_index.py
+
+import math
+
+import numpy as np
+
+from utils import is_point_in_polygon, segment_crosses_polygon
+
+
+class NFZIndex:
+    """
+    Yasak bölgeler için önceden kurulmuş uzamsal indeks.
+    Her poligonun sınırlayıcı kutusu (bbox) ve tekdüze bir ızgara (grid)
+    tutulur; nokta/segment sorguları yalnızca ilgili hücrelerdeki ve
+    bbox'ı kesişen poligonlar için tam kenar taramasına iner.
+    """
+
+    def __init__(self, nfzs, cell_size=None):
+        # NoFlyZone nesneleri veya doğrudan köşe listeleri kabul edilir
+        self.nfzs = list(nfzs)
+        self.polygons = [getattr(nfz, 'coordinates', nfz) for nfz in self.nfzs]
+
+        if self.polygons:
+            self.bboxes = np.array([
+                (min(x for x, _ in poly), min(y for _, y in poly),
+                 max(x for x, _ in poly), max(y for _, y in poly))
+                for poly in self.polygons
+            ], dtype=float)
+        else:
+            self.bboxes = np.zeros((0, 4), dtype=float)
+        self._bbox_list = self.bboxes.tolist()   # skaler sorgular için
+
+        # Kenar dizileri (Z, Emax, 2). Kısa poligonlar ilk köşede sıfır
+        # uzunluklu kenarlarla doldurulur; bu kenarlar yalnızca gerçek
+        # kenarların da yakaladığı köşe temaslarını raporlar.
+        emax = max((len(poly) for poly in self.polygons), default=0)
+        self.edges_start = np.zeros((len(self.polygons), emax, 2), dtype=float)
+        self.edges_end = np.zeros((len(self.polygons), emax, 2), dtype=float)
+        for k, poly in enumerate(self.polygons):
+            arr = np.asarray(poly, dtype=float)
+            self.edges_start[k, :len(arr)] = arr
+            self.edges_end[k, :len(arr)] = np.roll(arr, -1, axis=0)
+            self.edges_start[k, len(arr):] = arr[0]
+            self.edges_end[k, len(arr):] = arr[0]
+
+        if cell_size is None:
+            cell_size = self._default_cell_size()
+        self.cell_size = float(cell_size)
+
+        self.origin = (float(self.bboxes[:, 0].min()), float(self.bboxes[:, 1].min())) \
+            if len(self.bboxes) else (0.0, 0.0)
+
+        # (cx, cy) -> poligon index listesi; cell_ranges (Z, 4) aynı kovaların
+        # dizi hali: poligon k, [cx0..cx1] x [cy0..cy1] hücrelerinde kayıtlı
+        self.cells = {}
+        self.cell_ranges = np.zeros((len(self.bboxes), 4), dtype=np.int64)
+        for k, (minx, miny, maxx, maxy) in enumerate(self.bboxes):
+            cx0, cy0 = self._cell(minx, miny)
+            cx1, cy1 = self._cell(maxx, maxy)
+            self.cell_ranges[k] = (cx0, cy0, cx1, cy1)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(k)
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def _default_cell_size(self):
+        """Ortalama poligon boyutu: her poligon birkaç hücreye yayılır."""
+        if not len(self.bboxes):
+            return 1.0
+        extents = np.maximum(self.bboxes[:, 2] - self.bboxes[:, 0],
+                             self.bboxes[:, 3] - self.bboxes[:, 1])
+        size = float(extents.mean())
+        return size if size > 0 else 1.0
+
+    def _cell(self, x, y):
+        return (math.floor((x - self.origin[0]) / self.cell_size),
+                math.floor((y - self.origin[1]) / self.cell_size))
+
+    # ------------------------------------------------------------------ #
+    def candidates_at_point(self, point):
+        """Noktanın hücresindeki ve bbox'ı noktayı içeren poligonlar."""
+        x, y = point
+        result = []
+        for k in self.cells.get(self._cell(x, y), ()):
+            minx, miny, maxx, maxy = self._bbox_list[k]
+            if minx <= x <= maxx and miny <= y <= maxy:
+                result.append(k)
+        return result
+
+    def _segment_cells(self, p1, p2):
+        """Segmentin geçtiği hücreler (sütun sütun tarama, kenarlarda toleranslı)."""
+        (x1, y1), (x2, y2) = sorted((p1, p2))
+        eps = 1e-9 * self.cell_size
+        cx0 = math.floor((x1 - self.origin[0]) / self.cell_size)
+        cx1 = math.floor((x2 - self.origin[0]) / self.cell_size)
+
+        for cx in range(cx0, cx1 + 1):
+            if x2 == x1:
+                ya, yb = y1, y2
+            else:
+                xa = max(x1, self.origin[0] + cx * self.cell_size)
+                xb = min(x2, self.origin[0] + (cx + 1) * self.cell_size)
+                slope = (y2 - y1) / (x2 - x1)
+                ya = y1 + (xa - x1) * slope
+                yb = y1 + (xb - x1) * slope
+            lo, hi = min(ya, yb) - eps, max(ya, yb) + eps
+            cy0 = math.floor((lo - self.origin[1]) / self.cell_size)
+            cy1 = math.floor((hi - self.origin[1]) / self.cell_size)
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def candidates_for_segment(self, p1, p2):
+        """Segmentin geçtiği hücrelerdeki ve bbox'ı segmentle kesişen poligonlar."""
+        seg_minx, seg_maxx = min(p1[0], p2[0]), max(p1[0], p2[0])
+        seg_miny, seg_maxy = min(p1[1], p2[1]), max(p1[1], p2[1])
+
+        # Çok uzun segmentlerde hücre taraması yerine doğrudan bbox taraması
+        span = max(seg_maxx - seg_minx, seg_maxy - seg_miny) / self.cell_size
+        if span > 4 * len(self.polygons):
+            seen = range(len(self.polygons))
+        else:
+            seen = set()
+            for cell in self._segment_cells(p1, p2):
+                seen.update(self.cells.get(cell, ()))
+
+        result = []
+        for k in sorted(seen):
+            minx, miny, maxx, maxy = self._bbox_list[k]
+            if seg_minx <= maxx and seg_maxx >= minx and seg_miny <= maxy and seg_maxy >= miny:
+                result.append(k)
+        return result
+
+    def zones_in_cells(self, cx0, cy0, cx1, cy1):
+        """[cx0..cx1] x [cy0..cy1] aralığındaki kovaların birleşimi (sıralı index dizisi)."""
+        r = self.cell_ranges
+        return np.flatnonzero((r[:, 0] <= cx1) & (r[:, 2] >= cx0) &
+                              (r[:, 1] <= cy1) & (r[:, 3] >= cy0))
+
+    def segment_cell_pairs(self, a, b):
+        """
+        _segment_cells + kova toplamanın vektörel hali. a, b: (M, 2) segment uçları.
+        Segment m, poligon k'nın kayıtlı olduğu bir hücreden geçiyorsa (m, k)
+        döner. Önce tüm segmentlerin hücre aralığındaki kovalar toplanır;
+        sütun taraması yalnızca bu aday poligonlar için yapılır.
+        """
+        empty = np.zeros(0, dtype=np.int64)
+        if not len(a) or not len(self.polygons):
+            return empty, empty
+        cs, (ox, oy) = self.cell_size, self.origin
+        eps = 1e-9 * cs
+        swap = (a[:, 0] > b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] > b[:, 1]))
+        p = np.where(swap[:, None], b, a)
+        q = np.where(swap[:, None], a, b)
+        x1, y1, x2, y2 = p[:, 0:1], p[:, 1:2], q[:, 0:1], q[:, 1:2]
+        col0 = np.floor((x1 - ox) / cs).astype(np.int64)
+        col1 = np.floor((x2 - ox) / cs).astype(np.int64)
+
+        lo_all = min(p[:, 1].min(), q[:, 1].min()) - eps
+        hi_all = max(p[:, 1].max(), q[:, 1].max()) + eps
+        zones = self.zones_in_cells(int(col0.min()), math.floor((lo_all - oy) / cs),
+                                    int(col1.max()), math.floor((hi_all - oy) / cs))
+        if not len(zones):
+            return empty, empty
+        r = self.cell_ranges[zones]
+
+        # Ortak sütun aralığı; y segment boyunca doğrusal olduğundan bu
+        # sütunlardaki hücre satırları tek bir [cy_lo, cy_hi] aralığıdır
+        c_lo = np.maximum(col0, r[:, 0])
+        c_hi = np.minimum(col1, r[:, 2])
+        xa = np.maximum(x1, ox + c_lo * cs)
+        xb = np.minimum(x2, ox + (c_hi + 1) * cs)
+        vertical = x2 == x1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(vertical, 0.0, (y2 - y1) / np.where(vertical, 1.0, x2 - x1))
+        ya = np.where(vertical, y1, y1 + (xa - x1) * slope)
+        yb = np.where(vertical, y2, y1 + (xb - x1) * slope)
+        cy_lo = np.floor((np.minimum(ya, yb) - eps - oy) / cs)
+        cy_hi = np.floor((np.maximum(ya, yb) + eps - oy) / cs)
+
+        hit = (c_lo <= c_hi) & (cy_lo <= r[:, 3]) & (cy_hi >= r[:, 1])
+        m, j = np.nonzero(hit)
+        return m, zones[j]
+
+    # ------------------------------------------------------------------ #
+    def point_blocked(self, point):
+        """Nokta herhangi bir yasak bölgenin içindeyse True."""
+        return any(is_point_in_polygon(point, self.polygons[k])
+                   for k in self.candidates_at_point(point))
+
+    def segment_blocked(self, p1, p2):
+        """Segment herhangi bir yasak bölgeyi kesiyorsa veya içindeyse True."""
+        return any(segment_crosses_polygon((p1, p2), self.polygons[k])
+                   for k in self.candidates_for_segment(p1, p2))
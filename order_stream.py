@@ -0,0 +1,267 @@
+# order_stream.py
+"""
+Akış (streaming) sipariş alımı: siparişler JSONL/CSV dosyasından veya
+stdin'den tek tek okunur, adet veya zaman penceresine göre mikro
+gruplara (micro-batch) ayrılır; her grup artımlı graf güncellemesi ve CSP
+atamasından geçirilir ve kararlar JSONL olarak akıtılır. Bellek, günün
+toplam sipariş hacmiyle değil grup boyutuyla sınırlıdır.
+
+    python order_stream.py siparisler.jsonl --batch-size 50 > kararlar.jsonl
+    cat siparisler.csv | python order_stream.py - --format csv --max-wait 2
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from queue import Empty, Queue
+from threading import Thread
+
+from entities import DeliveryPoint
+from graph_utils import FlightGraph, NODE_TYPE_DELIVERY
+from path_table import ShortestPathTable
+from csp_solver import CSPSolver
+from data_generator import generate_random_drones, generate_fixed_no_fly_zones
+
+
+def _parse_time_window(value):
+    """'HH:MM-HH:MM', [başlangıç, bitiş] veya boş değer → (str, str) / None."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        start, end = value.split("-")
+        return start.strip(), end.strip()
+    return tuple(value)
+
+
+def order_from_record(record):
+    """JSON nesnesi veya CSV satırından DeliveryPoint üretir."""
+    point_id = int(record.get("point_id", record.get("id")))
+    if "location" in record:
+        x, y = record["location"]
+    else:
+        x, y = float(record["x"]), float(record["y"])
+    time_window = record.get("time_window")
+    if time_window is None and record.get("tw_start"):
+        time_window = (record["tw_start"], record["tw_end"])
+    return DeliveryPoint(point_id, (x, y), float(record["weight"]), int(record.get("priority", 1)),
+                         _parse_time_window(time_window))
+
+
+def read_orders(source, fmt=None):
+    """
+    source: dosya yolu veya stdin için '-'. fmt: 'jsonl' veya 'csv'
+    (verilmezse dosya uzantısından, stdin için jsonl). Siparişleri tek tek üretir;
+    bozuk bir kayıt (geçersiz JSON, eksik / hatalı alan) stderr'e yazılıp
+    atlanır, akış sürer.
+    """
+    if fmt is None:
+        fmt = "csv" if str(source).endswith(".csv") else "jsonl"
+
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            records = ((n, row) for n, row in enumerate(csv.DictReader(stream), start=2))
+        else:
+            records = ((n, line.strip()) for n, line in enumerate(stream, start=1) if line.strip())
+        for n, record in records:
+            try:
+                yield order_from_record(record if fmt == "csv" else json.loads(record))
+            except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                print(f"Bozuk sipariş kaydı atlandı ({source}:{n}): {exc!r}", file=sys.stderr)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+_END = object()
+
+
+def _pump(orders, queue):
+    """Siparişleri okuyucu iş parçacığında kuyruğa aktarır; hata da kuyruktan iletilir."""
+    try:
+        for order in orders:
+            queue.put(order)
+    except Exception as exc:
+        queue.put(exc)
+    queue.put(_END)
+
+
+def micro_batches(orders, max_size=100, max_wait=None, clock=time.monotonic):
+    """
+    Siparişleri en fazla max_size elemanlı gruplara ayırır. max_wait (saniye)
+    verilirse siparişler ayrı bir iş parçacığında okunur ve grup, ilk
+    siparişinden max_wait saniye sonra yeni sipariş gelmese de kapatılır
+    (boşta kalan akışta yarım grup beklemez; dispatch_service ile aynı pencere).
+    """
+    if max_wait is None:
+        batch = []
+        for order in orders:
+            batch.append(order)
+            if len(batch) >= max_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+
+    queue = Queue(maxsize=max_size)
+    Thread(target=_pump, args=(orders, queue), daemon=True).start()
+    batch = []
+    deadline = None
+    while True:
+        try:
+            item = queue.get(timeout=None if deadline is None else max(deadline - clock(), 0.0))
+        except Empty:
+            yield batch
+            batch, deadline = [], None
+            continue
+        if item is _END:
+            break
+        if isinstance(item, Exception):
+            raise item
+        if not batch:
+            deadline = clock() + max_wait
+        batch.append(item)
+        if len(batch) >= max_size or clock() >= deadline:
+            yield batch
+            batch, deadline = [], None
+    if batch:
+        yield batch
+
+
+class StreamDispatcher:
+    """
+    Sıcak tutulan graf, filo ve en kısa yol tablosu üzerinde grup grup atama
+    yapar. Her grup için teslimatlar grafa artımlı eklenir, tablo yalnızca
+    etkilenen satırları düşürerek yeni grafa taşınır (ShortestPathTable.update),
+    CSP ataması çalışır, ardından şarj politikası uygulanır ve hiçbir dronun
+    bulunmadığı eski teslimat düğümleri graftan çıkarılır.
+
+    time_aware=True iken dinamik NFZ'ler her grupta clock() (varsayılan duvar
+    saati) veya process(now=...) anına göre açılıp kapanır.
+    """
+
+    def __init__(self, drones, nfzs, time_aware=False, recharge_pct=30, clock=datetime.now):
+        self.drones = drones
+        self.graph = FlightGraph([], drones, nfzs, time_aware=time_aware)
+        self.path_table = ShortestPathTable(self.graph.adj_list, self.graph.nodes_map)
+        self.recharge_pct = recharge_pct
+        self.clock = clock
+        self._removed = []   # son tablo güncellemesinden beri silinen düğümler
+
+    def process(self, batch, now=None):
+        """
+        Grubun kararlarını üretir. Grafta zaten bulunan (ör. dronun beklediği
+        eski teslimat) veya grupta tekrarlanan kimlikler hata kararıyla
+        reddedilir; ilk geçerli kopya atanır.
+        """
+        accepted = {}
+        for order in batch:
+            if str(order.point_id) in self.graph.nodes_map or order.point_id in accepted:
+                yield {"delivery_id": order.point_id, "error": "teslimat kimliği zaten kullanımda"}
+            else:
+                accepted[order.point_id] = order
+        batch = list(accepted.values())
+
+        toggled = False
+        if self.graph.time_aware:
+            version = self.graph.version
+            self.graph.set_time(self.clock() if now is None else now)
+            toggled = self.graph.version != version
+
+        added = [self.graph.add_delivery(order) for order in batch]
+        if toggled:
+            self.path_table.reset()
+        else:
+            self.path_table.update(added, self._removed)
+        self._removed = []
+
+        # Pil geçmişi yalnızca bu grup için tutulur (akış boyunca büyümez)
+        for drone in self.drones:
+            drone.battery_history.clear()
+            drone.time_ticks.clear()
+
+        path_table = self.path_table
+        assignments = {}
+        try:
+            solver = CSPSolver(batch, self.drones, self.graph.adj_list, self.graph.nodes_map,
+                               self.graph.nfzs, path_table=path_table, verbose=False)
+            assignments = solver.solve()
+
+            for delivery_id, drone_id, start_node, cost in solver.legs:
+                yield {
+                    "delivery_id": delivery_id,
+                    "drone_id": drone_id,
+                    "cost": round(cost, 3),
+                    "path": path_table.path(start_node, str(delivery_id)),
+                }
+            for order in batch:
+                if order.point_id not in assignments:
+                    yield {"delivery_id": order.point_id, "drone_id": None, "cost": None, "path": None}
+        finally:
+            # Tüketici üreteci yarıda bıraksa da graf bir sonraki gruba temiz kalır
+            self._recharge(rejected=len(assignments) < len(batch))
+            self._release(batch)
+
+    def _recharge(self, rejected):
+        """
+        Eve dönüş / şarj politikası: pili recharge_pct altına düşen dronlar ve
+        grupta atanamayan sipariş kaldıysa evde olmayan tüm dronlar eve döner
+        ve sonraki gruba tam şarjla başlar. Eve yolu olmayan dron yerinde kalır.
+        """
+        for drone in self.drones:
+            home = f"D{drone.drone_id}_START"
+            pct = 100 * drone.current_battery / drone.battery_capacity
+            if drone.last_node_id == home or not (rejected or pct < self.recharge_pct):
+                continue
+            # Graf yönsüz: evden çıkan satır gruplar arasında korunur
+            if self.path_table.cost(home, drone.last_node_id) == float("inf"):
+                continue
+            drone.current_battery = drone.battery_capacity
+            drone.current_pos = drone.home_pos
+            drone.last_node_id = home
+            drone.is_busy = False
+
+    def _release(self, batch):
+        """Dronların şu an bulunduğu düğümler dışındaki teslimat düğümlerini siler."""
+        occupied = {drone.last_node_id for drone in self.drones}
+        for node_id, node in list(self.graph.nodes_map.items()):
+            if node['type'] == NODE_TYPE_DELIVERY and node_id not in occupied:
+                self.graph.remove_delivery(node['original_id'])
+                self._removed.append(node_id)
+
+    def run(self, batches):
+        """Her grubun kararlarını sırayla üretir."""
+        for batch in batches:
+            yield from self.process(batch)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Akış halinde sipariş alımı ve mikro grup ataması")
+    parser.add_argument("source", help="JSONL/CSV dosyası veya stdin için '-'")
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--max-wait", type=float, help="saniye cinsinden grup penceresi")
+    parser.add_argument("--drones", type=int, default=5)
+    parser.add_argument("--recharge-below", type=float, default=30, help="bu pil yüzdesinin altında eve dön ve şarj ol")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    dispatcher = StreamDispatcher(generate_random_drones(args.drones, 1000, 1000),
+                                  generate_fixed_no_fly_zones(), recharge_pct=args.recharge_below)
+
+    batches = micro_batches(read_orders(args.source, args.format), args.batch_size, args.max_wait)
+    for decision in dispatcher.run(batches):
+        sys.stdout.write(json.dumps(decision, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# path_table.py
+
+import heapq
+
+import numpy as np
+
+import metrics
+from a_star_solver import csr_graph_for
+from graph_utils import NODE_TYPE_DRONE_START, NODE_TYPE_DELIVERY
+
+
+class DijkstraSearch:
+    """
+    Yarıda bırakılıp kaldığı yerden sürdürülebilen tek kaynaklı Dijkstra.
+    Kesinleşen (done) düğümlerin dist değerleri, arama hangi hedeflerde
+    durdurulmuş olursa olsun kesintisiz bir çalıştırmayla birebir aynıdır.
+    """
+
+    __slots__ = ('dist', 'pred', 'best', 'done', 'heap')
+
+    def __init__(self, n, start):
+        self.dist = np.full(n, np.inf)
+        self.pred = np.full(n, -1, dtype=np.int64)
+        self.dist[start] = 0.0
+        self.best = {start: 0.0}
+        self.done = set()
+        self.heap = [(0.0, start)]
+        if metrics.ENABLED:
+            metrics.A_STAR_PUSHES.labels(algorithm="dijkstra").inc()
+
+    def run(self, indptr, indices, weights, target=None):
+        """target kesinleşene kadar (None ise kuyruk bitene kadar) ilerler."""
+        dist, pred, best, done, heap = self.dist, self.pred, self.best, self.done, self.heap
+        push = heapq.heappush
+        if metrics.ENABLED:
+            push = metrics.counted(push, metrics.A_STAR_PUSHES.labels(algorithm="dijkstra"))
+        if target in done:
+            return True
+        settled = len(done)
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            dist[u] = d
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                nd = d + weights[k]
+                if nd < best.get(v, float('inf')):
+                    best[v] = nd
+                    pred[v] = u
+                    push(heap, (nd, v))
+            if u == target:
+                break
+        if metrics.ENABLED:
+            metrics.A_STAR_EXPANSIONS.labels(algorithm="dijkstra").inc(len(done) - settled)
+        return target in done
+
+    @property
+    def finished(self):
+        return not self.heap
+
+
+def dijkstra_row(indptr, indices, weights, start):
+    """CSR listeleri üzerinde tek kaynaklı Dijkstra: (dist, pred) dizileri."""
+    search = DijkstraSearch(len(indptr) - 1, start)
+    search.run(indptr, indices, weights)
+    return search.dist, search.pred
+
+
+class ShortestPathTable:
+    """
+    Kaynak başına tek Dijkstra ile kurulan mesafe / öncül (predecessor) tablosu.
+    CSP, GA ve main aynı (başlangıç, hedef) çiftleri için A*'ı tekrar tekrar
+    çalıştırmak yerine bu tablodan okur; yol, öncüllerden istendiğinde kurulur.
+    Henüz hesaplanmamış bir kaynak ilk sorguda hesaplanır.
+    """
+
+    def __init__(self, adj_list, nodes_map, sources=None):
+        self.adj_list = adj_list
+        self.nodes_map = nodes_map
+        self.graph = csr_graph_for(adj_list, nodes_map)
+        self.node_ids = self.graph.node_ids
+        self.index_of = self.graph.index_of
+
+        self.dist = {}   # source_id -> np.ndarray (N,)
+        self.pred = {}   # source_id -> np.ndarray (N,), -1 = öncül yok
+        # cost() için yarıda bırakılmış aramalar; satır istenince tamamlanır
+        self._searches = {}
+
+        if sources is not None:
+            self.precompute(sources)
+
+    def default_sources(self):
+        """Tüm dron başlangıçları ve teslimat noktaları."""
+        return [node_id for node_id in self.node_ids
+                if self.nodes_map[node_id]['type'] in (NODE_TYPE_DRONE_START, NODE_TYPE_DELIVERY)]
+
+    def reset(self):
+        """Graf kenarları yerinde değiştiğinde (ör. NFZ aç/kapa) tüm satırları düşürür."""
+        self.graph = csr_graph_for(self.adj_list, self.nodes_map)
+        self.node_ids = self.graph.node_ids
+        self.index_of = self.graph.index_of
+        self.dist, self.pred, self._searches = {}, {}, {}
+        return self
+
+    def update(self, added=(), removed=()):
+        """
+        Graftan yalnızca düğüm eklenip silindiyse (FlightGraph.add_delivery /
+        remove_delivery) tabloyu yeni CSR'ye taşır; etkilenmeyen satırlar korunur.
+
+        - Silinen bir düğüm satırda bir yolun ara düğümüyse satır düşer.
+        - Eklenen düğümlerin mesafesi mevcut komşularından bulunur; bu
+          düğümler üzerinden eski bir düğüme daha kısa bir yol çıkıyorsa
+          satır düşer. Daha kısa yeni yol, eklenen düğümlerden birinin eski
+          bir komşusunu mutlaka kısaltacağından komşulara bakmak yeterlidir.
+
+        Düşen satırlar (ve yarıda kalmış aramalar) ilk sorguda yeniden hesaplanır.
+        """
+        old = self.graph
+        self.graph = csr_graph_for(self.adj_list, self.nodes_map)
+        self.node_ids = self.graph.node_ids
+        self.index_of = self.graph.index_of
+        self._searches = {}
+        if self.graph is old:
+            return self
+
+        gone = np.array([old.index_of[n] for n in removed if n in old.index_of], dtype=np.int64)
+        new_nodes = [self.index_of[n] for n in added if n in self.index_of]
+        # yeni indeks -> eski indeks (-1 = yeni düğüm); eski indeks -> yeni indeks (sonda -1 için -1)
+        old_of = np.array([old.index_of.get(n, -1) for n in self.node_ids], dtype=np.int64)
+        new_of = np.array([self.index_of.get(n, -1) for n in old.node_ids] + [-1], dtype=np.int64)
+        known = old_of >= 0
+
+        for source in list(self.dist):
+            dist, pred = self.dist.pop(source), self.pred.pop(source)
+            if source not in self.index_of or (len(gone) and np.isin(pred, gone).any()):
+                continue
+            dist = np.where(known, dist[old_of], np.inf)
+            pred = np.where(known, new_of[pred[old_of]], -1)
+            if self._extend(dist, pred, new_nodes):
+                self.dist[source], self.pred[source] = dist, pred
+        return self
+
+    def _extend(self, dist, pred, new_nodes):
+        """
+        Eklenen düğümlerin mesafelerini (yalnızca eklenenler arasında Dijkstra)
+        yerinde doldurur. Eski bir düğüm kısalıyorsa False.
+        """
+        indptr, indices, weights = self.graph._indptr, self.graph._indices, self.graph._weights
+        new_set = set(new_nodes)
+        heap = []
+        for u in new_nodes:
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if v not in new_set and dist[v] + weights[k] < dist[u]:
+                    dist[u] = dist[v] + weights[k]
+                    pred[u] = v
+            heapq.heappush(heap, (dist[u], u))
+
+        done = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done or d > dist[u]:
+                continue
+            done.add(u)
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                nd = d + weights[k]
+                if nd < dist[v]:
+                    if v not in new_set:
+                        return False
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return True
+
+    def precompute(self, sources=None):
+        if sources is None:
+            sources = self.default_sources()
+        for source in sources:
+            self._row(source)
+        return self
+
+    def _row(self, source):
+        if source not in self.dist:
+            search = self._searches.pop(source, None)
+            if search is None:
+                self.dist[source], self.pred[source] = self._dijkstra(self.index_of[source])
+            else:
+                search.run(self.graph._indptr, self.graph._indices, self.graph._weights)
+                self.dist[source], self.pred[source] = search.dist, search.pred
+        return self.dist[source], self.pred[source]
+
+    def _dijkstra(self, start):
+        return dijkstra_row(self.graph._indptr, self.graph._indices, self.graph._weights, start)
+
+    # ------------------------------------------------------------------ #
+    def cost(self, source, target):
+        """
+        source → target en kısa yol maliyeti; yol yoksa inf. Satır henüz
+        yoksa source'tan arama yalnızca target kesinleşene kadar ilerletilir
+        (sonraki sorgular aynı aramayı sürdürür).
+        """
+        if source not in self.index_of or target not in self.index_of:
+            return float('inf')
+        t = self.index_of[target]
+        if source in self.dist:
+            return float(self.dist[source][t])
+        search = self._searches.get(source)
+        if search is None:
+            search = self._searches[source] = DijkstraSearch(len(self.node_ids), self.index_of[source])
+        search.run(self.graph._indptr, self.graph._indices, self.graph._weights, target=t)
+        if search.finished:
+            self.dist[source], self.pred[source] = search.dist, search.pred
+            del self._searches[source]
+        return float(search.dist[t])
+
+    def path(self, source, target):
+        """Öncüllerden yolu kurar; yol yoksa None."""
+        if self.cost(source, target) == float('inf'):
+            return None
+        _, pred = self._row(source)
+        current = self.index_of[target]
+        goal = self.index_of[source]
+        path = [self.node_ids[current]]
+        while current != goal:
+            current = pred[current]
+            path.append(self.node_ids[current])
+        path.reverse()
+        return path
+
+    def lookup(self, source, target):
+        """a_star_search ile aynı biçimde (path, cost) döner."""
+        path = self.path(source, target)
+        if path is None:
+            return None, float('inf')
+        return path, self.cost(source, target)
+
+    def distance_matrix(self, sources, targets):
+        """(len(sources), len(targets)) mesafe matrisi."""
+        cols = np.array([self.index_of.get(t, -1) for t in targets], dtype=np.int64)
+        matrix = np.full((len(sources), len(targets)), np.inf)
+        valid = cols >= 0
+        for r, source in enumerate(sources):
+            if source in self.index_of:
+                dist, _ = self._row(source)
+                matrix[r, valid] = dist[cols[valid]]
+        return matrix
@@ -1,81 +1,115 @@
 
 # plot_utils.py
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from a_star_solver import a_star_search
-from utils import segment_crosses_polygon
-from matplotlib.animation import FuncAnimation
+# matplotlib yalnızca çizim istendiğinde (plot_routes içinde) yüklenir;
+# rota yardımcıları matplotlib olmadan da kullanılabilir.
+import heapq
+
 import numpy as np
-import time
 
-def plot_routes(drones, deliveries, assignments, nodes_map, nfzs, adj_list, animate=False):
+from nfz_index import NFZIndex
+from graph_utils import points_in_nfzs, row_blockers
+from path_table import ShortestPathTable
+
+LABEL_LIMIT = 200   # bundan fazla dron/teslimatta tek tek etiket yazılmaz
+COLORS = ['red', 'orange', 'purple', 'cyan', 'magenta', 'yellow']
+
+
+def route_paths(assignments, nodes_map, nfzs, adj_list=None, paths=None):
+    """
+    Her atama için koordinat listesi: {delivery_id: [(x, y), ...] veya None}.
+    paths ({delivery_id: düğüm id listesi}) verilirse doğrudan kullanılır;
+    verilmezse yol adj_list üzerindeki en kısa yol tablosundan okunur. Graf
+    yolu olmayan atamalar için NFZ kenarları boyunca yedek arama yapılır.
+    """
+    table = None
+    if paths is None and adj_list is not None:
+        table = ShortestPathTable(adj_list, nodes_map)
+    nfz_index = None
+    edge_points = None
+
+    coords = {}
+    for delivery_id, drone_id in assignments.items():
+        drone_node = f"D{drone_id}_START"
+        delivery_node = str(delivery_id)
+        node_path = paths.get(delivery_id) if paths is not None else (
+            table.path(drone_node, delivery_node) if table is not None else None)
+        if node_path:
+            coords[delivery_id] = [nodes_map[n]['coords'] for n in node_path]
+            continue
+
+        if nfz_index is None:
+            nfz_index = NFZIndex(nfzs)
+            edge_points = extract_nfz_edge_points(nfzs, safety_margin=2)
+        start_pos = nodes_map[drone_node]["coords"]
+        end_pos = nodes_map[delivery_node]["coords"]
+        if not nfz_index.segment_blocked(start_pos, end_pos):
+            coords[delivery_id] = [start_pos, end_pos]
+        else:
+            coords[delivery_id] = find_path_along_nfz_edges(start_pos, end_pos, nfzs, edge_points,
+                                                            nfz_index=nfz_index)
+    return coords
+
+
+def plot_routes(drones, deliveries, assignments, nodes_map, nfzs, adj_list, animate=False, save_path=None,
+                paths=None):
+    """
+    Tüm rotalar tek LineCollection ile çizilir (düz uçuşlar mavi, NFZ
+    dolaşanlar yeşil), animasyon tek scatter sanatçısıyla yapılır.
+    paths: {delivery_id: düğüm id listesi} önceden hesaplanmış yollar (ör.
+    ShortestPathTable.path); verilmezse adj_list'ten okunur.
+    save_path verilirse pencere açılmaz, şekil dosyaya yazılır; animate=True ve
+    .gif uzantısında animasyon Pillow ile kaydedilir.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+    from matplotlib.collections import LineCollection, PatchCollection
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Polygon
+
     fig, ax = plt.subplots(figsize=(10, 10))
 
     # --- NO-FLY ZONES --- 
+    ax.add_collection(PatchCollection([Polygon(nfz.coordinates, closed=True) for nfz in nfzs],
+                                      edgecolor='red', facecolor='salmon', alpha=0.4))
     for nfz in nfzs:
-        polygon = patches.Polygon(nfz.coordinates, closed=True, edgecolor='red', facecolor='salmon', alpha=0.4)
-        ax.add_patch(polygon)
-        centroid = tuple(map(lambda x: sum(x)/len(x), zip(*nfz.coordinates)))
+        centroid = np.mean(nfz.coordinates, axis=0)
         ax.text(*centroid, f"NFZ {nfz.zone_id}", fontsize=8, color='red')
 
-    # --DRONES --
-    for drone in drones:
-        x, y = drone.start_pos
-        ax.plot(x, y, 'bo', markersize=10)
-        ax.text(x+5, y+5, f"D{drone.drone_id}", fontsize=8)
-
-    # --DELIVERIES --
-    for delivery in deliveries:
-        x, y = delivery.location
-        ax.plot(x, y, 'gs', markersize=6)
-        ax.text(x+5, y+5, f"T{delivery.point_id}", fontsize=8)
-
-    # --- GENERATE NFZ EDGE POINTS ---
- 
-    edge_points = extract_nfz_edge_points(nfzs, safety_margin=2)
-    
+    # --DRONES / DELIVERIES --
+    drone_xy = np.array([d.start_pos for d in drones], dtype=float).reshape(-1, 2)
+    delivery_xy = np.array([dp.location for dp in deliveries], dtype=float).reshape(-1, 2)
+    ax.scatter(drone_xy[:, 0], drone_xy[:, 1], c='blue', s=60, zorder=3)
+    ax.scatter(delivery_xy[:, 0], delivery_xy[:, 1], c='green', marker='s', s=20, zorder=3)
+    if len(drones) <= LABEL_LIMIT:
+        for drone, (x, y) in zip(drones, drone_xy):
+            ax.text(x + 5, y + 5, f"D{drone.drone_id}", fontsize=8)
+    if len(deliveries) <= LABEL_LIMIT:
+        for delivery, (x, y) in zip(deliveries, delivery_xy):
+            ax.text(x + 5, y + 5, f"T{delivery.point_id}", fontsize=8)
+
+    # --- ROUTES ---
+    coords = route_paths(assignments, nodes_map, nfzs, adj_list, paths)
     valid_paths = []
     drone_ids = []
-    
+    direct, detour, waypoints = [], [], []
     for delivery_id, drone_id in assignments.items():
-        drone_node = f"D{drone_id}_START"
-        delivery_node = str(delivery_id)
-        
-        # Get start and end positions
-        start_pos = nodes_map[drone_node]["coords"]
-        end_pos = nodes_map[delivery_node]["coords"]
-        
-        # Check if direct path crosses any NFZ
-        direct_path_safe = True
-        for nfz in nfzs:
-            if segment_crosses_polygon((start_pos, end_pos), nfz.coordinates):
-                direct_path_safe = False
-                break
-                
-        if direct_path_safe:
-            # Direct path doesn't cross any NFZ, use it
-            path = [start_pos, end_pos]
-            xs, ys = zip(*path)
-            ax.plot(xs, ys, linestyle='--', linewidth=1.5, alpha=0.8, color='blue')
-            valid_paths.append(path)
-            drone_ids.append(drone_id)
+        path = coords[delivery_id]
+        if not path:
+            print(f"⚠️  Dron {drone_id} → Teslimat {delivery_id} için geçerli bir rota bulunamadı!")
+            continue
+        if len(path) == 2:
+            direct.append(path)
         else:
-            # Need to find path that navigates along NFZ edges
-            path = find_path_along_nfz_edges(start_pos, end_pos, nfzs, edge_points)
-            
-            if path:
-                xs, ys = zip(*path)
-                ax.plot(xs, ys, linestyle='--', linewidth=1.5, alpha=0.8, color='green')
-                
-                # Plot waypoints used in the path
-                for i in range(1, len(path)-1):
-                    wp = path[i]
-                    ax.plot(wp[0], wp[1], 'go', markersize=4)
-                    
-                valid_paths.append(path)
-                drone_ids.append(drone_id)
-            else:
-                print(f"⚠️  Dron {drone_id} → Teslimat {delivery_id} için geçerli bir rota bulunamadı!")
+            detour.append(path)
+            waypoints.extend(path[1:-1])
+        valid_paths.append(path)
+        drone_ids.append(drone_id)
+
+    ax.add_collection(LineCollection(direct, colors='blue', linestyles='--', linewidths=1.5, alpha=0.8))
+    ax.add_collection(LineCollection(detour, colors='green', linestyles='--', linewidths=1.5, alpha=0.8))
+    if waypoints:
+        wp = np.array(waypoints, dtype=float)
+        ax.scatter(wp[:, 0], wp[:, 1], c='green', s=16)
 
     ax.set_title("Drone Teslimat Rotaları")
     ax.set_xlim(0, 1000)
@@ -88,70 +122,52 @@ def plot_routes(drones, deliveries, assignments, nodes_map, nfzs, adj_list, anim
     if animate and valid_paths:
         print("🎬 Animasyon başlatılıyor...")
 
-        
-        grouped_paths = []
-        grouped_drone_ids = []
-
-        
-        unique_drones = list(dict.fromkeys(drone_ids))
-
-        for d in unique_drones:
-            # Bu drone’ya ait tüm index’leri bul
-            indices = [i for i, dd in enumerate(drone_ids) if dd == d]
-            combined = []
-            for idx in indices:
-                path = valid_paths[idx]
-                # Eğer combined doluysa ve son nokta yeni path’ın ilk noktasına eşitse, tekrar ekleme
-                if combined and combined[-1] == path[0]:
-                    combined.extend(path[1:])
-                else:
-                    combined.extend(path)
-            grouped_paths.append(combined)
-            grouped_drone_ids.append(d)
-
-        # “Gruplanmış” haliyle devam edelim:
-        valid_paths = grouped_paths
-        drone_ids   = grouped_drone_ids
-        
-
-        # Her drone için bir nokta (dot) oluşturalım
-        dots = []
-        colors = ['red', 'orange', 'purple', 'cyan', 'magenta', 'yellow']
-        for i, drone_id in enumerate(drone_ids):
-            color_idx = i % len(colors)
-            dot, = ax.plot([], [], 'o', markersize=8, color=colors[color_idx], label=f'Drone {drone_id}')
-            dots.append(dot)
-
-        # Legend’da her drone bir kez görünsün:
-        ax.legend(loc='upper left')
+        # Dron başına yolları uç uca ekle (ortak uç noktası tekrar edilmez)
+        combined = {}
+        for drone_id, path in zip(drone_ids, valid_paths):
+            route = combined.setdefault(drone_id, [])
+            route.extend(path[1:] if route and route[-1] == path[0] else path)
 
-        def init():
-            for dot in dots:
-                dot.set_data([], [])
-            return dots
+        # (kare, dron, 2) konum dizisi; kısa rotalar son noktada bekler
+        routes = list(combined.values())
+        max_frames = max(len(route) for route in routes)
+        frames = np.empty((max_frames, len(routes), 2))
+        for i, route in enumerate(routes):
+            route = np.asarray(route, dtype=float)
+            frames[:len(route), i] = route
+            frames[len(route):, i] = route[-1]
 
-        # Artık valid_paths her biri “birleşik yol” içeren listeler
-        max_frames = max(len(path) for path in valid_paths)
+        colors = [COLORS[i % len(COLORS)] for i in range(len(routes))]
+        dots = ax.scatter(frames[0, :, 0], frames[0, :, 1], s=64, c=colors, zorder=4)
+        if len(routes) <= LABEL_LIMIT:
+            ax.legend(handles=[Line2D([], [], marker='o', linestyle='', color=color, label=f'Drone {drone_id}')
+                               for drone_id, color in zip(combined, colors)], loc='upper left')
 
         def update(frame):
-            for i, (path, dot) in enumerate(zip(valid_paths, dots)):
-                if frame < len(path):
-                    x, y = path[frame]
-                else:
-                    x, y = path[-1]
-                dot.set_data([x], [y])
-            return dots
+            dots.set_offsets(frames[frame])
+            return (dots,)
 
         ani = FuncAnimation(
             fig,
             update,
             frames=max_frames,
-            init_func=init,
             blit=True,
             interval=500,
             repeat=False
         )
-        plt.show()
+        if save_path and save_path.endswith(".gif"):
+            ani.save(save_path, writer="pillow", fps=2)
+            plt.close(fig)
+            return
+    _show_or_save(fig, save_path)
+
+
+def _show_or_save(fig, save_path):
+    import matplotlib.pyplot as plt
+
+    if save_path:
+        fig.savefig(save_path, dpi=120)
+        plt.close(fig)
     else:
         plt.show()
 
@@ -236,82 +252,62 @@ def segment_dist(p1, p2):
     """Calculate the Euclidean distance between two points"""
     return np.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)
 
-def find_path_along_nfz_edges(start, end, nfzs, edge_points, max_nodes=15):
+def find_path_along_nfz_edges(start, end, nfzs, edge_points, max_nodes=15, nfz_index=None):
+    """
+    NFZ kenar noktaları üzerinden start → end A* araması (yığın tabanlı).
+    Bir noktanın görünürlüğü yalnızca o nokta genişletildiğinde, tüm
+    noktalara karşı tek vektörel testle hesaplanır; tam bağlantı grafı
+    önceden kurulmaz. max_nodes: yoldaki en fazla nokta sayısı.
+    """
+    if nfz_index is None:
+        nfz_index = NFZIndex(nfzs)
+
     # Include start and end in potential path nodes
-    all_points = [start] + edge_points + [end]
-    
-    # Create a graph of valid connections
-    connections = {}
-    for i, p1 in enumerate(all_points):
-        connections[i] = []
-        
-        # Try to connect directly to end point to optimize
-        if i != len(all_points) - 1:  # Not the end point itself
-            # Check if can connect directly to end
-            end_point = all_points[-1]
-            if not any(segment_crosses_polygon((p1, end_point), nfz.coordinates) for nfz in nfzs):
-                dist = segment_dist(p1, end_point)
-                connections[i].append((len(all_points) - 1, dist))
-        
-        # Connect to other points if not crossing NFZs
-        for j, p2 in enumerate(all_points):
-            if i != j and j != len(all_points) - 1:  # Skip self and end (handled above)
-                # Only connect if the segment doesn't cross any NFZ
-                if not any(segment_crosses_polygon((p1, p2), nfz.coordinates) for nfz in nfzs):
-                    dist = segment_dist(p1, p2)
-                    connections[i].append((j, dist))
-    
-    open_set = {0}  
-    closed_set = set()
-    
-    g_score = {i: float('inf') for i in range(len(all_points))}
-    g_score[0] = 0
-    
-    f_score = {i: float('inf') for i in range(len(all_points))}
-    f_score[0] = segment_dist(start, end)  
-    
+    all_points = [start] + list(edge_points) + [end]
+    points = np.array(all_points, dtype=float)
+    inside = points_in_nfzs(points, nfz_index)
+    goal = len(all_points) - 1
+    h = np.sqrt(((points - points[goal]) ** 2).sum(axis=1)).tolist()
+
+    g_score = {0: 0.0}
     came_from = {}
-    
     path_length = {0: 1}
-    
+    closed_set = set()
+    open_set = [(h[0], 0)]
+
     while open_set:
-        # Find node with lowest f_score
-        current = min(open_set, key=lambda x: f_score[x])
-        
+        _, current = heapq.heappop(open_set)
+        if current in closed_set:
+            continue
+
         # If we reached the end, reconstruct and return the path
-        if current == len(all_points) - 1:
+        if current == goal:
             path = []
             while current in came_from:
                 path.append(all_points[current])
                 current = came_from[current]
             path.append(start)  # Add the start point
             return path[::-1]  # Reverse to get start to end
-        
-        open_set.remove(current)
         closed_set.add(current)
-        
-        for neighbor, dist in connections[current]:
+
+        # Skip if this would make the path too long
+        if path_length[current] + 1 > max_nodes:
+            continue
+
+        blocked = row_blockers(points[current], inside[current], points, inside, nfz_index).any(axis=1)
+        blocked[current] = True
+        visible = np.flatnonzero(~blocked)
+        dists = np.sqrt(((points[visible] - points[current]) ** 2).sum(axis=1))
+
+        g_current = g_score[current]
+        for neighbor, dist in zip(visible.tolist(), dists.tolist()):
             if neighbor in closed_set:
                 continue
-                
-            # Skip if this would make the path too long
-            if path_length.get(current, 0) + 1 > max_nodes:
-                continue
-                
-            # Calculate tentative g_score
-            tentative_g = g_score[current] + dist
-            
-            if neighbor not in open_set:
-                open_set.add(neighbor)
-            elif tentative_g >= g_score[neighbor]:
-                continue
-                
-            # This path is better, record it
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_g
-            path_length[neighbor] = path_length.get(current, 0) + 1
-            f_score[neighbor] = g_score[neighbor] + segment_dist(all_points[neighbor], end)
-    
-    
-    return None
+            tentative_g = g_current + dist
+            if tentative_g < g_score.get(neighbor, float('inf')):
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                path_length[neighbor] = path_length[current] + 1
+                heapq.heappush(open_set, (tentative_g + h[neighbor], neighbor))
 
+    return None
@@ -0,0 +1,199 @@
+# route_optimizer.py
+
+import numpy as np
+
+from path_table import ShortestPathTable
+
+
+class RouteOptimizer:
+    """
+    Çok duraklı rota motoru. Her dronun atanmış teslimatlarını D{id}_START'tan
+    başlayan tek bir rota olarak ele alır ve ziyaret sırasını 2-opt ve Or-opt
+    hamleleriyle iyileştirir. Mesafeler dron başına bir kez ShortestPathTable
+    üzerinden (duraklar × duraklar) matrisine alınır; hamleler bu matris
+    üzerinde O(1) fark hesabıyla değerlendirilir.
+
+    Kısıtlar CSPSolver ile aynı modeldedir: dron her teslimatın ağırlığını
+    taşıyabilmeli (max_weight >= weight) ve rota boyunca bacak başına
+    mesafe*0.5*(1 + ağırlık/max_weight*0.5) pil kullanımı toplamı bataryayı
+    (varsayılan olarak tam şarj, battery_capacity) aşmamalıdır.
+    """
+
+    def __init__(self, drones, deliveries, adj_list=None, nodes_map=None, path_table=None,
+                 return_home=False, max_passes=50):
+        self.drones = drones
+        self.deliveries = deliveries
+        self.path_table = path_table or ShortestPathTable(adj_list, nodes_map)
+        self.return_home = return_home   # True ise rota başlangıç düğümüne döner
+        self.max_passes = max_passes
+
+        self.drone_by_id = {d.drone_id: d for d in drones}
+        self.delivery_by_id = {dp.point_id: dp for dp in deliveries}
+        self.routes = {}     # drone_id -> {'stops', 'distance', 'battery'}
+        self.unrouted = []   # kapasite, yol veya pil nedeniyle rotaya giremeyen teslimatlar
+
+    # ------------------------------------------------------------------ #
+    # Model
+    # ------------------------------------------------------------------ #
+    def _route_problem(self, drone, stops):
+        """
+        Durak listesi için mesafe matrisi ve pil katsayıları. İndeks 0 dronun
+        başlangıç düğümü, i >= 1 stops[i-1]'dir.
+        """
+        nodes = [f"D{drone.drone_id}_START"] + [str(point_id) for point_id in stops]
+        dist = self.path_table.distance_matrix(nodes, nodes)
+        weights = np.array([0.0] + [self.delivery_by_id[p].weight for p in stops])
+        # Bacak maliyeti = mesafe * factor[hedef]; eve dönüş bacağı boş uçar
+        factor = 0.5 * (1.0 + weights / drone.max_weight * 0.5)
+        factor[0] = 0.5
+        return dist, factor
+
+    def _distance(self, dist, route):
+        total = dist[route[:-1], route[1:]].sum()
+        if self.return_home and len(route) > 1:
+            total += dist[route[-1], 0]
+        return float(total)
+
+    def _battery(self, dist, factor, route):
+        total = (dist[route[:-1], route[1:]] * factor[route[1:]]).sum()
+        if self.return_home and len(route) > 1:
+            total += dist[route[-1], 0] * factor[0]
+        return float(total)
+
+    # ------------------------------------------------------------------ #
+    # Yerel arama
+    # ------------------------------------------------------------------ #
+    def _two_opt(self, dist, factor, route, budget):
+        """
+        route[i..j] ters çevirme. Graf yönsüz olduğundan iç kenarların toplamı
+        değişmez; yalnızca iki uç kenarı karşılaştırılır. Pil ağırlığa bağlı
+        olduğu için iyileştiren hamlede bütçe ayrıca kontrol edilir.
+        """
+        n = len(route)
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                a, b, c = route[i - 1], route[i], route[j]
+                delta = dist[a, c] - dist[a, b]
+                if j + 1 < n:
+                    d = route[j + 1]
+                    delta += dist[b, d] - dist[c, d]
+                elif self.return_home:
+                    delta += dist[b, 0] - dist[c, 0]
+                if delta < -1e-9:
+                    candidate = np.concatenate([route[:i], route[i:j + 1][::-1], route[j + 1:]])
+                    if self._battery(dist, factor, candidate) <= budget:
+                        route = candidate
+                        improved = True
+        return route, improved
+
+    def _or_opt(self, dist, factor, route, budget, max_segment=3):
+        """1..max_segment uzunluğundaki ardışık durakları rotada başka bir yere taşır."""
+        n = len(route)
+        improved = False
+        for length in range(1, max_segment + 1):
+            i = 1
+            while i + length <= n:
+                segment = route[i:i + length]
+                rest = np.concatenate([route[:i], route[i + length:]])
+                prev, first, last = route[i - 1], segment[0], segment[-1]
+                nxt = route[i + length] if i + length < n else (0 if self.return_home else None)
+
+                removed = dist[prev, first] + (dist[last, nxt] if nxt is not None else 0.0)
+                gain = removed - (dist[prev, nxt] if nxt is not None else 0.0)
+
+                best_delta, best_pos = -1e-9, None
+                for p in range(len(rest)):
+                    if p == i - 1:
+                        continue
+                    a = rest[p]
+                    b = rest[p + 1] if p + 1 < len(rest) else (0 if self.return_home else None)
+                    added = dist[a, first] + (dist[last, b] - dist[a, b] if b is not None else 0.0)
+                    delta = added - gain
+                    if delta < best_delta:
+                        candidate = np.concatenate([rest[:p + 1], segment, rest[p + 1:]])
+                        if self._battery(dist, factor, candidate) <= budget:
+                            best_delta, best_pos = delta, p
+                if best_pos is not None:
+                    route = np.concatenate([rest[:best_pos + 1], segment, rest[best_pos + 1:]])
+                    improved = True
+                i += 1
+        return route, improved
+
+    def _repair(self, dist, factor, route, budget):
+        """Bütçe aşılıyorsa en çok pil kazandıran durağı çıkarır; çıkarılanları döner."""
+        dropped = []
+        while len(route) > 1 and self._battery(dist, factor, route) > budget:
+            options = [np.delete(route, k) for k in range(1, len(route))]
+            usages = [self._battery(dist, factor, option) for option in options]
+            k = int(np.argmin(usages))
+            dropped.append(int(route[k + 1]))
+            route = options[k]
+        return route, dropped
+
+    def improve(self, drone, stops, budget=None):
+        """
+        Tek dronun durak sırasını iyileştirir.
+        Dönüş: (sıralı duraklar, mesafe, pil kullanımı, rotaya girmeyenler).
+        """
+        if budget is None:
+            budget = drone.battery_capacity
+
+        dropped = [p for p in stops if self.delivery_by_id[p].weight > drone.max_weight]
+        stops = [p for p in stops if p not in dropped]
+
+        dist, factor = self._route_problem(drone, stops)
+        reachable = np.isfinite(dist[0])
+        dropped += [p for k, p in enumerate(stops, start=1) if not reachable[k]]
+        route = np.array([0] + [k for k in range(1, len(stops) + 1) if reachable[k]], dtype=np.int64)
+
+        route, over_budget = self._repair(dist, factor, route, budget)
+        dropped += [stops[k - 1] for k in over_budget]
+
+        for _ in range(self.max_passes):
+            route, moved_2opt = self._two_opt(dist, factor, route, budget)
+            route, moved_or = self._or_opt(dist, factor, route, budget)
+            if not (moved_2opt or moved_or):
+                break
+
+        ordered = [stops[k - 1] for k in route[1:].tolist()]
+        return ordered, self._distance(dist, route), self._battery(dist, factor, route), dropped
+
+    # ------------------------------------------------------------------ #
+    def optimize(self, assignments, order=None):
+        """
+        assignments: {delivery_id: drone_id} (CSP veya GA çıktısı).
+        order: başlangıç ziyaret sırası için teslimat id'leri listesi (ör.
+        CSPSolver.legs sırası); verilmezse assignments sırası kullanılır.
+        Dönüş: {drone_id: {'stops': [...], 'distance': float, 'battery': float}}
+        """
+        per_drone = {d.drone_id: [] for d in self.drones}
+        for delivery_id in (order if order is not None else assignments):
+            per_drone[assignments[delivery_id]].append(delivery_id)
+
+        self.routes = {}
+        self.unrouted = []
+        for drone_id, stops in per_drone.items():
+            if not stops:
+                continue
+            ordered, distance, battery, dropped = self.improve(self.drone_by_id[drone_id], stops)
+            self.routes[drone_id] = {'stops': ordered, 'distance': distance, 'battery': battery}
+            self.unrouted.extend(dropped)
+        return self.routes
+
+    def route_distance(self, drone_id, stops):
+        """Verilen sırayla uçulan toplam mesafe (karşılaştırma için)."""
+        drone = self.drone_by_id[drone_id]
+        dist, _ = self._route_problem(drone, stops)
+        return self._distance(dist, np.arange(len(stops) + 1))
+
+    def full_path(self, drone_id):
+        """Rotanın graf düğümleri üzerinden tam yolu (plot_routes vb. için)."""
+        stops = self.routes[drone_id]['stops']
+        nodes = [f"D{drone_id}_START"] + [str(p) for p in stops]
+        if self.return_home:
+            nodes.append(nodes[0])
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            path.extend(self.path_table.path(a, b)[1:])
+        return path
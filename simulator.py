@@ -0,0 +1,543 @@
+# simulator.py
+"""
+Ayrık olaylı filo simülatörü. Simülasyon saati gün içi saniyedir; olaylar
+(zaman, sıra, tür, veri) dörtlüleri olarak tek bir yığında tutulur:
+
+    takeoff           dron sıradaki teslimata kalkar (politika seçer)
+    arrival           dron teslimat noktasına veya eve varır
+    battery_critical  dron eve döner (kritikse Drone.return_home üzerinden) ve şarj olur
+    nfz_toggle        dinamik yasak bölge açılır / kapanır
+
+Dronlar bacak başına hesaplanan en kısa güvenli yolda Drone.speed ile uçar;
+teslimat zaman pencereleri (erken varışta kalkış geciktirilir) ve NFZ
+aktiflik saatleri dikkate alınır. Pil modeli CSPSolver ile aynıdır.
+
+Graf teslimat düğümlerini içermez: yalnızca dron başlangıçları ve NFZ
+köşe/ara noktaları (FlightGraph, time_aware) tutulur; bir bacak, iki ucu
+grafa tek başına eklenmiş gibi A* ile bulunacak yolla aynıdır. Bu düğümler arasındaki en kısa
+yollar her aktif bölge kümesi için bir kez (Floyd–Warshall) hesaplanır; bir
+bacak, uç noktaların görünür düğümleri üzerinden matris taramasıyla bulunur.
+Böylece on binlerce teslimatlı bir gün saniyeler içinde simüle edilir.
+
+    python simulator.py --drones 20 --deliveries 10000 --seed 42
+"""
+
+import argparse
+import contextlib
+import functools
+import heapq
+import io
+import itertools
+import sys
+import time
+from collections import Counter, OrderedDict, deque
+
+import numpy as np
+
+import metrics
+from fleet import DeliveryTable, columns_of
+from a_star_solver import csr_graph_for, home_tree_for, path_to_root, precompute_home_trees
+from graph_utils import FlightGraph, points_in_nfzs, row_blockers
+from utils import time_to_minutes
+
+TAKEOFF = "takeoff"
+ARRIVAL = "arrival"
+BATTERY_CRITICAL = "battery_critical"
+NFZ_TOGGLE = "nfz_toggle"
+
+
+@functools.lru_cache(maxsize=None)
+def to_seconds(value):
+    """'HH:MM' / dakika değerini gün içi saniyeye çevirir."""
+    minutes = time_to_minutes(value)
+    return None if minutes is None else minutes * 60.0
+
+
+def format_clock(seconds):
+    minutes = int(seconds // 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def battery_usage(distance, drone, weight):
+    """CSPSolver.estimate_battery_usage ile aynı model."""
+    return distance * 0.5 * (1.0 + (weight / drone.max_weight) * 0.5)
+
+
+# ---------------------------------------------------------------------- #
+# Dağıtım politikaları: policy(sim, drone, now) -> DeliveryPoint veya None
+# ---------------------------------------------------------------------- #
+class RoutePolicy:
+    """
+    Sabit plan: {drone_id: [delivery_id, ...]} veya RouteOptimizer.routes
+    ({drone_id: {'stops': [...], ...}}). Her dron kendi listesini sırayla uçar.
+    """
+
+    def __init__(self, routes, deliveries):
+        by_id = {dp.point_id: dp for dp in deliveries}
+        self.queues = {
+            drone_id: deque(by_id[p] for p in (route['stops'] if isinstance(route, dict) else route))
+            for drone_id, route in routes.items()
+        }
+
+    def __call__(self, sim, drone, now):
+        queue = self.queues.get(drone.drone_id)
+        return queue.popleft() if queue else None
+
+
+class NearestPolicy:
+    """
+    Çevrimiçi açgözlü politika: boşa çıkan dron, taşıyabildiği ve penceresi
+    kapanmamış bekleyen teslimatlardan en yakınını alır. Penceresi `horizon`
+    saniyeden daha geç açılanlar yalnızca başka aday yoksa seçilir.
+    """
+
+    def __init__(self, deliveries, horizon=1800):
+        self.horizon = horizon
+        # DeliveryTable verildiyse diziler doğrudan sütunlardan okunur
+        self.xy = columns_of(deliveries, 'location')
+        self.weights = columns_of(deliveries, 'weight')
+        if isinstance(deliveries, DeliveryTable):
+            tw_start, tw_end = deliveries.columns['tw_start'], deliveries.columns['tw_end']
+            self.opens = np.where(tw_start == DeliveryTable.NO_TIME, -np.inf, tw_start * 60.0)
+            self.closes = np.where(tw_end == DeliveryTable.NO_TIME, np.inf, tw_end * 60.0)
+        else:
+            windows = [dp.time_window or (None, None) for dp in deliveries]
+            self.opens = np.array([to_seconds(w[0]) if w[0] else -np.inf for w in windows])
+            self.closes = np.array([to_seconds(w[1]) if w[1] else np.inf for w in windows])
+        self.deliveries = list(deliveries)
+        self.order = np.arange(len(self.deliveries))   # dizilerin satırı -> teslimat sırası
+        self.pending = np.ones(len(self.deliveries), dtype=bool)
+
+    def _compact(self):
+        """Seçilmiş teslimatları dizilerden atar (her çağrıda tam tarama olmasın diye)."""
+        keep = self.pending
+        self.order, self.xy, self.weights = self.order[keep], self.xy[keep], self.weights[keep]
+        self.opens, self.closes, self.pending = self.opens[keep], self.closes[keep], self.pending[keep]
+
+    def __call__(self, sim, drone, now):
+        ok = self.pending & (self.weights <= drone.max_weight) & (self.closes >= now)
+        soon = ok & (self.opens <= now + self.horizon)
+        candidates = soon if soon.any() else ok
+        if not candidates.any():
+            return None
+        x, y = sim.position(drone.drone_id)
+        d2 = (self.xy[:, 0] - x) ** 2 + (self.xy[:, 1] - y) ** 2
+        row = int(np.argmin(np.where(candidates, d2, np.inf)))
+        self.pending[row] = False
+        k = int(self.order[row])
+        if len(self.pending) > 64 and 2 * np.count_nonzero(self.pending) < len(self.pending):
+            self._compact()
+        return self.deliveries[k]
+
+
+# ---------------------------------------------------------------------- #
+class FleetSimulator:
+    """
+    drones, deliveries, nfzs: varlık listeleri (deliveries bir DeliveryTable
+    da olabilir; varsayılan politika sütunlarını okur). policy: RoutePolicy,
+    NearestPolicy veya aynı imzalı bir çağrılabilir (varsayılan NearestPolicy).
+    recharge_minutes: evde tam şarj süresi. Bir teslimat bacağına ancak dron
+    teslimattan sonra eve boş dönebilecek pil varsa kalkılır.
+    """
+
+    def __init__(self, drones, deliveries, nfzs, policy=None, start_time="08:00",
+                 recharge_minutes=30, verbose=False, vis_cache_size=4096):
+        self.drones = list(drones)
+        self.deliveries = list(deliveries)
+        self.policy = policy or NearestPolicy(deliveries)
+        self.start = to_seconds(start_time)
+        self.recharge = recharge_minutes * 60.0
+        self.verbose = verbose
+
+        self.graph = FlightGraph([], self.drones, nfzs, time_aware=True,
+                                 current_time=self.start / 60.0)
+        self.index = self.graph.index
+        nfzs = self.graph.nfzs
+        dynamic = self.graph._dynamic
+        self._zone_open = np.array([to_seconds(z.start_time) if d else -np.inf for z, d in zip(nfzs, dynamic)])
+        self._zone_close = np.array([to_seconds(z.end_time) if d else np.inf for z, d in zip(nfzs, dynamic)])
+        self._dynamic = dynamic
+        self._active = ~dynamic | np.array([z.zone_id in self.graph.active_zones for z in nfzs], dtype=bool)
+
+        # Temel düğümler: dron başlangıçları, NFZ köşeleri ve ara noktalar.
+        # Köşeler yalnızca kendi bölgeleri kapalıyken kullanılabilir.
+        self._node_ids, self._coords, self._inside = self.graph._node_arrays()
+        self._euclid = np.hypot(*(self._coords[:, None, :] - self._coords[None, :, :]).transpose(2, 0, 1))
+        # Eve dönüş ağaçları baştan kurulur; NFZ değişiminden sonra ilk kritik dönüşte yenilenir
+        precompute_home_trees(self.graph.adj_list, self.graph.nodes_map,
+                              [f"D{d.drone_id}_START" for d in self.drones])
+        self._base_cache = {}   # aktif küme -> (dist, next)
+        # (x, y, aktif küme) -> (inside, mesafe); LRU, en çok vis_cache_size kayıt
+        self._vis_cache = OrderedDict()
+        self.vis_cache_size = vis_cache_size
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._index = {d.drone_id: i for i, d in enumerate(self.drones)}
+        self._position = [np.asarray(d.start_pos, dtype=float) for d in self.drones]
+        self._pending = [None] * len(self.drones)   # seçilmiş, henüz uçulmamış teslimat
+        self._held = [False] * len(self.drones)     # zaman penceresi için kalkış ertelendi mi
+        self._finished = [False] * len(self.drones)
+        self._flights = {}                          # idx -> (kalkış, hız, yol, kümülatif mesafe)
+        self._waiting = set()                       # NFZ değişimini bekleyen dronlar
+        self._toggle_times = []
+
+        self.now = self.start
+        self.completed = {}     # delivery_id -> teslim saniyesi
+        self.late = set()
+        self.failed = {}        # delivery_id -> neden
+        self.distance = 0.0
+        self.event_counts = Counter()
+        self.failsafe_returns = 0
+        self.recharges = 0
+
+        for k, nfz in enumerate(nfzs):
+            if not dynamic[k]:
+                continue
+            for at, active in ((self._zone_open[k], True), (self._zone_close[k], False)):
+                if at > self.start:
+                    self._push(at, NFZ_TOGGLE, (k, active))
+                    self._toggle_times.append(at)
+        for idx, drone in enumerate(self.drones):
+            drone.current_pos = drone.start_pos
+            drone.last_node_id = f"D{drone.drone_id}_START"
+            self._push(self.start, TAKEOFF, idx)
+
+    # ------------------------------------------------------------------ #
+    # Yol hesabı
+    # ------------------------------------------------------------------ #
+    def _base_paths(self, active):
+        """Temel düğümler arası tüm çiftler en kısa yol (dist, next) matrisleri."""
+        key = active.tobytes()
+        cached = self._base_cache.get(key)
+        if cached is not None:
+            return cached
+        n = len(self._coords)
+        # Engelleyen bölgeler satır satır hesaplanır; (n, n, Z) tensör tutulmaz
+        blocked = np.zeros((n, n), dtype=bool)
+        for i in range(n):
+            blockers = row_blockers(self._coords[i], self._inside[i], self._coords, self._inside, self.index)
+            blocked[i] = (blockers & active).any(axis=1)
+        dist = np.where(blocked, np.inf, self._euclid)
+        np.fill_diagonal(dist, 0.0)
+        nxt = np.tile(np.arange(n), (n, 1))
+        for k in range(n):
+            via = dist[:, k, None] + dist[None, k, :]
+            better = via < dist
+            dist = np.where(better, via, dist)
+            nxt = np.where(better, nxt[:, k, None], nxt)
+        self._base_cache[key] = (dist, nxt)
+        return dist, nxt
+
+    def _visibility(self, point, active):
+        key = (point[0], point[1], active.tobytes())
+        cached = self._vis_cache.get(key)
+        if cached is not None:
+            self._vis_cache.move_to_end(key)
+            return cached
+        inside = points_in_nfzs(point[None, :], self.index)[0]
+        blockers = row_blockers(point, inside, self._coords, self._inside, self.index)
+        visible = ~(blockers & active).any(axis=1)
+        reach = np.where(visible, np.hypot(*(self._coords - point).T), np.inf)
+        cached = self._vis_cache[key] = (inside, reach)
+        if len(self._vis_cache) > self.vis_cache_size:
+            self._vis_cache.popitem(last=False)
+        return cached
+
+    def route(self, a, b, active=None):
+        """
+        a'dan b'ye aktif bölgelerden kaçınan en kısa yol: (mesafe, [koordinatlar])
+        veya yol yoksa None.
+        """
+        active = self._active if active is None else active
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        in_a, reach_a = self._visibility(a, active)
+        in_b, reach_b = self._visibility(b, active)
+        if (in_a & active).any() or (in_b & active).any():
+            return None
+        direct = row_blockers(a, in_a, b[None, :], in_b[None, :], self.index)[0]
+        if not (direct & active).any():
+            return float(np.hypot(*(b - a))), [a, b]
+
+        dist, nxt = self._base_paths(active)
+        total = reach_a[:, None] + dist + reach_b[None, :]
+        if not len(total) or not np.isfinite(total).any():
+            return None
+        u, v = np.unravel_index(int(np.argmin(total)), total.shape)
+        distance = float(total[u, v])
+        path = [a, self._coords[u]]
+        while u != v:
+            u = nxt[u, v]
+            path.append(self._coords[u])
+        path.append(b)
+        return distance, path
+
+    def _plan_leg(self, a, b, depart, speed):
+        """
+        Uçuş süresince açılacak bölgeler de dikkate alınarak bacak planı:
+        (mesafe, yol, varış). Uçuş sırasında kapanan bölgeler yok sayılır.
+        """
+        active = self._active
+        while True:
+            leg = self.route(a, b, active)
+            if leg is None:
+                return None
+            distance, path = leg
+            arrive = depart + distance / speed
+            # Gece yarısını aşan pencerede (kapanış < açılış) kapanış ertesi gündür
+            opening = (self._dynamic & ~active & (self._zone_open > depart) & (self._zone_open <= arrive)
+                       & ((self._zone_close > depart) | (self._zone_close < self._zone_open)))
+            if not opening.any():
+                return distance, path, arrive
+            active = active | opening
+
+    def position(self, drone_id, t=None):
+        """Dronun t anındaki konumu; uçuştaysa yol boyunca doğrusal ilerletilir."""
+        idx = self._index[drone_id]
+        flight = self._flights.get(idx)
+        if flight is None:
+            return tuple(self._position[idx].tolist())
+        depart, speed, path, cumulative = flight
+        travelled = ((self.now if t is None else t) - depart) * speed
+        xs, ys = np.array(path).T
+        return float(np.interp(travelled, cumulative, xs)), float(np.interp(travelled, cumulative, ys))
+
+    # ------------------------------------------------------------------ #
+    # Olay döngüsü
+    # ------------------------------------------------------------------ #
+    def _push(self, at, kind, payload):
+        heapq.heappush(self._heap, (at, next(self._seq), kind, payload))
+
+    def run(self, until=None):
+        """Olay yığını boşalana (veya until saatine) kadar simüle eder; özet döner."""
+        until = to_seconds(until) if until is not None else None
+        handlers = {TAKEOFF: self._takeoff, ARRIVAL: self._arrival,
+                    BATTERY_CRITICAL: self._battery_critical, NFZ_TOGGLE: self._nfz_toggle}
+        with metrics.stage("simulate"):
+            while self._heap:
+                if until is not None and self._heap[0][0] > until:
+                    break
+                at, _, kind, payload = heapq.heappop(self._heap)
+                self.now = at
+                self.event_counts[kind] += 1
+                handlers[kind](at, payload)
+        return self.summary()
+
+    def _fly(self, idx, now, path, distance, arrive, delivery):
+        cumulative = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(np.array(path), axis=0).T))])
+        self._flights[idx] = (now, self.drones[idx].speed, path, cumulative)
+        self.drones[idx].is_busy = True
+        self.distance += distance
+        self._push(arrive, ARRIVAL, (idx, delivery))
+
+    def _at_home(self, idx):
+        return np.allclose(self._position[idx], self.drones[idx].home_pos)
+
+    def _fail(self, idx, now, delivery, reason):
+        self.failed[delivery.point_id] = reason
+        self._pending[idx] = None
+        self._held[idx] = False
+        self._push(now, TAKEOFF, idx)
+
+    def _takeoff(self, now, idx):
+        drone = self.drones[idx]
+        delivery = self._pending[idx]
+        if delivery is None:
+            delivery = self.policy(self, drone, now)
+            if delivery is None:
+                self._finished[idx] = True
+                if not self._at_home(idx):
+                    self._push(now, BATTERY_CRITICAL, idx)
+                return
+            self._pending[idx] = delivery
+        if delivery.weight > drone.max_weight:
+            return self._fail(idx, now, delivery, "kapasite")
+
+        target = np.asarray(delivery.location, dtype=float)
+        leg = self._plan_leg(self._position[idx], target, now, drone.speed)
+        home = leg and self._plan_leg(target, drone.home_pos, leg[2], drone.speed)
+        if not leg or not home:
+            if any(at > now for at in self._toggle_times):
+                self._waiting.add(idx)   # bölge değişince tekrar denenir
+                return
+            return self._fail(idx, now, delivery, "yol yok")
+
+        distance, path, arrive = leg
+        usage = battery_usage(distance, drone, delivery.weight)
+        if usage + home[0] * 0.5 > drone.current_battery:
+            if self._at_home(idx) and drone.current_battery >= drone.battery_capacity:
+                return self._fail(idx, now, delivery, "pil")
+            self._push(now, BATTERY_CRITICAL, idx)   # önce eve dönüp şarj ol
+            return
+
+        if delivery.time_window and not self._held[idx]:
+            opens = to_seconds(delivery.time_window[0])
+            if arrive < opens:
+                self._held[idx] = True
+                self._push(opens - (arrive - now), TAKEOFF, idx)
+                return
+
+        self._held[idx] = False
+        drone.current_battery -= usage
+        drone.current_weight = delivery.weight
+        self._fly(idx, now, path, distance, arrive, delivery)
+
+    def _arrival(self, now, payload):
+        idx, delivery = payload
+        drone = self.drones[idx]
+        _, _, path, _ = self._flights.pop(idx)
+        self._position[idx] = np.asarray(path[-1], dtype=float)
+        drone.current_pos = tuple(path[-1])
+        drone.current_weight = 0.0
+        drone.is_busy = False
+
+        if delivery is None:
+            # Evde: şarj olup (iş kaldıysa) tekrar kalk
+            drone.last_node_id = f"D{drone.drone_id}_START"
+            drone.current_battery = drone.battery_capacity
+            self.recharges += 1
+            if not self._finished[idx]:
+                self._push(now + self.recharge, TAKEOFF, idx)
+            self._record_battery(drone, now)
+            return
+
+        finish = now
+        if delivery.time_window:
+            opens, closes = to_seconds(delivery.time_window[0]), to_seconds(delivery.time_window[1])
+            finish = max(now, opens)
+            if now > closes:
+                self.late.add(delivery.point_id)
+        delivery.delivered = True
+        self.completed[delivery.point_id] = finish
+        self._pending[idx] = None
+        drone.last_node_id = str(delivery.point_id)
+        pct = self._record_battery(drone, finish)
+
+        self._push(finish, BATTERY_CRITICAL if pct < drone.critical_pct else TAKEOFF, idx)
+
+    def _record_battery(self, drone, now):
+        pct = 100 * drone.current_battery / drone.battery_capacity
+        drone.battery_history.append(pct)
+        drone.time_ticks.append(now / 60.0)   # gün içi dakika
+        if metrics.ENABLED:
+            metrics.BATTERY_PCT.labels(drone_id=drone.drone_id).set(pct)
+        return pct
+
+    def _battery_critical(self, now, idx):
+        """Eve dönüş: kritik seviyede Drone.return_home, değilse doğrudan bacak."""
+        drone = self.drones[idx]
+        if self._at_home(idx):
+            self._position[idx] = np.asarray(drone.home_pos, dtype=float)
+            self._flights[idx] = (now, drone.speed, [self._position[idx]] * 2, np.zeros(2))
+            self._push(now, ARRIVAL, (idx, None))
+            return
+
+        home = np.asarray(drone.home_pos, dtype=float)
+        path = self._return_home(idx) if 100 * drone.current_battery / drone.battery_capacity < drone.critical_pct else None
+        if path is not None:
+            self.failsafe_returns += 1
+            distance = float(sum(np.hypot(*(np.subtract(q, p))) for p, q in zip(path, path[1:])))
+            arrive = now + distance / drone.speed
+        else:
+            leg = self._plan_leg(self._position[idx], home, now, drone.speed)
+            if leg is None:
+                if any(at > now for at in self._toggle_times):
+                    self._waiting.add(idx)
+                else:
+                    self._finished[idx] = True   # mahsur kaldı
+                return
+            distance, path, arrive = leg
+            drone.current_battery -= distance * 0.5
+        self._fly(idx, now, path, distance, arrive, None)
+
+    def _return_home(self, idx):
+        """
+        Kritik dönüş Drone.return_home üzerinden, graf değiştirilmeden: dron bir
+        graf düğümünde olmadığından konumdan görünen düğümler v içinden
+        min(|konum - v| + ev_ağacı[v]) seçilir ve return_home'a bu yaklaşma
+        bacağıyla verilir (pil, metrik ve durum orada uygulanır). Dönüş varsa
+        uçulacak yolun koordinatları, yoksa None döner.
+        """
+        drone = self.drones[idx]
+        position = self._position[idx]
+        inside, reach = self._visibility(position, self._active)
+        if (inside & self._active).any():
+            return None
+
+        graph = csr_graph_for(self.graph.adj_list, self.graph.nodes_map)
+        home = graph.index_of[f"D{drone.drone_id}_START"]
+        home_dist, _ = home_tree_for(graph, home)
+        order = [graph.index_of[node_id] for node_id in self._node_ids]
+        total = reach + np.asarray(home_dist)[order]
+        best = int(np.argmin(total)) if len(total) else -1
+        if best < 0 or not np.isfinite(total[best]):
+            return None
+
+        output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            returned = drone.return_home(self.graph.adj_list, self.graph.nodes_map, self.graph.nfzs,
+                                         approach=(self._node_ids[best], float(reach[best])))
+        if not returned:
+            return None
+        nodes, _ = path_to_root(graph, order[best], home)
+        return [position] + [graph.coords[n] for n in nodes]
+
+    def _nfz_toggle(self, now, payload):
+        k, active = payload
+        self.graph.set_zone_active(self.graph.nfzs[k].zone_id, active)
+        self._active = self._active.copy()
+        self._active[k] = active
+        self._vis_cache.clear()
+        for idx in sorted(self._waiting):
+            kind = TAKEOFF if self._pending[idx] is not None else BATTERY_CRITICAL
+            self._push(now, kind, idx)
+        self._waiting.clear()
+
+    # ------------------------------------------------------------------ #
+    def summary(self):
+        pending = [dp for dp in self.deliveries if dp.point_id not in self.completed and dp.point_id not in self.failed]
+        return {
+            'delivered': len(self.completed),
+            'late': len(self.late),
+            'failed': len(self.failed),
+            'undelivered': len(pending),
+            'distance': round(self.distance, 1),
+            'failsafe_returns': self.failsafe_returns,
+            'recharges': self.recharges,
+            'events': dict(self.event_counts),
+            'clock': format_clock(self.now),
+        }
+
+
+def main(argv=None):
+    from data_generator import LAYOUTS, generate_scenario
+
+    parser = argparse.ArgumentParser(description="Ayrık olaylı filo simülasyonu")
+    parser.add_argument("--drones", type=int, default=20)
+    parser.add_argument("--deliveries", type=int, default=10000)
+    parser.add_argument("--nfzs", type=int, default=3)
+    parser.add_argument("--layout", choices=LAYOUTS, default="templates", help="NFZ yerleşimi")
+    parser.add_argument("--start", default="08:00")
+    parser.add_argument("--until", help="HH:MM; verilmezse tüm olaylar işlenir")
+    parser.add_argument("--recharge", type=float, default=30, help="şarj süresi (dakika)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    # Tüm bölgeler generate_fixed_no_fly_zones gibi gün içinde açılıp kapanır
+    drones, deliveries, nfzs = generate_scenario(args.drones, args.deliveries, args.nfzs, seed=args.seed,
+                                                 layout=args.layout, dynamic_ratio=1.0)
+
+    t0 = time.perf_counter()
+    sim = FleetSimulator(drones, deliveries, nfzs, start_time=args.start, recharge_minutes=args.recharge)
+    result = sim.run(args.until)
+    elapsed = time.perf_counter() - t0
+
+    for key, value in result.items():
+        print(f"{key:>17}: {value}")
+    print(f"{'süre':>17}: {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+# snapshot.py
+"""
+İkili senaryo anlık görüntüsü (snapshot). Dosya sabit boyutlu bir başlık ve
+ardından 8 bayt hizalı, sabit genişlikli dizilerden oluşur:
+
+    başlık | dronlar | teslimatlar | NFZ'ler | NFZ köşeleri | [graf]
+
+Yükleme mmap üzerinden yapılır; sütunlar dosya sayfalarının doğrudan
+görünümleridir (kopya yok). mmap ACCESS_COPY ile açıldığından simülasyon
+sırasında sütunlara yazılan değerler dosyaya geri yazılmaz.
+
+    python snapshot.py convert data_records/*.txt -o snapshots/
+    python snapshot.py info snapshots/2025-06-02_13-31.snap
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+
+import numpy as np
+
+from entities import Drone, DeliveryPoint, NoFlyZone
+from fleet import Fleet, DeliveryTable
+from utils import time_to_minutes
+from a_star_solver import AdjacencyList, CSRGraph
+from graph_utils import (NODE_TYPE_DRONE_START, NODE_TYPE_DELIVERY, NODE_TYPE_NFZ_CORNER,
+                         NODE_TYPE_WAYPOINT)
+
+MAGIC = b'DRNSNAP1'
+VERSION = 1
+FLAG_GRAPH = 1
+
+# magic, version, flags, dronlar, teslimatlar, NFZ'ler, NFZ köşeleri, düğümler, kenarlar, düğüm id genişliği
+HEADER = struct.Struct('<8sIIQQQQQQQ')
+
+DRONE_DTYPE = np.dtype([
+    ('drone_id', '<i8'), ('max_weight', '<f8'), ('battery_capacity', '<f8'),
+    ('current_battery', '<f8'), ('speed', '<f8'), ('start_x', '<f8'), ('start_y', '<f8'),
+])
+DELIVERY_DTYPE = np.dtype([
+    ('point_id', '<i8'), ('x', '<f8'), ('y', '<f8'), ('weight', '<f8'),
+    ('priority', '<i8'), ('tw_start', '<i4'), ('tw_end', '<i4'),
+])
+# start_min / end_min: dakika, -1 = zaman aralığı yok
+NFZ_DTYPE = np.dtype([
+    ('zone_id', '<i8'), ('vertex_offset', '<i8'), ('vertex_count', '<i8'),
+    ('start_min', '<i4'), ('end_min', '<i4'),
+])
+NODE_DTYPE = np.dtype([('type', 'u1'), ('pad', 'u1', 7), ('ref_id', '<i8'), ('x', '<f8'), ('y', '<f8')])
+
+NODE_TYPES = (NODE_TYPE_DRONE_START, NODE_TYPE_DELIVERY, NODE_TYPE_NFZ_CORNER, NODE_TYPE_WAYPOINT)
+NO_TIME = -1
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _sections(n_drones, n_deliveries, n_nfzs, n_vertices, n_nodes, n_edges, id_width):
+    """Başlıktaki sayılardan her bölümün (ad, dtype, şekil) listesi; sıra dosyadaki sıradır."""
+    sections = [
+        ('drones', DRONE_DTYPE, (n_drones,)),
+        ('deliveries', DELIVERY_DTYPE, (n_deliveries,)),
+        ('nfzs', NFZ_DTYPE, (n_nfzs,)),
+        ('vertices', np.dtype('<f8'), (n_vertices, 2)),
+    ]
+    if n_nodes:
+        sections += [
+            ('node_ids', np.dtype(f'S{id_width}'), (n_nodes,)),
+            ('nodes', NODE_DTYPE, (n_nodes,)),
+            ('indptr', np.dtype('<i8'), (n_nodes + 1,)),
+            ('indices', np.dtype('<i8'), (n_edges,)),
+            ('weights', np.dtype('<f8'), (n_edges,)),
+        ]
+    return sections
+
+
+def _minutes(value):
+    return NO_TIME if value is None else time_to_minutes(value)
+
+
+def _clock(minutes):
+    return None if minutes == NO_TIME else f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# ---------------------------------------------------------------------- #
+# Yazma
+# ---------------------------------------------------------------------- #
+def _graph_arrays(nodes_map, adj_list):
+    node_ids = list(adj_list)
+    index_of = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    nodes = np.zeros(len(node_ids), dtype=NODE_DTYPE)
+    for i, node_id in enumerate(node_ids):
+        node = nodes_map[node_id]
+        nodes[i]['type'] = NODE_TYPES.index(node['type'])
+        nodes[i]['ref_id'] = node.get('original_id', node.get('nfz_id', -1))
+        nodes[i]['x'], nodes[i]['y'] = node['coords']
+
+    indptr = np.zeros(len(node_ids) + 1, dtype='<i8')
+    indptr[1:] = np.cumsum([len(adj_list[n]) for n in node_ids])
+    indices = np.array([index_of[nb] for n in node_ids for nb, _ in adj_list[n]], dtype='<i8')
+    weights = np.array([cost for n in node_ids for _, cost in adj_list[n]], dtype='<f8')
+    encoded = np.array([n.encode('utf-8') for n in node_ids], dtype=bytes)
+    return {'node_ids': encoded, 'nodes': nodes, 'indptr': indptr, 'indices': indices, 'weights': weights}
+
+
+def save_snapshot(path, drones, deliveries, nfzs, nodes_map=None, adj_list=None):
+    """
+    Senaryoyu (ve verilirse kurulmuş grafı) ikili dosyaya yazar.
+    drones / deliveries nesne listesi veya Fleet / DeliveryTable olabilir.
+    """
+    drones, deliveries, nfzs = list(drones), list(deliveries), list(nfzs)
+
+    arrays = {
+        'drones': np.array([(d.drone_id, d.max_weight, d.battery_capacity, d.current_battery, d.speed,
+                             d.start_pos[0], d.start_pos[1]) for d in drones], dtype=DRONE_DTYPE),
+        'deliveries': np.array([(p.point_id, p.location[0], p.location[1], p.weight, p.priority,
+                                 *(DeliveryTable._parse_window(p.time_window))) for p in deliveries],
+                               dtype=DELIVERY_DTYPE),
+    }
+
+    counts = np.array([len(nfz.coordinates) for nfz in nfzs], dtype='<i8')
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]) if len(nfzs) else counts
+    arrays['nfzs'] = np.array([(nfz.zone_id, offset, count, _minutes(nfz.start_time), _minutes(nfz.end_time))
+                               for nfz, offset, count in zip(nfzs, offsets.tolist(), counts.tolist())],
+                              dtype=NFZ_DTYPE)
+    arrays['vertices'] = np.array([v for nfz in nfzs for v in nfz.coordinates], dtype='<f8').reshape(-1, 2)
+
+    flags, n_nodes, n_edges, id_width = 0, 0, 0, 1
+    if adj_list is not None:
+        arrays.update(_graph_arrays(nodes_map, adj_list))
+        flags |= FLAG_GRAPH
+        n_nodes, n_edges = len(arrays['node_ids']), len(arrays['indices'])
+        id_width = max(arrays['node_ids'].dtype.itemsize, 1)
+        arrays['node_ids'] = arrays['node_ids'].astype(f'S{id_width}')
+
+    header = HEADER.pack(MAGIC, VERSION, flags, len(drones), len(deliveries), len(nfzs),
+                         len(arrays['vertices']), n_nodes, n_edges, id_width)
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        offset = len(header)
+        for name, dtype, shape in _sections(len(drones), len(deliveries), len(nfzs),
+                                            len(arrays['vertices']), n_nodes, n_edges, id_width):
+            padding = _align(offset) - offset
+            f.write(b'\0' * padding)
+            data = np.ascontiguousarray(arrays[name], dtype=dtype).reshape(shape)
+            f.write(data.tobytes())
+            offset += padding + data.nbytes
+    return path
+
+
+# ---------------------------------------------------------------------- #
+# Okuma
+# ---------------------------------------------------------------------- #
+class Snapshot:
+    """
+    mmap ile açılmış anlık görüntü. arrays, dosya bölümlerinin sıfır kopyalı
+    NumPy görünümleridir; fleet / deliveries / nfzs bunlardan kurulur.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        (magic, version, self.flags, n_drones, n_deliveries, n_nfzs, n_vertices,
+         n_nodes, n_edges, id_width) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: snapshot dosyası değil")
+        if version != VERSION:
+            raise ValueError(f"{path}: desteklenmeyen snapshot sürümü {version}")
+
+        self.arrays = {}
+        offset = HEADER.size
+        for name, dtype, shape in _sections(n_drones, n_deliveries, n_nfzs, n_vertices,
+                                            n_nodes, n_edges, id_width):
+            offset = _align(offset)
+            count = int(np.prod(shape))
+            self.arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset).reshape(shape)
+            offset += count * dtype.itemsize
+
+        self._fleet = None
+        self._deliveries = None
+        self._nfzs = None
+
+    @property
+    def has_graph(self):
+        return bool(self.flags & FLAG_GRAPH)
+
+    # ------------------------------------------------------------------ #
+    @property
+    def fleet(self):
+        if self._fleet is None:
+            rows = self.arrays['drones']
+            n = len(rows)
+            start_x, start_y = rows['start_x'], rows['start_y']
+            self._fleet = Fleet({
+                'drone_id': rows['drone_id'],
+                'max_weight': rows['max_weight'],
+                'battery_capacity': rows['battery_capacity'],
+                'current_battery': rows['current_battery'],
+                'speed': rows['speed'],
+                'start_x': start_x, 'start_y': start_y,
+                'current_x': start_x.copy(), 'current_y': start_y.copy(),
+                'current_weight': np.zeros(n),
+                'is_busy': np.zeros(n, dtype=bool),
+                'home_x': start_x.copy(), 'home_y': start_y.copy(),
+                'critical_pct': np.full(n, 20),
+            })
+        return self._fleet
+
+    @property
+    def deliveries(self):
+        if self._deliveries is None:
+            rows = self.arrays['deliveries']
+            columns = {name: rows[name] for name in DELIVERY_DTYPE.names}
+            columns['delivered'] = np.zeros(len(rows), dtype=bool)
+            self._deliveries = DeliveryTable(columns)
+        return self._deliveries
+
+    @property
+    def nfzs(self):
+        if self._nfzs is None:
+            vertices = self.arrays['vertices'].tolist()
+            self._nfzs = [
+                NoFlyZone(zone_id, [tuple(v) for v in vertices[offset:offset + count]],
+                          _clock(start), _clock(end))
+                for zone_id, offset, count, start, end in self.arrays['nfzs'].tolist()
+            ]
+        return self._nfzs
+
+    def scenario(self):
+        """(drones, deliveries, nfzs) — main / benchmark'ın beklediği listeler."""
+        return list(self.fleet), list(self.deliveries), self.nfzs
+
+    # ------------------------------------------------------------------ #
+    def node_ids(self):
+        return [n.decode('utf-8') for n in self.arrays['node_ids'].tolist()]
+
+    def csr_graph(self):
+        """Kaydedilmiş grafın CSRGraph hali (nodes_map/adj_list kurmadan)."""
+        if not self.has_graph:
+            return None
+        nodes = self.arrays['nodes']
+        # Kopya: graf close() sonrasında da geçerli kalır (CSRGraph dizileri zaten listeye açar)
+        return CSRGraph.from_arrays(self.node_ids(), np.column_stack([nodes['x'], nodes['y']]),
+                                    np.array(self.arrays['indptr']), np.array(self.arrays['indices']),
+                                    np.array(self.arrays['weights']))
+
+    def graph(self):
+        """Kaydedilmiş grafı build_graph biçiminde (nodes_map, adj_list) döner."""
+        if not self.has_graph:
+            return None, None
+        node_ids = self.node_ids()
+        nodes = self.arrays['nodes'].tolist()
+        points = {p.point_id: p for p in self.deliveries}
+
+        nodes_map = {}
+        for node_id, (type_code, _, ref_id, x, y) in zip(node_ids, nodes):
+            node_type = NODE_TYPES[type_code]
+            if node_type == NODE_TYPE_DRONE_START:
+                node = {'coords': (x, y), 'type': node_type, 'original_id': ref_id}
+            elif node_type == NODE_TYPE_DELIVERY:
+                point = points[ref_id]
+                node = {'type': node_type, 'coords': point.location, 'weight': point.weight,
+                        'priority': point.priority, 'time_window': point.time_window, 'original_id': ref_id}
+            else:
+                node = {'coords': (x, y), 'type': node_type, 'nfz_id': ref_id}
+            nodes_map[node_id] = node
+
+        indptr = self.arrays['indptr'].tolist()
+        indices = self.arrays['indices'].tolist()
+        weights = self.arrays['weights'].tolist()
+        adj_list = AdjacencyList((node_id, [(node_ids[indices[k]], weights[k]) for k in range(indptr[i], indptr[i + 1])])
+                                 for i, node_id in enumerate(node_ids))
+        return nodes_map, adj_list
+
+    def close(self):
+        """
+        mmap'i kapatır. Daha önce verilen Fleet / DeliveryTable depoları
+        kullanılmaya devam edebilsin diye sütunları önce kopyalanır.
+        """
+        for store in (self._fleet, self._deliveries):
+            if store is not None:
+                store.columns = {name: np.array(column) for name, column in store.columns.items()}
+        self.arrays = {}
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def load_snapshot(path):
+    return Snapshot(path)
+
+
+# ---------------------------------------------------------------------- #
+# data_records/*.txt dönüştürücü
+# ---------------------------------------------------------------------- #
+_NUMBER = r'(-?\d+(?:\.\d+)?)'
+_DRONE_RE = re.compile(rf'Drone (\d+) \| Konum: \({_NUMBER}, {_NUMBER}\) \| Kapasite: {_NUMBER} kg \| '
+                       rf'Batarya: {_NUMBER} \| Hız: {_NUMBER}')
+_DELIVERY_RE = re.compile(rf'Teslimat (\d+) \| Konum: \({_NUMBER}, {_NUMBER}\) \| Ağırlık: {_NUMBER} kg \| '
+                          rf'Öncelik: (\d+) \| Time Window: (None|\d\d:\d\d-\d\d:\d\d)')
+_NFZ_RE = re.compile(r'NFZ (\d+) → Köşeler: \[(.*)\]')
+_POINT_RE = re.compile(rf'\({_NUMBER},\s*{_NUMBER}\)')
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and '.' not in text else value
+
+
+def parse_record(path):
+    """main.py'nin yazdığı metin kaydını (drones, deliveries, nfzs) listelerine çevirir."""
+    drones, deliveries, nfzs = [], [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            match = _DRONE_RE.match(line)
+            if match:
+                drone_id, x, y, capacity, battery, speed = match.groups()
+                drone = Drone(int(drone_id), float(capacity), float(battery), float(speed),
+                              (_number(x), _number(y)))
+                drones.append(drone)
+                continue
+            match = _DELIVERY_RE.match(line)
+            if match:
+                point_id, x, y, weight, priority, window = match.groups()
+                time_window = None if window == 'None' else tuple(window.split('-'))
+                deliveries.append(DeliveryPoint(int(point_id), (_number(x), _number(y)), float(weight),
+                                                int(priority), time_window))
+                continue
+            match = _NFZ_RE.match(line)
+            if match:
+                zone_id, corners = match.groups()
+                nfzs.append(NoFlyZone(int(zone_id), [(_number(x), _number(y))
+                                                     for x, y in _POINT_RE.findall(corners)]))
+    return drones, deliveries, nfzs
+
+
+def convert_record(path, output, with_graph=False):
+    drones, deliveries, nfzs = parse_record(path)
+    nodes_map = adj_list = None
+    if with_graph:
+        from graph_utils import build_graph
+        nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    return save_snapshot(output, drones, deliveries, nfzs, nodes_map, adj_list)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İkili senaryo snapshot araçları")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="data_records metin kayıtlarını snapshot'a çevir")
+    convert.add_argument("records", nargs="+")
+    convert.add_argument("-o", "--output-dir", default=".")
+    convert.add_argument("--graph", action="store_true", help="kurulmuş grafı da kaydet")
+
+    info = commands.add_parser("info", help="snapshot özetini yazdır")
+    info.add_argument("snapshots", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        os.makedirs(args.output_dir, exist_ok=True)
+        for record in args.records:
+            name = os.path.splitext(os.path.basename(record))[0] + ".snap"
+            output = convert_record(record, os.path.join(args.output_dir, name), args.graph)
+            print(f"{record} → {output}")
+    else:
+        for path in args.snapshots:
+            with load_snapshot(path) as snap:
+                graph = (f"{len(snap.arrays['node_ids'])} düğüm, {len(snap.arrays['indices'])} kenar"
+                         if snap.has_graph else "yok")
+                print(f"{path}: {len(snap.arrays['drones'])} dron, {len(snap.arrays['deliveries'])} teslimat, "
+                      f"{len(snap.arrays['nfzs'])} NFZ, graf: {graph}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
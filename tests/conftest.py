@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Modüller depo kökünde düz dosyalar olarak durur
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,96 @@
+# tests/test_a_star.py
+import heapq
+import random
+
+from a_star_solver import a_star_search, csr_graph_for, home_tree_for, return_home_path
+from data_generator import generate_fixed_no_fly_zones, generate_random_delivery_points, generate_random_drones
+from entities import Drone
+from graph_utils import build_graph
+
+
+def _graph(seed):
+    random.seed(seed)
+    drones = generate_random_drones(4, 1000, 1000)
+    nfzs = generate_fixed_no_fly_zones()
+    deliveries = generate_random_delivery_points(30, 1000, 1000, nfzs=nfzs)
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    return nodes_map, adj_list, nfzs
+
+
+def _dijkstra(adj_list, start):
+    """String kimlikli sözlük üzerinde referans Dijkstra."""
+    dist = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, cost in adj_list[u]:
+            if d + cost < dist.get(v, float('inf')):
+                dist[v] = d + cost
+                heapq.heappush(heap, (d + cost, v))
+    return dist
+
+
+def _pairs(nodes_map, count, rng):
+    node_ids = list(nodes_map)
+    return [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(count)]
+
+
+def _path_cost(adj_list, path):
+    return sum(dict(adj_list[u])[v] for u, v in zip(path, path[1:]))
+
+
+def test_csr_a_star_matches_dijkstra():
+    nodes_map, adj_list, nfzs = _graph(1)
+    rng = random.Random(1)
+    for start, goal in _pairs(nodes_map, 60, rng):
+        path, cost = a_star_search(adj_list, nodes_map, nfzs, start, goal)
+        expected = _dijkstra(adj_list, start).get(goal, float('inf'))
+        if expected == float('inf'):
+            assert path is None and cost == float('inf')
+        else:
+            assert abs(cost - expected) < 1e-6
+            assert path[0] == start and path[-1] == goal
+            assert abs(_path_cost(adj_list, path) - cost) < 1e-6
+
+
+def test_alt_and_bidirectional_match_plain_a_star():
+    for seed in (2, 3):
+        nodes_map, adj_list, nfzs = _graph(seed)
+        rng = random.Random(seed)
+        for start, goal in _pairs(nodes_map, 80, rng):
+            _, expected = a_star_search(adj_list, nodes_map, nfzs, start, goal)
+            for options in ({'landmarks': 4}, {'bidirectional': True}, {'landmarks': 4, 'bidirectional': True}):
+                path, cost = a_star_search(adj_list, nodes_map, nfzs, start, goal, **options)
+                assert abs(cost - expected) < 1e-6 or cost == expected == float('inf')
+                if path is not None:
+                    assert path[0] == start and path[-1] == goal
+                    assert abs(_path_cost(adj_list, path) - cost) < 1e-6
+
+
+def test_home_tree_paths_match_a_star():
+    nodes_map, adj_list, nfzs = _graph(4)
+    graph = csr_graph_for(adj_list, nodes_map)
+    home = "D1_START"
+    assert home_tree_for(graph, graph.index_of[home]) is home_tree_for(graph, graph.index_of[home])
+    for node_id in nodes_map:
+        path, cost = return_home_path(adj_list, nodes_map, node_id, home)
+        _, expected = a_star_search(adj_list, nodes_map, nfzs, node_id, home)
+        assert abs(cost - expected) < 1e-6 or cost == expected == float('inf')
+        if path is not None:
+            assert path[0] == node_id and path[-1] == home
+            assert abs(_path_cost(adj_list, path) - cost) < 1e-6
+
+
+def test_drone_return_home_uses_tree_cost():
+    nodes_map, adj_list, nfzs = _graph(5)
+    drone = Drone(1, 5.0, 1000.0, 10.0, nodes_map["D1_START"]['coords'])
+    drone.last_node_id = next(n for n in nodes_map if n.isdigit())
+    _, cost = return_home_path(adj_list, nodes_map, drone.last_node_id, "D1_START")
+
+    assert not drone.return_home(adj_list, nodes_map, nfzs)   # pil kritik değil
+    drone.current_battery = 100.0
+    assert drone.return_home(adj_list, nodes_map, nfzs)
+    assert abs(drone.current_battery - (100.0 - cost * 0.5)) < 1e-9
+    assert drone.last_node_id == "D1_START" and drone.current_pos == drone.home_pos
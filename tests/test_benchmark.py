@@ -0,0 +1,23 @@
+# tests/test_benchmark.py
+from benchmark import STAGES, bench_case, compare_reports, make_scenario
+
+
+def test_make_scenario_is_seeded():
+    first = make_scenario(3, 15, 2, seed=7)
+    second = make_scenario(3, 15, 2, seed=7)
+    assert [d.start_pos for d in first[0]] == [d.start_pos for d in second[0]]
+    assert [p.location for p in first[1]] == [p.location for p in second[1]]
+
+
+def test_bench_case_covers_every_stage():
+    rows = bench_case(2, 10, 2, seed=1, repeat=1, memory=False, astar_queries=5, ga_generations=2)
+    assert [row["stage"] for row in rows] == list(STAGES)
+    assert all(row["seconds"] >= 0 and row["peak_kb"] is None for row in rows)
+
+
+def test_compare_reports_flags_regressions():
+    row = {"drones": 2, "deliveries": 10, "nfzs": 2, "stage": "csp_solve"}
+    baseline = {"results": [dict(row, seconds=1.0)]}
+    assert compare_reports(baseline, {"results": [dict(row, seconds=1.1)]}) == []
+    assert compare_reports(baseline, {"results": [dict(row, seconds=1.5)]}) == [
+        ((2, 10, 2, "csp_solve"), 1.5)]
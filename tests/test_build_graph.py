@@ -0,0 +1,31 @@
+# tests/test_build_graph.py
+import random
+
+from data_generator import generate_fixed_no_fly_zones, generate_random_delivery_points, generate_random_drones
+from graph_utils import build_graph
+from utils import calculate_distance, segment_crosses_polygon
+
+
+def _baseline_edges(nodes_map, nfzs):
+    """Vektörleştirme öncesi çift döngü: her çift her bölgeye karşı test edilir."""
+    edges = {}
+    for id_1, node_1 in nodes_map.items():
+        for id_2, node_2 in nodes_map.items():
+            if id_1 != id_2 and not any(segment_crosses_polygon((node_1['coords'], node_2['coords']), nfz.coordinates)
+                                        for nfz in nfzs):
+                edges[id_1, id_2] = calculate_distance(node_1['coords'], node_2['coords'])
+    return edges
+
+
+def test_build_graph_matches_baseline_loop():
+    for seed in (1, 2, 3):
+        random.seed(seed)
+        drones = generate_random_drones(4, 1000, 1000)
+        nfzs = generate_fixed_no_fly_zones()
+        deliveries = generate_random_delivery_points(25, 1000, 1000, nfzs=nfzs)
+        nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+
+        edges = {(node_id, nb): cost for node_id, neighbours in adj_list.items() for nb, cost in neighbours}
+        expected = _baseline_edges(nodes_map, nfzs)
+        assert edges.keys() == expected.keys()
+        assert all(abs(edges[key] - expected[key]) < 1e-9 for key in expected)
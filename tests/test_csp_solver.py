@@ -0,0 +1,117 @@
+# tests/test_csp_solver.py
+import copy
+
+from csp_solver import CSPSolver
+from data_generator import generate_scenario
+from fleet import DeliveryTable, Fleet
+from graph_utils import build_graph
+from path_table import ShortestPathTable
+from utils import is_point_in_polygon
+
+
+def _scenario(seed, num_drones=6, num_deliveries=40):
+    drones, deliveries, nfzs = generate_scenario(num_drones, num_deliveries, num_nfzs=4, seed=seed)
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    return drones, list(deliveries), nfzs, nodes_map, adj_list
+
+
+def _solve(scenario, **kwargs):
+    drones, deliveries, nfzs, nodes_map, adj_list = copy.deepcopy(scenario)
+    solver = CSPSolver(deliveries, drones, adj_list, nodes_map, nfzs, verbose=False, **kwargs)
+    assignments = solver.solve()
+    return assignments, solver.legs, [(d.current_battery, d.battery_history) for d in drones]
+
+
+def test_worker_pool_matches_serial():
+    scenario = _scenario(seed=5)
+    assert _solve(scenario, workers=2) == _solve(scenario)
+
+
+def _greedy(deliveries, drones, nfzs, path_table):
+    """Aday kuyruğu öncesi seri döngü: her turda her teslimat için tüm dronlar taranır."""
+    unassigned = [d for d in deliveries if not is_point_in_polygon(d.location, nfzs[0].coordinates)]
+    unassigned.sort(key=lambda t: t.priority, reverse=True)
+    assignments = {}
+    while True:
+        assigned = False
+        for delivery in unassigned[:]:
+            best_drone, best_cost = None, float("inf")
+            for drone in drones:
+                if drone.max_weight < delivery.weight:
+                    continue
+                cost = path_table.cost(drone.last_node_id, str(delivery.point_id))
+                usage = cost * 0.5 * (1.0 + (delivery.weight / drone.max_weight) * 0.5)
+                if cost == float("inf") or usage > drone.current_battery:
+                    continue
+                if cost < best_cost:
+                    best_drone, best_cost = drone, cost
+            if best_drone is not None:
+                best_drone.current_battery -= best_cost * 0.5 * (1.0 + (delivery.weight / best_drone.max_weight) * 0.5)
+                best_drone.last_node_id = str(delivery.point_id)
+                assignments[delivery.point_id] = best_drone.drone_id
+                unassigned.remove(delivery)
+                assigned = True
+        if not assigned or not unassigned:
+            return assignments
+
+
+def test_candidate_queue_matches_serial_greedy():
+    for seed in (1, 2, 3):
+        scenario = _scenario(seed, num_drones=5, num_deliveries=60)
+        drones, deliveries, nfzs, nodes_map, adj_list = copy.deepcopy(scenario)
+        expected = _greedy(deliveries, drones, nfzs, ShortestPathTable(adj_list, nodes_map))
+        assignments, _, batteries = _solve(scenario)
+        assert assignments == expected
+        assert [battery for battery, _ in batteries] == [d.current_battery for d in drones]
+
+
+def test_candidate_heaps_stay_bounded():
+    drones, deliveries, nfzs, nodes_map, adj_list = _scenario(seed=8, num_drones=4, num_deliveries=120)
+    solver = CSPSolver(deliveries, drones, adj_list, nodes_map, nfzs, verbose=False)
+    sizes = []
+    push = solver._push_candidates
+
+    def tracked(drone_idx):
+        push(drone_idx)
+        sizes.append(max((len(heap) for heap in solver._candidates.values()), default=0))
+
+    solver._push_candidates = tracked
+    solver.solve()
+    assert len(sizes) > 2 * len(drones)
+    assert max(sizes) <= 2 * len(drones)
+
+
+def test_column_stores_match_object_lists():
+    scenario = _scenario(seed=4)
+    drones, deliveries, nfzs, nodes_map, adj_list = copy.deepcopy(scenario)
+    table = DeliveryTable.from_points(deliveries)
+    solver = CSPSolver(table, Fleet.from_drones(drones), adj_list, nodes_map, nfzs, verbose=False)
+    assignments = solver.solve()
+    assert (assignments, solver.legs, [(d.current_battery, d.battery_history) for d in drones]) == _solve(scenario)
+    assert table.columns['delivered'].sum() == len(assignments)
+
+
+def test_lower_bounds_prune_path_searches():
+    scenario = _scenario(seed=9, num_drones=5, num_deliveries=80)
+    drones, deliveries, nfzs, nodes_map, adj_list = copy.deepcopy(scenario)
+    for drone in drones:
+        drone.current_battery = drone.battery_capacity = 300.0
+    expected = _greedy(copy.deepcopy(deliveries), copy.deepcopy(drones), nfzs, ShortestPathTable(adj_list, nodes_map))
+
+    solver = CSPSolver(deliveries, drones, adj_list, nodes_map, nfzs, verbose=False)
+    queried = []
+    check = solver.check_path_validity
+
+    def counted(start_node, end_node):
+        valid, cost = check(start_node, end_node)
+        queried.append(cost)
+        return valid, cost
+
+    solver.check_path_validity = counted
+    assert expected and solver.solve() == expected
+    # Alt sınırı bile pile sığmayan çiftler için yol hiç aranmaz
+    assert len(queried) < len(drones) * len(deliveries) // 4
+    # Alt sınırlar gerçek yol maliyetlerini hiç aşmaz
+    for drone in drones:
+        costs = [solver.path_table.cost(drone.last_node_id, str(point_id)) for point_id in solver._point_ids]
+        assert all(bound <= cost for bound, cost in zip(solver._lower_bounds(drone).tolist(), costs))
@@ -0,0 +1,60 @@
+# tests/test_csr_cache.py
+import gc
+
+import a_star_solver
+from a_star_solver import AdjacencyList, csr_graph_for, invalidate_graph_cache
+from graph_utils import FlightGraph
+
+
+def _adj():
+    nodes_map = {n: {'coords': c} for n, c in (('A', (0, 0)), ('B', (3, 4)), ('C', (6, 8)))}
+    adj_list = AdjacencyList(A=[('B', 5.0)], B=[('A', 5.0)], C=[])
+    return nodes_map, adj_list
+
+
+def test_in_place_edge_edit_rebuilds_csr():
+    nodes_map, adj_list = _adj()
+    graph = csr_graph_for(adj_list, nodes_map)
+    assert graph.weights.tolist() == [5.0, 5.0]
+
+    # Düğüm sayısı aynı kalır; yalnızca kenar eklenir
+    adj_list['B'].append(('C', 5.0))
+    adj_list['C'].append(('B', 5.0))
+    invalidate_graph_cache(adj_list)
+    assert csr_graph_for(adj_list, nodes_map).weights.tolist() == [5.0, 5.0, 5.0, 5.0]
+
+
+def test_dropped_graph_leaves_cache():
+    invalidate_graph_cache()
+    nodes_map, adj_list = _adj()
+    csr_graph_for(adj_list, nodes_map)
+    assert len(a_star_solver._CSR_CACHE) == 1
+    del adj_list
+    gc.collect()
+    assert not a_star_solver._CSR_CACHE
+
+
+def test_cache_is_bounded():
+    invalidate_graph_cache()
+    nodes_map, _ = _adj()
+    graphs = [{'A': [], 'B': [], 'C': []} for _ in range(3 * a_star_solver._CSR_CACHE_SIZE)]
+    for adj_list in graphs:
+        csr_graph_for(adj_list, nodes_map)
+    assert len(a_star_solver._CSR_CACHE) == a_star_solver._CSR_CACHE_SIZE
+
+
+def test_flight_graph_zone_toggle_serves_fresh_csr():
+    from entities import Drone, DeliveryPoint, NoFlyZone
+    drones = [Drone(1, 5.0, 100.0, 10.0, (0, 0))]
+    deliveries = [DeliveryPoint(1, (100, 0), 1.0, 1)]
+    nfzs = [NoFlyZone(1, [(40, -20), (40, 20), (60, 20), (60, -20)], "09:00", "10:00")]
+    graph = FlightGraph(deliveries, drones, nfzs, time_aware=True, current_time="08:00")
+
+    direct = csr_graph_for(graph.adj_list, graph.nodes_map)
+    assert direct.index_of['1'] in direct.indices.tolist()
+    graph.set_time("09:30")
+    blocked = csr_graph_for(graph.adj_list, graph.nodes_map)
+    assert blocked is not direct
+    start = blocked.index_of['D1_START']
+    neighbours = blocked.indices[blocked.indptr[start]:blocked.indptr[start + 1]].tolist()
+    assert blocked.index_of['1'] not in neighbours
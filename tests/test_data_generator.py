@@ -0,0 +1,31 @@
+# tests/test_data_generator.py
+import random
+
+import numpy as np
+import pytest
+
+from entities import NoFlyZone
+from data_generator import (generate_fixed_no_fly_zones, generate_random_delivery_points, generate_scenario,
+                            sample_free_points)
+from utils import is_point_in_polygon
+
+
+def test_sample_free_points_gives_up_on_covered_map():
+    rng = np.random.default_rng(0)
+    cover = [NoFlyZone(1, [(-1, -1), (-1, 101), (101, 101), (101, -1)])]
+    with pytest.raises(ValueError):
+        sample_free_points(rng, 10, cover, 100, 100, max_rounds=5)
+
+
+def test_scenario_is_reproducible():
+    first = generate_scenario(3, 50, 4, seed=11)
+    second = generate_scenario(3, 50, 4, seed=11)
+    assert [p.location for p in first[1]] == [p.location for p in second[1]]
+    assert [z.coordinates for z in first[2]] == [z.coordinates for z in second[2]]
+
+
+def test_delivery_points_avoid_given_zones():
+    random.seed(11)
+    nfzs = generate_fixed_no_fly_zones()
+    points = generate_random_delivery_points(200, 1000, 1000, nfzs=nfzs)
+    assert not any(is_point_in_polygon(p.location, nfz.coordinates) for p in points for nfz in nfzs)
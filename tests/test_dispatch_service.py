@@ -0,0 +1,73 @@
+# tests/test_dispatch_service.py
+import asyncio
+import json
+import random
+
+from data_generator import generate_fixed_no_fly_zones, generate_random_drones
+from dispatch_service import DispatchService
+from entities import DeliveryPoint
+from order_stream import StreamDispatcher
+
+
+def _service(**kwargs):
+    random.seed(7)
+    dispatcher = StreamDispatcher(generate_random_drones(3, 1000, 1000), generate_fixed_no_fly_zones())
+    return DispatchService(dispatcher, **kwargs)
+
+
+def _order(point_id, k=0):
+    return DeliveryPoint(point_id, (100 + 10 * k, 900 - 10 * k), 0.5, 1)
+
+
+def test_window_and_max_batch():
+    async def scenario():
+        service = _service(window=0.2, max_batch=4)
+        service.start()
+        try:
+            first = await asyncio.gather(*(service.submit(_order(i, i)) for i in range(1, 4)))
+            second = await asyncio.gather(*(service.submit(_order(i, i)) for i in range(10, 16)))
+        finally:
+            await service.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert [d["delivery_id"] for d in first] == [1, 2, 3]
+    assert {d["batch_size"] for d in first} == {3}
+    assert [d["delivery_id"] for d in second] == list(range(10, 16))
+    assert sorted(d["batch_size"] for d in second) == [2, 2, 4, 4, 4, 4]
+
+
+def test_duplicate_ids_in_one_batch():
+    async def scenario():
+        service = _service(window=0.2)
+        service.start()
+        try:
+            return await asyncio.gather(service.submit(_order(5)), service.submit(_order(5, 1)))
+        finally:
+            await service.stop()
+
+    first, second = asyncio.run(scenario())
+    assert "error" not in first and first["delivery_id"] == 5
+    assert "error" in second
+
+
+def test_socket_round_trip():
+    async def scenario():
+        service = _service(window=0.05)
+        server = await service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"id": 501, "x": 120, "y": 880, "weight": 1.2}\n{"id": 502\n')
+            await writer.drain()
+            lines = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            return lines
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+
+    lines = asyncio.run(scenario())
+    assert any(line.get("delivery_id") == 501 and "drone_id" in line for line in lines)
+    assert any(line.get("error", "").startswith("geçersiz sipariş") for line in lines)
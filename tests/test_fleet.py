@@ -0,0 +1,41 @@
+# tests/test_fleet.py
+import numpy as np
+
+from data_generator import generate_scenario
+from entities import DeliveryPoint, Drone
+from fleet import DeliveryTable, Fleet, columns_of
+
+
+def test_entities_are_plain_slots():
+    drone = Drone(1, 5.0, 100.0, 10.0, (0, 0))
+    point = DeliveryPoint(7, (3, 4), 1.5, 2, ("09:00", "10:00"))
+    assert not hasattr(drone, '__dict__') and not hasattr(point, '__dict__')
+    Fleet.from_drones([drone])
+    DeliveryTable.from_points([point])
+    drone.current_battery = 40.0
+    assert drone.current_battery == 40.0
+
+
+def test_columns_of_matches_objects():
+    drones, table, _ = generate_scenario(4, 30, num_nfzs=2, seed=3)
+    points = list(table)
+    for name in ('location', 'weight', 'priority', 'point_id'):
+        assert np.array_equal(columns_of(table, name), columns_of(points, name))
+    fleet = Fleet.from_drones(drones)
+    for name in ('max_weight', 'start_pos', 'drone_id'):
+        assert np.array_equal(columns_of(fleet, name), columns_of(drones, name))
+
+
+def test_table_points_are_stable():
+    _, table, _ = generate_scenario(2, 10, num_nfzs=1, seed=1)
+    first = table[3]
+    first.delivered = True
+    assert table[3] is first and table.get_point(first.point_id).delivered
+    assert table[3].time_window == table.get(3, 'time_window')
+
+
+def test_fleet_from_columns():
+    fleet = Fleet.from_drones([Drone(1, 5.0, 100.0, 10.0, (0, 0)), Drone(4, 3.0, 80.0, 12.0, (5, 6))])
+    rebuilt = Fleet(fleet.columns)
+    assert rebuilt.get_drone(4).start_pos == (5, 6)
+    assert rebuilt.get_drone(4).last_node_id == "D4_START"
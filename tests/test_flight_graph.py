@@ -0,0 +1,41 @@
+# tests/test_flight_graph.py
+import random
+
+from data_generator import generate_fixed_no_fly_zones, generate_random_delivery_points, generate_random_drones
+from graph_utils import FlightGraph
+
+
+def _edges(graph):
+    return {(u, v, round(cost, 9)) for u, nbs in graph.adj_list.items() for v, cost in nbs}
+
+
+def _scenario(seed):
+    random.seed(seed)
+    drones = generate_random_drones(4, 1000, 1000)
+    nfzs = generate_fixed_no_fly_zones()
+    deliveries = generate_random_delivery_points(30, 1000, 1000, nfzs=nfzs)
+    return drones, deliveries, nfzs
+
+
+def test_incremental_deliveries_and_drones_match_batch_build():
+    drones, deliveries, nfzs = _scenario(4)
+    graph = FlightGraph(deliveries[:10], drones[:2], nfzs)
+    for point in deliveries[10:]:
+        graph.add_delivery(point)
+    for drone in drones[2:]:
+        graph.add_drone(drone)
+    for point in deliveries[:5]:
+        assert graph.remove_delivery(point.point_id)
+    assert not graph.remove_delivery(deliveries[0].point_id)
+
+    batch = FlightGraph(deliveries[5:], drones, nfzs)
+    assert graph.nodes_map.keys() == batch.nodes_map.keys()
+    assert _edges(graph) == _edges(batch)
+
+
+def test_add_nfz_matches_batch_build():
+    drones, deliveries, nfzs = _scenario(6)
+    graph = FlightGraph(deliveries, drones, nfzs[:1])
+    for nfz in nfzs[1:]:
+        graph.add_nfz(nfz)
+    assert _edges(graph) == _edges(FlightGraph(deliveries, drones, nfzs))
@@ -0,0 +1,72 @@
+# tests/test_ga_optimizer.py
+import random
+
+from a_star_solver import a_star_search
+from data_generator import generate_scenario
+from fleet import DeliveryTable, Fleet
+from ga_optimizer import GAOptimizer
+from graph_utils import build_graph
+
+
+def _optimizer(seed=1, **kwargs):
+    drones, deliveries, nfzs = generate_scenario(5, 40, num_nfzs=4, seed=seed)
+    deliveries = list(deliveries)
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    return GAOptimizer(drones, deliveries, nfzs, nodes_map, adj_list, **kwargs)
+
+
+def _baseline_fitness(ga, individual):
+    """Tablo öncesi fitness: her gen için A* ve doğrusal aramalar."""
+    score = 0
+    for delivery_id, drone_id in individual.items():
+        drone = next(d for d in ga.drones if d.drone_id == drone_id)
+        delivery = next(dp for dp in ga.deliveries if dp.point_id == delivery_id)
+        if drone.max_weight < delivery.weight:
+            score -= 100
+            continue
+        path, cost = a_star_search(ga.adj_list, ga.nodes_map, ga.nfzs, f"D{drone_id}_START", str(delivery_id))
+        if not path:
+            score -= 100
+            continue
+        score += delivery.priority * 10
+        score -= cost * 0.2
+    return score
+
+
+def test_score_table_matches_baseline_fitness():
+    ga = _optimizer()
+    random.seed(4)
+    population = ga.create_population()
+    batch = ga.fitness_batch(population)
+    for individual, score in zip(population, batch):
+        expected = _baseline_fitness(ga, individual)
+        assert abs(ga.fitness(individual) - expected) < 1e-6
+        assert abs(score - expected) < 1e-6
+
+
+def test_score_table_from_column_stores():
+    ga = _optimizer(seed=2)
+    stores = GAOptimizer(Fleet.from_drones(ga.drones), DeliveryTable.from_points(ga.deliveries), ga.nfzs,
+                         ga.nodes_map, ga.adj_list)
+    assert (stores.build_score_table() == ga.build_score_table()).all()
+
+
+def test_fitness_cache_is_bounded():
+    ga = _optimizer(seed=3, pop_size=6)
+    random.seed(1)
+    for individual in ga.create_population() * 3 + ga.create_population():
+        ga.fitness(individual)
+    assert len(ga._fitness_cache) <= ga.fitness_cache_size
+
+
+def test_islands_are_reproducible_and_valid():
+    ga = _optimizer(seed=4, islands=2, generations=6, migration_interval=2, workers=1)
+    random.seed(9)
+    first = ga.run()
+    random.seed(9)
+    assert ga.run() == first
+    drone_ids = {d.drone_id for d in ga.drones}
+    assert list(first) == [dp.point_id for dp in ga.deliveries] and set(first.values()) <= drone_ids
+    # Adaların en iyisi rastgele bir popülasyonun en iyisinden kötü olmamalı
+    random.seed(9)
+    assert ga.fitness(first) >= max(ga.fitness_batch(ga.create_population()))
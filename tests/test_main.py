@@ -0,0 +1,20 @@
+# tests/test_main.py
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True,
+                          check=True).stdout
+
+
+def test_headless_run_never_imports_matplotlib(tmp_path):
+    out = _run("import sys, main; main.main(['--headless', '--seed', '3']); "
+               "print('MPL', 'matplotlib' in sys.modules)", tmp_path)
+    assert "MPL False" in out
+    assert "Drone Fleet Optimization Project Completed." in out
+
@@ -0,0 +1,60 @@
+# tests/test_metrics.py
+import re
+
+import pytest
+
+import metrics
+from a_star_solver import a_star_search
+from entities import Drone, DeliveryPoint, NoFlyZone
+from graph_utils import build_graph
+
+SAMPLE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? [0-9.e+-]+$')
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def _search():
+    drones = [Drone(1, 5.0, 100.0, 10.0, (0, 0))]
+    deliveries = [DeliveryPoint(1, (100, 0), 1.0, 1)]
+    nfzs = [NoFlyZone(1, [(40, -20), (40, 20), (60, 20), (60, -20)])]
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    return a_star_search(adj_list, nodes_map, nfzs, "D1_START", "1")
+
+
+def test_text_format(enabled):
+    with metrics.stage("search"):
+        _search()
+    metrics.BATTERY_PCT.labels(drone_id=3).set(42.5)
+    text = metrics.render()
+
+    lines = text.splitlines()
+    for metric in metrics.REGISTRY:
+        assert f"# HELP {metric.name} {metric.documentation}" in lines
+        assert f"# TYPE {metric.name} {metric.TYPE}" in lines
+    samples = [line for line in lines if not line.startswith("#")]
+    assert samples and all(SAMPLE.match(line) for line in samples)
+    assert 'drone_battery_percent{drone_id="3"} 42.5' in lines
+    assert 'drone_stage_seconds_count{stage="search"} 1' in lines
+    assert metrics.A_STAR_EXPANSIONS.value(algorithm="astar") > 0
+    assert text.endswith("\n")
+
+
+def test_disabled_counts_nothing():
+    metrics.reset()
+    _search()
+    assert all(line.startswith("#") for line in metrics.render().splitlines())
+
+
+def test_write_textfile(enabled, tmp_path):
+    metrics.FITNESS_EVALS.inc(3)
+    path = tmp_path / "metrics.prom"
+    metrics.write_textfile(str(path))
+    assert "drone_ga_fitness_evaluations_total 3" in path.read_text(encoding="utf-8").splitlines()
+    assert list(tmp_path.iterdir()) == [path]
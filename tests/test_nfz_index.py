@@ -0,0 +1,53 @@
+# tests/test_nfz_index.py
+import numpy as np
+
+from graph_utils import segment_edge_hits
+from nfz_index import NFZIndex
+from utils import segments_intersect
+
+
+def _random_polygons(rng, count):
+    polygons = []
+    for _ in range(count):
+        cx, cy = rng.uniform(0, 1000, 2)
+        r = rng.uniform(5, 80)
+        angles = np.sort(rng.uniform(0, 2 * np.pi, rng.integers(3, 8)))
+        polygons.append([(float(cx + r * np.cos(t)), float(cy + r * np.sin(t))) for t in angles])
+    return polygons
+
+
+def test_segment_cell_pairs_match_cell_scan():
+    rng = np.random.default_rng(3)
+    index = NFZIndex(_random_polygons(rng, 25))
+    a = rng.uniform(-50, 1050, (200, 2))
+    b = rng.uniform(-50, 1050, (200, 2))
+    b[:20, 0] = a[:20, 0]   # dikey segmentler
+
+    m, k = index.segment_cell_pairs(a, b)
+    got = set(zip(m.tolist(), k.tolist()))
+    expected = set()
+    for i in range(len(a)):
+        for cell in index._segment_cells(tuple(a[i]), tuple(b[i])):
+            expected.update((i, z) for z in index.cells.get(cell, ()))
+    assert got == expected
+
+
+def test_segment_edge_hits_match_dense_scan():
+    rng = np.random.default_rng(5)
+    polygons = _random_polygons(rng, 30)
+    index = NFZIndex(polygons)
+    vertices = np.array([v for poly in polygons for v in poly])
+    points = np.vstack([rng.uniform(-50, 1050, (150, 2)), vertices])
+
+    for i in range(0, len(points), 17):
+        a = np.broadcast_to(points[i], points.shape)
+        m, k = segment_edge_hits(a, points, index)
+        got = set(zip(m.tolist(), k.tolist()))
+        expected = {(j, z) for j in range(len(points)) for z, poly in enumerate(polygons)
+                    if _crosses(points[i], points[j], poly)}
+        assert got == expected
+
+
+def _crosses(p1, p2, polygon):
+    edges = zip(polygon, polygon[1:] + polygon[:1])
+    return any(segments_intersect(tuple(p1), tuple(p2), e1, e2) for e1, e2 in edges)
@@ -0,0 +1,82 @@
+# tests/test_order_stream.py
+import random
+import threading
+import time
+
+from entities import DeliveryPoint
+from graph_utils import NODE_TYPE_DELIVERY
+from data_generator import generate_random_drones, generate_fixed_no_fly_zones
+from order_stream import StreamDispatcher, micro_batches, read_orders
+
+
+def _dispatcher():
+    random.seed(7)
+    return StreamDispatcher(generate_random_drones(3, 1000, 1000), generate_fixed_no_fly_zones())
+
+
+def _orders(ids):
+    return [DeliveryPoint(point_id, (100 + 10 * k, 900 - 10 * k), 0.5, 1) for k, point_id in enumerate(ids)]
+
+
+def _delivery_nodes(dispatcher):
+    return [n for n, node in dispatcher.graph.nodes_map.items() if node['type'] == NODE_TYPE_DELIVERY]
+
+
+def test_duplicate_and_occupied_ids_are_rejected():
+    dispatcher = _dispatcher()
+    first = list(dispatcher.process(_orders([1, 2, 2])))
+    assert [d["delivery_id"] for d in first if "error" in d] == [2]
+    assert sorted(d["delivery_id"] for d in first if d.get("drone_id") is not None) == [1, 2]
+
+    occupied = {drone.last_node_id for drone in dispatcher.drones}
+    parked = [int(n) for n in _delivery_nodes(dispatcher) if n in occupied]
+    assert parked
+    second = list(dispatcher.process(_orders(parked + [3])))
+    assert {d["delivery_id"] for d in second if "error" in d} == set(parked)
+
+
+def test_release_runs_when_consumer_stops_early():
+    dispatcher = _dispatcher()
+    decisions = dispatcher.process(_orders(range(10, 20)))
+    next(decisions)
+    decisions.close()
+    occupied = {drone.last_node_id for drone in dispatcher.drones}
+    assert set(_delivery_nodes(dispatcher)) <= occupied
+
+
+def test_battery_history_is_per_batch():
+    dispatcher = _dispatcher()
+    for start in range(0, 200, 20):
+        list(dispatcher.process(_orders(range(100 + start, 120 + start))))
+    assert all(len(drone.battery_history) <= 20 for drone in dispatcher.drones)
+
+
+def test_malformed_records_are_skipped(tmp_path, capsys):
+    path = tmp_path / "orders.jsonl"
+    path.write_text('{"id": 1, "x": 10, "y": 20, "weight": 1.0}\n'
+                    '{"id": 2, "x": 10,\n'
+                    '{"id": 3, "x": 10, "y": 20}\n'
+                    '{"id": 4, "x": 30, "y": 40, "weight": 0.5}\n', encoding="utf-8")
+    assert [order.point_id for order in read_orders(str(path))] == [1, 4]
+    assert capsys.readouterr().err.count("atlandı") == 2
+
+
+def test_partial_batch_flushes_on_idle_stream():
+    release = threading.Event()
+
+    def orders():
+        yield from _orders([1, 2])
+        release.wait(5)   # akış boşta: yeni sipariş gelmiyor
+        yield from _orders([3])
+
+    batches = micro_batches(orders(), max_size=10, max_wait=0.05)
+    started = time.monotonic()
+    first = next(batches)
+    assert [order.point_id for order in first] == [1, 2]
+    assert time.monotonic() - started < 2
+    release.set()
+    assert [[order.point_id for order in batch] for batch in batches] == [[3]]
+
+
+def test_batches_without_timer():
+    assert [len(batch) for batch in micro_batches(_orders(range(7)), max_size=3)] == [3, 3, 1]
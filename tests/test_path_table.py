@@ -0,0 +1,55 @@
+# tests/test_path_table.py
+import random
+
+import numpy as np
+
+from data_generator import generate_random_drones, generate_random_delivery_points, generate_fixed_no_fly_zones
+from a_star_solver import a_star_search
+from graph_utils import FlightGraph, build_graph
+from path_table import ShortestPathTable
+
+
+def test_update_matches_fresh_table():
+    random.seed(3)
+    drones = generate_random_drones(4, 1000, 1000)
+    pool = generate_random_delivery_points(60, 1000, 1000)
+    graph = FlightGraph(pool[:15], drones, generate_fixed_no_fly_zones())
+    table = ShortestPathTable(graph.adj_list, graph.nodes_map)
+    live = [str(p.point_id) for p in pool[:15]]
+    sources = [f"D{d.drone_id}_START" for d in drones]
+
+    for step in range(8):
+        for source in sources + live[:5]:
+            table._row(source)
+        removed = live[:2]
+        for node_id in removed:
+            graph.remove_delivery(int(node_id))
+            live.remove(node_id)
+        added = [graph.add_delivery(p) for p in pool[15 + 4 * step:19 + 4 * step]]
+        live += added
+        table.update(added, removed)
+
+        fresh = ShortestPathTable(graph.adj_list, graph.nodes_map)
+        for source in sources + live[:5]:
+            for target in live:
+                assert np.isclose(table.cost(source, target), fresh.cost(source, target), rtol=0, atol=1e-9)
+
+
+def test_table_matches_a_star():
+    random.seed(5)
+    drones = generate_random_drones(4, 1000, 1000)
+    nfzs = generate_fixed_no_fly_zones()
+    deliveries = generate_random_delivery_points(30, 1000, 1000, nfzs=nfzs)
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    table = ShortestPathTable(adj_list, nodes_map)
+    sources = table.default_sources()
+    targets = [str(p.point_id) for p in deliveries]
+
+    matrix = table.distance_matrix(sources, targets)
+    for r, source in enumerate(sources):
+        for c, target in enumerate(targets):
+            path, cost = a_star_search(adj_list, nodes_map, nfzs, source, target)
+            assert np.isclose(table.cost(source, target), cost, rtol=0, atol=1e-6)
+            assert matrix[r, c] == table.cost(source, target)
+            found, found_cost = table.lookup(source, target)
+            assert (found is None) == (path is None) and np.isclose(found_cost, cost, rtol=0, atol=1e-6)
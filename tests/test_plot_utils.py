@@ -0,0 +1,40 @@
+# tests/test_plot_utils.py
+import pytest
+
+import plot_utils
+from csp_solver import CSPSolver
+from data_generator import generate_scenario
+from graph_utils import build_graph
+from path_table import ShortestPathTable
+
+
+def _solved(seed=1):
+    drones, deliveries, nfzs = generate_scenario(3, 25, num_nfzs=3, seed=seed)
+    deliveries = list(deliveries)
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    table = ShortestPathTable(adj_list, nodes_map)
+    assignments = CSPSolver(deliveries, drones, adj_list, nodes_map, nfzs, path_table=table,
+                            verbose=False).solve()
+    paths = {d_id: table.path(f"D{dr_id}_START", str(d_id)) for d_id, dr_id in assignments.items()}
+    return drones, deliveries, nfzs, nodes_map, adj_list, assignments, paths
+
+
+def test_solver_paths_are_reused(monkeypatch):
+    drones, deliveries, nfzs, nodes_map, adj_list, assignments, paths = _solved()
+    expected = plot_utils.route_paths(assignments, nodes_map, nfzs, adj_list)
+
+    def no_table(*args, **kwargs):
+        raise AssertionError("yollar verildiğinde tablo kurulmamalı")
+
+    monkeypatch.setattr(plot_utils, "ShortestPathTable", no_table)
+    assert plot_utils.route_paths(assignments, nodes_map, nfzs, adj_list, paths) == expected
+
+
+def test_plot_routes_saves_png(tmp_path):
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    drones, deliveries, nfzs, nodes_map, adj_list, assignments, paths = _solved(seed=2)
+    target = tmp_path / "routes.png"
+    plot_utils.plot_routes(drones, deliveries, assignments, nodes_map, nfzs, adj_list,
+                           save_path=str(target), paths=paths)
+    assert target.stat().st_size > 0
@@ -0,0 +1,61 @@
+# tests/test_reduced_graph.py
+import numpy as np
+
+from data_generator import generate_scenario
+from entities import Drone, DeliveryPoint, NoFlyZone
+from graph_utils import FlightGraph, NODE_TYPE_WAYPOINT, tangent_mask
+from path_table import ShortestPathTable
+from utils import is_point_in_polygon
+
+# Saat yönünün tersine L biçimli bölge: (20, 20) köşesi içbükey
+L_ZONE = [(0, 0), (40, 0), (40, 20), (20, 20), (20, 40), (0, 40)]
+
+
+def _edges(graph):
+    return {node_id: sorted((nb, round(d, 9)) for nb, d in edges) for node_id, edges in graph.adj_list.items()}
+
+
+def test_reduced_keeps_only_convex_corners():
+    drones = [Drone(1, 5.0, 100.0, 10.0, (-50, -50))]
+    deliveries = [DeliveryPoint(1, (100, 100), 1.0, 1)]
+    graph = FlightGraph(deliveries, drones, [NoFlyZone(1, L_ZONE)], reduced=True)
+
+    assert "NFZ1_C3" not in graph.nodes_map and "WP_NFZ1_C3" not in graph.nodes_map
+    assert {"WP_NFZ1_C0", "WP_NFZ1_C1", "WP_NFZ1_C2", "WP_NFZ1_C4", "WP_NFZ1_C5"} <= set(graph.nodes_map)
+    assert not any(node_id.startswith("WP_NFZ1_E") for node_id in graph.nodes_map)
+
+
+def test_reduced_edges_are_tangent():
+    drones, deliveries, nfzs = generate_scenario(3, 30, num_nfzs=6, seed=4)
+    graph = FlightGraph(deliveries, drones, nfzs, reduced=True)
+    for node_id, (prev, nxt, k) in graph._tangent.items():
+        waypoint = np.array([graph.nodes_map[node_id]['coords']], dtype=float)
+        for other, _ in graph.adj_list[node_id]:
+            point = np.array([graph.nodes_map[other]['coords']], dtype=float)
+            in_ring = is_point_in_polygon(tuple(point[0]), graph._rings[k])
+            assert in_ring or tangent_mask(point, waypoint, np.array([prev]), np.array([nxt]))[0]
+
+
+def test_reduced_graph_is_incremental():
+    drones, deliveries, nfzs = generate_scenario(3, 30, num_nfzs=8, seed=11, layout='random')
+    deliveries = list(deliveries)
+    full = FlightGraph(deliveries, drones, nfzs, reduced=True)
+
+    grown = FlightGraph(deliveries[:-4], drones, nfzs[:-2], reduced=True)
+    for nfz in nfzs[-2:]:
+        grown.add_nfz(nfz)
+    for point in deliveries[-4:]:
+        grown.add_delivery(point)
+    assert _edges(grown) == _edges(full)
+
+
+def test_reduced_graph_keeps_terminals_connected():
+    drones, deliveries, nfzs = generate_scenario(5, 40, num_nfzs=6, seed=2)
+    full = FlightGraph(deliveries, drones, nfzs)
+    reduced = FlightGraph(deliveries, drones, nfzs, reduced=True)
+    assert all(node['type'] != NODE_TYPE_WAYPOINT or "_C" in node_id for node_id, node in reduced.nodes_map.items())
+
+    terminals = [f"D{d.drone_id}_START" for d in drones] + [str(p.point_id) for p in deliveries]
+    a = ShortestPathTable(full.adj_list, full.nodes_map).distance_matrix(terminals, terminals)
+    b = ShortestPathTable(reduced.adj_list, reduced.nodes_map).distance_matrix(terminals, terminals)
+    assert (np.isfinite(a) <= np.isfinite(b)).all()
@@ -0,0 +1,66 @@
+# tests/test_route_optimizer.py
+
+from csp_solver import CSPSolver
+from data_generator import generate_scenario
+from graph_utils import build_graph
+from path_table import ShortestPathTable
+from route_optimizer import RouteOptimizer
+
+
+def _routes(seed, battery_scale=1.0, return_home=False):
+    drones, deliveries, nfzs = generate_scenario(4, 60, num_nfzs=3, seed=seed)
+    deliveries = list(deliveries)
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    table = ShortestPathTable(adj_list, nodes_map)
+    solver = CSPSolver(deliveries, drones, adj_list, nodes_map, nfzs, path_table=table, verbose=False)
+    assignments = solver.solve()
+    for drone in drones:
+        drone.battery_capacity *= battery_scale
+    optimizer = RouteOptimizer(drones, deliveries, path_table=table, return_home=return_home)
+    order = [leg[0] for leg in solver.legs]
+    optimizer.optimize(assignments, order=order)
+    return optimizer, assignments, order
+
+
+def _usage(optimizer, drone, stops):
+    nodes = [f"D{drone.drone_id}_START"] + [str(p) for p in stops]
+    usage = 0.0
+    for a, b, point_id in zip(nodes, nodes[1:], stops):
+        weight = optimizer.delivery_by_id[point_id].weight
+        usage += optimizer.path_table.cost(a, b) * 0.5 * (1.0 + weight / drone.max_weight * 0.5)
+    if optimizer.return_home and stops:
+        usage += optimizer.path_table.cost(nodes[-1], nodes[0]) * 0.5
+    return usage
+
+
+def test_routes_never_get_longer():
+    for seed in (1, 2, 3):
+        optimizer, assignments, order = _routes(seed)
+        assert not optimizer.unrouted
+        for drone_id, route in optimizer.routes.items():
+            initial = [p for p in order if assignments[p] == drone_id]
+            assert sorted(route['stops']) == sorted(initial)
+            assert route['distance'] <= optimizer.route_distance(drone_id, initial) + 1e-9
+            assert abs(route['distance'] - optimizer.route_distance(drone_id, route['stops'])) < 1e-6
+
+
+def test_routes_respect_capacity_and_battery():
+    for seed, return_home in ((4, False), (5, True)):
+        optimizer, assignments, _ = _routes(seed, battery_scale=0.05, return_home=return_home)
+        routed = {p for route in optimizer.routes.values() for p in route['stops']}
+        assert routed | set(optimizer.unrouted) == set(assignments)
+        assert optimizer.unrouted
+        for drone_id, route in optimizer.routes.items():
+            drone = optimizer.drone_by_id[drone_id]
+            assert all(optimizer.delivery_by_id[p].weight <= drone.max_weight for p in route['stops'])
+            assert route['battery'] <= drone.battery_capacity + 1e-9
+            assert abs(route['battery'] - _usage(optimizer, drone, route['stops'])) < 1e-6
+
+
+def test_full_path_follows_the_stops():
+    optimizer, _, _ = _routes(6, return_home=True)
+    drone_id, route = next(iter(optimizer.routes.items()))
+    path = optimizer.full_path(drone_id)
+    assert path[0] == path[-1] == f"D{drone_id}_START"
+    positions = [path.index(str(p)) for p in route['stops']]
+    assert positions == sorted(positions)
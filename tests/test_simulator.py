@@ -0,0 +1,52 @@
+# tests/test_simulator.py
+import contextlib
+import io
+
+from data_generator import generate_scenario
+from entities import Drone
+from simulator import FleetSimulator, NearestPolicy
+
+
+def _scenario(seed=1, num_drones=4, num_deliveries=150, battery_scale=1.0):
+    drones, deliveries, nfzs = generate_scenario(num_drones, num_deliveries, 3, seed=seed, dynamic_ratio=1.0)
+    for drone in drones:
+        drone.battery_capacity = drone.current_battery = drone.battery_capacity * battery_scale
+    return drones, deliveries, nfzs
+
+
+def test_smoke_run_accounts_for_every_delivery():
+    drones, deliveries, nfzs = _scenario()
+    result = FleetSimulator(drones, deliveries, nfzs).run()
+    assert result['delivered'] + result['failed'] + result['undelivered'] == len(deliveries)
+    assert result['delivered'] > 0 and result['distance'] > 0
+
+
+def test_table_and_object_policies_agree():
+    drones, deliveries, nfzs = _scenario(seed=2)
+    by_table = FleetSimulator(drones, deliveries, nfzs).run()
+    drones, deliveries, nfzs = _scenario(seed=2)
+    points = list(deliveries)
+    assert FleetSimulator(drones, points, nfzs, policy=NearestPolicy(points)).run() == by_table
+
+
+def test_visibility_cache_is_bounded():
+    drones, deliveries, nfzs = _scenario(seed=3)
+    sim = FleetSimulator(drones, deliveries, nfzs, vis_cache_size=16)
+    sim.run()
+    assert len(sim._vis_cache) <= 16
+
+
+def test_failsafe_goes_through_drone_return_home(monkeypatch):
+    calls = []
+    original = Drone.return_home
+
+    def tracked(self, *args, **kwargs):
+        calls.append(kwargs.get('approach'))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Drone, 'return_home', tracked)
+    drones, deliveries, nfzs = _scenario(seed=1, battery_scale=1 / 8)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = FleetSimulator(drones, deliveries, nfzs).run()
+    assert result['failsafe_returns'] > 0
+    assert len(calls) >= result['failsafe_returns'] and all(call is not None for call in calls)
@@ -0,0 +1,59 @@
+# tests/test_snapshot.py
+from entities import Drone, DeliveryPoint, NoFlyZone
+from graph_utils import build_graph
+from snapshot import load_snapshot, save_snapshot
+
+
+def _scenario():
+    drones = [Drone(1, 5.0, 100.0, 10.0, (0, 0)), Drone(2, 3.0, 80.0, 12.0, (100, 50))]
+    deliveries = [DeliveryPoint(1, (40, 60), 1.5, 3, ("09:00", "10:00")),
+                  DeliveryPoint(2, (90, 10), 2.0, 1)]
+    nfzs = [NoFlyZone(1, [(20, 20), (20, 40), (40, 40), (40, 20)], "00:00", "02:00")]
+    return drones, deliveries, nfzs
+
+
+def test_close_after_scenario(tmp_path):
+    drones, deliveries, nfzs = _scenario()
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    path = save_snapshot(tmp_path / "s.snap", drones, deliveries, nfzs, nodes_map, adj_list)
+
+    snap = load_snapshot(path)
+    loaded_drones, loaded_deliveries, loaded_nfzs = snap.scenario()
+    graph = snap.csr_graph()
+    snap.close()
+
+    # Görünümler kapandıktan sonra da okunup yazılabilir
+    assert [d.drone_id for d in loaded_drones] == [1, 2]
+    loaded_drones[0].current_battery = 50.0
+    assert loaded_drones[0].current_battery == 50.0
+    assert loaded_deliveries[0].time_window == ("09:00", "10:00")
+    assert loaded_nfzs[0].start_time == "00:00"
+    assert len(graph) == len(adj_list)
+
+
+def test_context_manager(tmp_path):
+    drones, deliveries, nfzs = _scenario()
+    path = save_snapshot(tmp_path / "s.snap", drones, deliveries, nfzs)
+
+    with load_snapshot(path) as snap:
+        loaded_drones, _, _ = snap.scenario()
+    assert snap._mmap.closed
+    assert loaded_drones[1].start_pos == (100.0, 50.0)
+
+
+def test_graph_round_trip(tmp_path):
+    drones, deliveries, nfzs = _scenario()
+    nodes_map, adj_list = build_graph(deliveries, drones, nfzs)
+    path = save_snapshot(tmp_path / "s.snap", drones, deliveries, nfzs, nodes_map, adj_list)
+
+    with load_snapshot(path) as snap:
+        loaded_map, loaded_adj = snap.graph()
+        loaded_deliveries = list(snap.deliveries)
+        fleet = snap.fleet
+    assert loaded_map.keys() == nodes_map.keys()
+    assert all(loaded_map[n]['coords'] == tuple(float(c) for c in nodes_map[n]['coords']) for n in nodes_map)
+    assert {n: [(nb, round(c, 9)) for nb, c in e] for n, e in loaded_adj.items()} == \
+        {n: [(nb, round(c, 9)) for nb, c in e] for n, e in adj_list.items()}
+    assert [(p.point_id, p.weight, p.priority, p.time_window) for p in loaded_deliveries] == \
+        [(p.point_id, p.weight, p.priority, p.time_window) for p in deliveries]
+    assert [d.max_weight for d in fleet] == [d.max_weight for d in drones]
@@ -0,0 +1,59 @@
+# tests/test_zone_windows.py
+import random
+
+from data_generator import generate_fixed_no_fly_zones, generate_random_delivery_points, generate_random_drones
+from entities import Drone, DeliveryPoint, NoFlyZone
+from graph_utils import FlightGraph
+from utils import is_time_in_range
+
+SQUARE = [(40, -20), (40, 20), (60, 20), (60, -20)]
+
+
+def _graph(start, end):
+    drones = [Drone(1, 5.0, 100.0, 10.0, (0, 0))]
+    deliveries = [DeliveryPoint(1, (100, 0), 1.0, 1)]
+    return FlightGraph(deliveries, drones, [NoFlyZone(7, SQUARE, start, end)], time_aware=True)
+
+
+def test_midnight_start_is_not_always_active():
+    graph = _graph("00:00", "02:00")
+    assert graph.zones_active_at("01:00") == {7}
+    assert graph.zones_active_at("10:00") == set()
+
+
+def test_window_wrapping_midnight():
+    graph = _graph("22:00", "02:00")
+    assert graph.zones_active_at("23:30") == {7}
+    assert graph.zones_active_at("01:15") == {7}
+    assert graph.zones_active_at("12:00") == set()
+
+    graph.set_time("12:00")
+    assert ("1", 100.0) in graph.adj_list["D1_START"]
+    graph.set_time("23:00")
+    assert all(nb != "1" for nb, _ in graph.adj_list["D1_START"])
+
+
+def test_is_time_in_range_minutes():
+    assert is_time_in_range(0, 120, 0)
+    assert not is_time_in_range(0, 120, 600)
+    assert is_time_in_range(1320, 120, 60)
+    assert not is_time_in_range(1320, 120, 720)
+
+
+def _edges(graph, keep):
+    return {(u, v, round(cost, 9)) for u, nbs in graph.adj_list.items() if u in keep for v, cost in nbs if v in keep}
+
+
+def test_set_time_matches_graph_of_active_zones():
+    random.seed(2)
+    drones = generate_random_drones(3, 1000, 1000)
+    nfzs = generate_fixed_no_fly_zones()
+    deliveries = generate_random_delivery_points(20, 1000, 1000, nfzs=nfzs)
+    graph = FlightGraph(deliveries, drones, nfzs, time_aware=True)
+
+    for now in ("06:30", "17:15", "18:30", "17:45", "23:10"):
+        graph.set_time(now)
+        active = [nfz for nfz in nfzs if nfz.zone_id in graph.zones_active_at(now)]
+        fresh = FlightGraph(deliveries, drones, active)
+        keep = set(fresh.nodes_map)
+        assert _edges(graph, keep) == _edges(fresh, keep)
@@ -19,13 +19,16 @@ def calculate_distance(point1, point2):
 def is_time_in_range(start_time, end_time, current_time=None):
     """
     Zamanın belirli bir aralıkta olup olmadığını kontrol eder.
+    start_time > end_time ise aralık gece yarısını aşar (ör. 22:00-02:00).
     """
     if current_time is None:
         current_time = datetime.now()
-    
-    if start_time and end_time:
+
+    if start_time is None or end_time is None:
+        return True
+    if start_time <= end_time:
         return start_time <= current_time <= end_time
-    return True
+    return current_time >= start_time or current_time <= end_time
 
 
 def is_point_in_polygon(point, polygon):
@@ -131,3 +134,13 @@ def parse_time_str(time_str):
     from datetime import datetime
     return datetime.strptime(time_str, "%H:%M") if time_str else None
 
+
+def time_to_minutes(value):
+    """'HH:MM' metni, datetime/time nesnesi veya dakika sayısını gün içi dakikaya çevirir."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = parse_time_str(value)
+    elif isinstance(value, (int, float)):
+        return value
+    return value.hour * 60 + value.minute